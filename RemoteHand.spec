@@ -14,6 +14,7 @@ a = Analysis(
     hiddenimports=[
         'dotenv',
         'requests',
+        'telegram',
         'psutil',
         'customtkinter',
         'packaging',
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ANYDESK_READY.PY - Час до ID AnyDesk: фіксовані паузи проти очікування готовності
+Використання:
+    python benchmarks/anydesk_ready.py [--trials 6] [--min-delay 0.5] [--max-delay 10]
+Замість AnyDesk - скрипт, що після запуску "підключається до мережі" випадковий час
+і лише тоді відповідає на --get-id (до того - код 1, як справжній AnyDesk без ID).
+"до"    - як старий start(): Popen + sleep(5), sleep(1) + --get-id, sleep(3) + ще одна спроба;
+"після" - launch_anydesk() + wait_for_connection_id() (опитування з експоненційною паузою).
+Лише Linux/macOS (фейковий AnyDesk - скрипт з shebang).
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from anydesk_manager import AnyDeskManager
+
+FAKE_ID = "123456789"
+
+FAKE_ANYDESK = f'''#!{sys.executable}
+import sys, time
+ready_at = float(open(sys.argv[0] + ".ready").read())
+if sys.argv[1:] == ["--get-id"]:
+    if time.time() < ready_at:
+        sys.exit(1)
+    print("{FAKE_ID}")
+    sys.exit(0)
+time.sleep(60)  # "Сервіс" AnyDesk працює, поки його не зупинять
+'''
+
+
+class FakeConfig:
+    """Налаштування в пам'яті: кеш шляху AnyDesk без ID"""
+
+    store_location_text = "Бенчмарк"
+
+    def __init__(self, anydesk_path):
+        self.values = {AnyDeskManager.CACHE_KEY: {"path": anydesk_path}}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+def old_flow(manager):
+    """Старий start(): фіксовані паузи, дві спроби --get-id"""
+    manager._process = subprocess.Popen(manager.anydesk_path)
+    time.sleep(5)
+    time.sleep(1)  # Дамо AnyDesk секунду
+    connection_id = manager.get_connection_id(use_cache=False)
+    if not connection_id:
+        time.sleep(3)
+        connection_id = manager.get_connection_id(use_cache=False)
+    return connection_id
+
+
+def new_flow(manager):
+    manager.launch_anydesk()
+    return manager.wait_for_connection_id()
+
+
+def trial(fake_path, delay, flow):
+    """Один запуск: AnyDesk готовий через delay секунд. Повертає (секунд до ID, ID або None)."""
+    manager = AnyDeskManager(FakeConfig(str(fake_path)), telegram_api=None)
+    started = time.perf_counter()
+    Path(f"{fake_path}.ready").write_text(str(time.time() + delay))
+    try:
+        connection_id = flow(manager)
+        return time.perf_counter() - started, connection_id
+    finally:
+        if manager._process is not None:
+            manager._process.kill()
+            manager._process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Час до ID AnyDesk: паузи проти очікування готовності")
+    parser.add_argument("--trials", type=int, default=6, help="запусків у кожному варіанті")
+    parser.add_argument("--min-delay", type=float, default=0.5, help="мінімальна затримка готовності, сек")
+    parser.add_argument("--max-delay", type=float, default=10, help="максимальна затримка готовності, сек")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        print("❌ Фейковий AnyDesk - скрипт з shebang, запускайте на Linux/macOS")
+        return 1
+
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    rng = random.Random(args.seed)
+    delays = [rng.uniform(args.min_delay, args.max_delay) for _ in range(args.trials)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fake_path = Path(tmp_dir) / "AnyDesk.exe"
+        fake_path.write_text(FAKE_ANYDESK)
+        fake_path.chmod(0o755)
+
+        print(f"{'готовність, сек':>16}{'до, сек':>10}{'':>3}{'після, сек':>12}{'':>3}")
+        totals = {"до": [], "після": []}
+        for delay in delays:
+            row = f"{delay:>16.1f}"
+            for name, flow in (("до", old_flow), ("після", new_flow)):
+                seconds, connection_id = trial(fake_path, delay, flow)
+                totals[name].append((seconds, connection_id == FAKE_ID))
+                row += f"{seconds:>{10 if name == 'до' else 12}.1f}{' ✅' if connection_id == FAKE_ID else ' ❌':>3}"
+            print(row)
+
+    print()
+    for name, results in totals.items():
+        found = [seconds for seconds, ok in results if ok]
+        mean = f"{sum(found) / len(found):.1f} сек" if found else "-"
+        print(f"{name:<6} ID отримано {len(found)}/{len(results)}, в середньому {mean}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
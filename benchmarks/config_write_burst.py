@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CONFIG_WRITE_BURST.PY - Серія set(): запис на кожну зміну проти відкладеного запису
+Використання:
+    python benchmarks/config_write_burst.py [--bursts 10 100] [--rounds 5]
+Кожен варіант - окремий ConfigManager у тимчасовому HOME; рахуються виклики os.fsync.
+"до"     - debounce=0: кожен set() одразу пише файл (як було раніше);
+"після"  - відкладений запис: set() лише в пам'яті, файл - через DEBOUNCE_SECONDS;
+"with"   - серія set() у блоці "with config:", запис при виході з блоку.
+"виклик" - час, який серія займає у викликаючого; "на диску" - до моменту, коли зміни записано.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import config_manager
+from config_manager import ConfigManager
+
+
+class FsyncCounter:
+    """Обгортка над os.fsync з лічильником викликів"""
+
+    def __init__(self):
+        self.calls = 0
+        self._fsync = os.fsync
+
+    def __call__(self, fd):
+        self.calls += 1
+        return self._fsync(fd)
+
+
+def wait_written(config, timeout=10):
+    """Чекати, поки відкладені зміни потраплять у файл"""
+    deadline = time.monotonic() + timeout
+    while config._pending and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def burst_plain(config, size):
+    for i in range(size):
+        config.set(f"key_{i % 10}", i)
+
+
+def burst_with(config, size):
+    with config:
+        burst_plain(config, size)
+
+
+def run(variant, size, home):
+    """Одна серія. Повертає (fsync, мс у викликаючого, мс до запису на диск)."""
+    os.environ["HOME"] = home
+    debounce = 0 if variant == "до" else None
+    config = ConfigManager(debounce=debounce)
+    counter = FsyncCounter()
+    config_manager.os.fsync = counter
+    try:
+        started = time.perf_counter()
+        (burst_with if variant == "with" else burst_plain)(config, size)
+        caller = time.perf_counter() - started
+        wait_written(config)
+        durable = time.perf_counter() - started
+    finally:
+        config_manager.os.fsync = counter._fsync
+    return counter.calls, caller * 1000, durable * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Серія set(): запис на кожну зміну проти відкладеного")
+    parser.add_argument("--bursts", type=int, nargs="+", default=[10, 100], help="set() у серії")
+    parser.add_argument("--rounds", type=int, default=5, help="повторів кожного варіанту")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    home = os.environ.get("HOME")
+    print(f"{'серія':>6}  {'варіант':<8}{'fsync':>7}{'виклик, мс':>12}{'на диску, мс':>14}")
+    try:
+        for size in args.bursts:
+            for variant in ("до", "після", "with"):
+                results = []
+                for _ in range(args.rounds):
+                    with tempfile.TemporaryDirectory() as tmp_home:
+                        results.append(run(variant, size, tmp_home))
+                fsyncs = statistics.median(r[0] for r in results)
+                caller = statistics.median(r[1] for r in results)
+                durable = statistics.median(r[2] for r in results)
+                print(f"{size:>6}  {variant:<8}{fsyncs:>7g}{caller:>12.2f}{durable:>14.1f}")
+    finally:
+        if home is not None:
+            os.environ["HOME"] = home
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
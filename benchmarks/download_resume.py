@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DOWNLOAD_RESUME.PY - Докачування оновлення проти завантаження з нуля після обриву
+Використання:
+    python benchmarks/download_resume.py [--size-mb 8] [--rate-mb 8] [--drop 0.6]
+Локальний сервер обмежує швидкість і обриває частину відповідей у випадковому місці.
+"з нуля"      - як старий download_update: після обриву файл качається спочатку (блоки 8 KB);
+"докачування" - Downloader в один потік (HTTP Range з місця обриву);
+"сегменти"    - Downloader в кілька потоків.
+Паузи між спробами (backoff) вимкнені в усіх варіантах - порівнюються лише байти і час передачі.
+"""
+
+import os
+import sys
+import time
+import types
+import hashlib
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import requests
+
+import downloader
+from downloader import Downloader
+from file_server import ThrottledFileServer
+
+MAX_ATTEMPTS = 100
+
+
+def download_from_zero(url, dest_path):
+    """Старий підхід: потік блоками по 8 KB, будь-яка помилка - знову з початку"""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            with requests.get(url, stream=True, timeout=(10, 30)) as response:
+                response.raise_for_status()
+                total = int(response.headers.get("content-length", 0))
+                written = 0
+                with open(dest_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        f.write(chunk)
+                        written += len(chunk)
+            if written >= total:
+                return attempt
+        except (requests.RequestException, OSError):
+            pass
+    return None
+
+
+def run(name, server_args, payload, task):
+    server = ThrottledFileServer(payload, **server_args)
+    url = server.start()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dest_path = Path(tmp_dir) / "RemoteHand_new.exe"
+        started = time.perf_counter()
+        ok = task(url, dest_path)
+        seconds = time.perf_counter() - started
+        verified = ok and dest_path.exists() and hashlib.sha256(dest_path.read_bytes()).hexdigest() == \
+            hashlib.sha256(payload).hexdigest()
+    server.stop()
+    size_mb = len(payload) / 1024 / 1024
+    print(f"{name:<14}{seconds:>9.2f}{server.bytes_sent / 1024 / 1024:>13.2f}"
+          f"{server.bytes_sent / len(payload):>8.2f}x{server.requests:>9}"
+          f"{'  ✅' if verified else '  ❌'} ({size_mb:g} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Докачування проти завантаження з нуля")
+    parser.add_argument("--size-mb", type=float, default=8, help="розмір файлу")
+    parser.add_argument("--rate-mb", type=float, default=8, help="швидкість на з'єднання, MB/s")
+    parser.add_argument("--drop", type=float, default=0.6, help="ймовірність обриву відповіді")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    # Без пауз між спробами: порівнюємо передачу, а не backoff
+    downloader.time = types.SimpleNamespace(sleep=lambda seconds: None, monotonic=time.monotonic)
+
+    payload = os.urandom(int(args.size_mb * 1024 * 1024))
+    server_args = {"rate": int(args.rate_mb * 1024 * 1024), "drop_probability": args.drop, "seed": 7}
+
+    print(f"{'варіант':<14}{'сек':>9}{'передано, MB':>13}{'':>9}{'запитів':>9}")
+    run("з нуля", server_args, payload,
+        lambda url, dest: download_from_zero(url, dest) is not None)
+    run("докачування", server_args, payload,
+        lambda url, dest: Downloader(segments=1, attempts=MAX_ATTEMPTS).download(url, dest))
+    run("сегменти x4", server_args, payload,
+        lambda url, dest: Downloader(segments=4, attempts=MAX_ATTEMPTS).download(url, dest))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Локальний Bot API для бенчмарків і тестів Telegram: HTTP/1.1 keep-alive,
+сценарій відповідей (429 з retry_after, 5xx, 4xx), режим "офлайн",
+ліміт повідомлень як у Telegram і затримка на нове з'єднання (рукостискання).
+"""
+
+import json
+import time
+import threading
+from collections import deque
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeBotAPI:
+    """
+    base_url - передається в TelegramAPI(api_base_url=...).
+    script(*responses) - наступні відповіді по черзі: (статус, тіло) або (статус, тіло, заголовки);
+    offline = True - з'єднання закривається без відповіді (Telegram недоступний);
+    rate_limit - повідомлень за секунду на весь сервер, надлишок отримує 429 з retry_after;
+    connect_delay - пауза на кожне нове TCP з'єднання (імітація TCP+TLS рукостискання через WAN);
+    response_delay - пауза перед кожною відповіддю.
+    messages - прийняті повідомлення [{"method": ..., "params": {...}}]; connections / requests - лічильники.
+    """
+
+    def __init__(self, connect_delay=0.0, response_delay=0.0, rate_limit=0, retry_after=1):
+        self.connect_delay = connect_delay
+        self.response_delay = response_delay
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.offline = False
+
+        self.messages = []
+        self.connections = 0
+        self.requests = 0
+        self.rate_limited = 0
+
+        self._script = deque()
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._server = None
+        self.base_url = None
+
+    def script(self, *responses):
+        """Задати наступні відповіді (після них - знову звичайні 200)"""
+        with self._lock:
+            self._script.extend(responses)
+
+    def _next_response(self, method, params):
+        """(статус, тіло, заголовки) для запиту; успішні повідомлення записуються в messages"""
+        with self._lock:
+            self.requests += 1
+            if self._script:
+                status, body, *headers = self._script.popleft()
+                return status, body, headers[0] if headers else {}
+
+            if self.rate_limit and method != "getMe":
+                now = time.monotonic()
+                while self._recent and now - self._recent[0] >= 1:
+                    self._recent.popleft()
+                if len(self._recent) >= self.rate_limit:
+                    self.rate_limited += 1
+                    return 429, {
+                        "ok": False, "error_code": 429,
+                        "description": f"Too Many Requests: retry after {self.retry_after}",
+                        "parameters": {"retry_after": self.retry_after},
+                    }, {}
+                self._recent.append(now)
+
+            if method == "getMe":
+                return 200, {"ok": True, "result": {
+                    "id": 1, "is_bot": True, "first_name": "RemoteHand", "username": "remotehand_bot"}}, {}
+
+            self.messages.append({"method": method, "params": params})
+            return 200, {"ok": True, "result": {
+                "message_id": len(self.messages),
+                "date": int(time.time()),
+                "chat": {"id": int(params.get("chat_id", 0) or 0), "type": "supergroup", "title": "RemoteHand"},
+                "text": params.get("text", ""),
+            }}, {}
+
+    def start(self):
+        """Запустити сервер. Повертає base_url."""
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки і тіло пишуться окремо: з Nagle + delayed ACK кожна відповідь чекала б ~40 мс
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                # Один обробник на з'єднання: пауза лише на першому запиті з'єднання
+                with owner._lock:
+                    owner.connections += 1
+                if owner.connect_delay:
+                    time.sleep(owner.connect_delay)
+
+            def _params(self, body):
+                content_type = self.headers.get("Content-Type", "")
+                if content_type.startswith("application/json"):
+                    return json.loads(body or b"{}")
+                if content_type.startswith("application/x-www-form-urlencoded"):
+                    return {key: values[-1] for key, values in parse_qs(body.decode()).items()}
+                return {}
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if owner.offline:
+                    self.close_connection = True
+                    self.connection.shutdown(2)
+                    return
+
+                method = self.path.rstrip("/").rsplit("/", 1)[-1]
+                status, payload, headers = owner._next_response(method, self._params(body))
+                if owner.response_delay:
+                    time.sleep(owner.response_delay)
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, str(value))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}"
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Локальний HTTP сервер файлу для бенчмарків завантаження: обмеження швидкості
+на з'єднання, обриви з'єднання посеред відповіді, підтримка Range (вимикається).
+"""
+
+import re
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RANGE_RE = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+class ThrottledFileServer:
+    """
+    payload - вміст файлу; rate - байт/сек на з'єднання (0 - без обмеження);
+    drop_probability - ймовірність, що відповідь обірветься у випадковому місці.
+    bytes_sent / requests - скільки віддано всього.
+    """
+
+    BLOCK_SIZE = 16 * 1024
+
+    def __init__(self, payload, rate=0, drop_probability=0.0, ranges=True, seed=1):
+        self.payload = payload
+        self.rate = rate
+        self.drop_probability = drop_probability
+        self.ranges = ranges
+        self.bytes_sent = 0
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _plan(self, length):
+        """Скільки байт віддати до обриву (None - без обриву)"""
+        with self._lock:
+            self.requests += 1
+            if length > 1 and self._random.random() < self.drop_probability:
+                return self._random.randint(1, length - 1)
+        return None
+
+    def _count(self, size):
+        with self._lock:
+            self.bytes_sent += size
+
+    def start(self):
+        """Запустити сервер. Повертає URL файлу."""
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                size = len(owner.payload)
+                start, end = 0, size - 1
+                match = RANGE_RE.fullmatch(self.headers.get("Range", "")) if owner.ranges else None
+                if match:
+                    start = int(match.group(1))
+                    end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+                    if start >= size:
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{size}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+                else:
+                    self.send_response(200)
+                length = end - start + 1
+                self.send_header("Content-Length", str(length))
+                if owner.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                self.end_headers()
+
+                limit = owner._plan(length)
+                to_send = length if limit is None else limit
+                offset = start
+                started = time.perf_counter()
+                sent = 0
+                try:
+                    while sent < to_send:
+                        block = owner.payload[offset:offset + min(owner.BLOCK_SIZE, to_send - sent)]
+                        self.wfile.write(block)
+                        sent += len(block)
+                        offset += len(block)
+                        owner._count(len(block))
+                        if owner.rate:
+                            # Не швидше за rate байт/сек
+                            ahead = sent / owner.rate - (time.perf_counter() - started)
+                            if ahead > 0:
+                                time.sleep(ahead)
+                except OSError:
+                    return
+                if limit is not None:
+                    self.close_connection = True
+                    self.wfile.flush()
+                    self.connection.shutdown(2)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_port}/RemoteHand.exe"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KEEPALIVE_LATENCY.PY - Затримка одного повідомлення Telegram: requests.post проти спільної сесії
+Використання:
+    python benchmarks/keepalive_latency.py [--messages 50] [--handshake-ms 0 40]
+Локальний Bot API (HTTP/1.1 keep-alive) з паузою на кожне нове з'єднання -
+так імітується TCP+TLS рукостискання до api.telegram.org з мережі магазину.
+"до"    - як старий send_message: requests.post на кожне повідомлення (нове з'єднання щоразу);
+"після" - TelegramAPI.deliver_message через спільну keep-alive сесію.
+Ліміт частоти TelegramAPI вимкнено - порівнюється лише мережа.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import requests
+
+from rate_limiter import TokenBucket
+from telegram_api import TelegramAPI
+from fake_bot_api import FakeBotAPI
+
+TOKEN = "123456:BENCHMARK"
+CHAT_ID = "-100123"
+
+
+def send_bare(api_url, text):
+    """Старий підхід: окремий requests.post на кожне повідомлення"""
+    response = requests.post(f"{api_url}/sendMessage",
+                             json={"chat_id": CHAT_ID, "text": text, "parse_mode": "HTML"}, timeout=10)
+    response.raise_for_status()
+
+
+def measure(send, messages):
+    """Тривалість кожної відправки, мс"""
+    durations = []
+    for i in range(messages):
+        started = time.perf_counter()
+        send(f"<b>Звіт {i}</b>")
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def run(name, handshake_ms, messages, make_send):
+    server = FakeBotAPI(connect_delay=handshake_ms / 1000)
+    base_url = server.start()
+    send, close = make_send(base_url)
+    durations = sorted(measure(send, messages))
+    close()
+    server.stop()
+
+    p95 = durations[max(0, int(len(durations) * 0.95) - 1)]
+    print(f"{handshake_ms:>6g}  {name:<8}{statistics.median(durations):>9.2f}{p95:>9.2f}"
+          f"{statistics.mean(durations):>10.2f}{server.connections:>9}")
+    return statistics.mean(durations)
+
+
+def bare(base_url):
+    api_url = f"{base_url}/bot{TOKEN}"
+    return (lambda text: send_bare(api_url, text)), (lambda: None)
+
+
+def pooled(base_url):
+    api = TelegramAPI(TOKEN, CHAT_ID, api_base_url=base_url)
+    api.rate_limiter = TokenBucket(rate=1e9, burst=1e9)
+    return (lambda text: api.deliver_message(text)), api.close
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Затримка повідомлення: requests.post проти keep-alive сесії")
+    parser.add_argument("--messages", type=int, default=50, help="повідомлень у кожному варіанті")
+    parser.add_argument("--handshake-ms", type=float, nargs="+", default=[0, 40],
+                        help="пауза на нове з'єднання, мс (імітація рукостискання)")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    connections = "з'єднань"
+    print(f"{'рукост.':>6}  {'варіант':<8}{'p50, мс':>9}{'p95, мс':>9}{'сер., мс':>10}{connections:>9}")
+    for handshake_ms in args.handshake_ms:
+        before = run("до", handshake_ms, args.messages, bare)
+        after = run("після", handshake_ms, args.messages, pooled)
+        print(f"{'':>6}  {'':<8}прискорення x{before / after:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
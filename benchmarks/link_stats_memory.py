@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LINK_STATS_MEMORY.PY - LinkStats на мільйонах замірів: пам'ять не росте, швидкість додавання
+Використання:
+    python benchmarks/link_stats_memory.py [--samples 3000000] [--traced 600000] [--interval 5]
+Синтетичні заміри (RTT ~20 мс з шумом, 1% втрат, рідкі стрибки, з середини - інший маршрут 60 мс)
+з кроком --interval секунд: 3 млн замірів по 5 сек - це ~5 місяців безперервного моніторингу.
+"RSS"        - --samples замірів: RSS процесу і швидкість додавання (разом з генерацією замірів)
+               на кожній контрольній точці,
+               p50/p99 - snapshot() за останню годину;
+"tracemalloc" - --traced замірів під tracemalloc (він сповільнює кожне виділення пам'яті):
+               поточна і пікова пам'ять Python, виділена з моменту створення LinkStats
+               (перші ~250 тис. ростуть лише на список останніх MAX_SPIKES_KEPT стрибків).
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import psutil
+
+from link_stats import LinkStats
+
+
+CHUNK = 100_000  # Заміри генеруються один раз і повторюються - дані бенчмарку не роздувають RSS
+
+
+def synthetic(count, interval, seed=1):
+    """(час, RTT або None): базова лінія 20 мс, з середини - 60 мс (інший маршрут)"""
+    rng = random.Random(seed)
+    chunk = []
+    for _ in range(min(count, CHUNK)):
+        if rng.random() < 0.01:
+            chunk.append(None)
+        elif rng.random() < 0.001:
+            chunk.append(rng.uniform(300, 900))
+        else:
+            chunk.append(20.0 + rng.gauss(0, 2))
+
+    return replay(chunk, count, interval)
+
+
+def replay(chunk, count, interval):
+    start = time.time() - count * interval
+    for i in range(count):
+        rtt = chunk[i % len(chunk)]
+        if rtt is not None and i >= count // 2:
+            rtt += 40.0
+        yield start + i * interval, rtt
+
+
+def rss_mb():
+    return psutil.Process().memory_info().rss / 1024 / 1024
+
+
+def snapshot_at(stats, now):
+    """snapshot() так, ніби зараз - час останнього заміру (заміри синтетичні, "в минулому")"""
+    real_time = time.time
+    time.time = lambda: now
+    try:
+        return stats.snapshot()
+    finally:
+        time.time = real_time
+
+
+def checkpoints(samples, count):
+    return sorted({max(1, samples * (k + 1) // count) for k in range(count)})
+
+
+def rss_pass(samples, interval, marks):
+    """RSS і швидкість додавання між контрольними точками"""
+    stats = LinkStats()
+    print(f"{'замірів':>10}{'RSS, MB':>10}{'замірів/с':>12}{'мкс/замір':>11}{'p50':>8}{'p99':>8}")
+    data = synthetic(samples, interval)
+    done = 0
+    for mark in marks:
+        started = time.perf_counter()
+        for _ in range(mark - done):
+            timestamp, rtt = next(data)
+            stats.add(rtt, timestamp)
+        seconds = time.perf_counter() - started
+        count, done = mark - done, mark
+        snapshot = snapshot_at(stats, timestamp)
+        print(f"{done:>10,}{rss_mb():>10.1f}{count / seconds:>12,.0f}{seconds / count * 1e6:>11.2f}"
+              f"{snapshot['p50']:>8}{snapshot['p99']:>8}")
+
+
+def traced_pass(samples, interval, marks):
+    """Пам'ять Python, виділена з моменту створення LinkStats (сам об'єкт включно)"""
+    data = synthetic(samples, interval)
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    stats = LinkStats()
+    print(f"\n{'замірів':>10}{'пам`ять, КБ':>13}{'пік, КБ':>10}")
+    done = 0
+    for mark in marks:
+        for _ in range(mark - done):
+            timestamp, rtt = next(data)
+            stats.add(rtt, timestamp)
+        done = mark
+        current, peak = tracemalloc.get_traced_memory()
+        print(f"{done:>10,}{(current - base) / 1024:>13.0f}{(peak - base) / 1024:>10.0f}")
+    tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkStats: пам'ять і швидкість на мільйонах замірів")
+    parser.add_argument("--samples", type=int, default=3_000_000, help="замірів у проході RSS")
+    parser.add_argument("--traced", type=int, default=600_000, help="замірів під tracemalloc")
+    parser.add_argument("--interval", type=float, default=5, help="секунд між замірами")
+    parser.add_argument("--checkpoints", type=int, default=6, help="контрольних точок")
+    args = parser.parse_args()
+
+    rss_pass(args.samples, args.interval, checkpoints(args.samples, args.checkpoints))
+    traced_pass(args.traced, args.interval, checkpoints(args.traced, args.checkpoints))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
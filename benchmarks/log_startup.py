@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LOG_STARTUP.PY - Логування: старт з тисячами старих логів і пропускна здатність запису
+Використання:
+    python benchmarks/log_startup.py [--old-logs 10000] [--records 50000] [--threads 4] [--rounds 3]
+Старт: тека logs/ з --old-logs файлами RemoteHand_<дата>_<час>.log за останні 30 днів.
+"до"    - як старий main.py: новий файл на запуск (FileHandler) і синхронне видалення
+          логів старше 7 днів (glob + stat + unlink + запис у лог про кожен файл);
+"після" - setup_logging() + remove_old_logs() (видалення у фоновому потоці).
+Запис: --records записів з --threads потоків.
+"до"    - синхронний FileHandler на кореневому логері (потік, що логує, пише у файл);
+"після" - QueueHandler + QueueListener з setup_logging().
+"виклик" - швидкість у потоках, що логують; "у файлі" - доки останній запис не потрапив у файл.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import contextlib
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from log_setup import TEXT_FORMAT, setup_logging, remove_old_logs
+
+DONE = "BENCHMARK_DONE"
+
+
+def fill_old_logs(log_dir, count):
+    """count файлів старого формату, дати рівномірно за останні 30 днів"""
+    now = time.time()
+    for i in range(count):
+        mtime = now - (i / count) * 30 * 24 * 3600
+        path = log_dir / f"RemoteHand_{datetime.fromtimestamp(mtime).strftime('%Y%m%d_%H%M%S')}_{i}.log"
+        path.write_text("2025-11-10 10:10:10 [INFO] __main__: 🚀 Запуск RemoteHand...\n", encoding='utf-8')
+        os.utime(path, (mtime, mtime))
+
+
+def reset_logging():
+    """Зняти обробники кореневого логера (і закрити файли), щоб варіанти не впливали один на одного"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+def old_startup(log_dir):
+    """Старий main.py: файл на запуск і синхронне прибирання на шляху старту"""
+    log_file = log_dir / f"RemoteHand_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    handler = logging.FileHandler(log_file, encoding='utf-8')
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(handler)
+    logger = logging.getLogger("__main__")
+
+    current_time = time.time()
+    for old_log in log_dir.glob("RemoteHand_*.log"):
+        if current_time - old_log.stat().st_mtime > 7 * 24 * 3600:
+            old_log.unlink()
+            logger.info(f"🗑️ Видалено старий лог: {old_log.name}")
+    return None
+
+
+def new_startup(log_dir):
+    """Новий main.py: setup_logging() і фонове прибирання. Повертає потік прибирання."""
+    with contextlib.redirect_stdout(None):  # Як EXE без консолі: лише файл
+        setup_logging(log_dir)
+    return remove_old_logs(log_dir)
+
+
+def measure_startup(startup, old_logs):
+    """(мс на шляху старту, мс до кінця фонового прибирання, лишилось файлів)"""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        log_dir = Path(tmp_dir) / "logs"
+        log_dir.mkdir()
+        fill_old_logs(log_dir, old_logs)
+        started = time.perf_counter()
+        cleanup = startup(log_dir)
+        on_path = time.perf_counter() - started
+        if cleanup is not None:
+            cleanup.join()
+        total = time.perf_counter() - started
+        left = len(list(log_dir.glob("RemoteHand_2*.log")))
+        reset_logging()
+    return on_path * 1000, total * 1000, left
+
+
+def wait_for_done(log_file, timeout=60):
+    """Чекати, поки останній запис з'явиться в кінці файлу"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with open(log_file, 'rb') as f:
+                f.seek(max(0, os.path.getsize(log_file) - 256))
+                if DONE.encode() in f.read():
+                    return
+        except OSError:
+            pass
+        time.sleep(0.001)
+
+
+def measure_throughput(queued, records, threads):
+    """(записів/с у викликаючих, записів/с до запису у файл)"""
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        log_dir = Path(tmp_dir)
+        if queued:
+            with contextlib.redirect_stdout(None):
+                log_file = setup_logging(log_dir)
+        else:
+            log_file = log_dir / "RemoteHand.log"
+            handler = logging.FileHandler(log_file, encoding='utf-8')
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+            logging.getLogger().setLevel(logging.INFO)
+            logging.getLogger().addHandler(handler)
+
+        logger = logging.getLogger("benchmark")
+        per_thread = records // threads
+
+        def work(index):
+            for i in range(per_thread):
+                logger.info("📡 Потік %d: запис %d, пінг %.1f мс", index, i, 12.5)
+
+        workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        caller = time.perf_counter() - started
+        logger.info(DONE)
+        wait_for_done(log_file)
+        written = time.perf_counter() - started
+        reset_logging()
+    total = per_thread * threads
+    return total / caller, total / written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Логування: старт зі старими логами і швидкість запису")
+    parser.add_argument("--old-logs", type=int, default=10000, help="старих файлів логів у теці")
+    parser.add_argument("--records", type=int, default=50000, help="записів у тесті швидкості")
+    parser.add_argument("--threads", type=int, default=4, help="потоків, що логують")
+    parser.add_argument("--rounds", type=int, default=3, help="повторів кожного варіанту")
+    args = parser.parse_args()
+
+    print(f"Старт, {args.old_logs} старих логів (медіана з {args.rounds})")
+    print(f"{'варіант':<8}{'старт, мс':>11}{'з фоном, мс':>13}{'лишилось':>10}")
+    for name, startup in (("до", old_startup), ("після", new_startup)):
+        results = sorted(measure_startup(startup, args.old_logs) for _ in range(args.rounds))
+        on_path, total, left = results[len(results) // 2]
+        print(f"{name:<8}{on_path:>11.1f}{total:>13.1f}{left:>10}")
+
+    print(f"\nЗапис, {args.records} записів з {args.threads} потоків (медіана з {args.rounds})")
+    print(f"{'варіант':<8}{'виклик, зап/с':>15}{'у файлі, зап/с':>16}")
+    for name, queued in (("до", False), ("після", True)):
+        results = sorted(measure_throughput(queued, args.records, args.threads) for _ in range(args.rounds))
+        caller, written = results[len(results) // 2]
+        print(f"{name:<8}{caller:>15,.0f}{written:>16,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
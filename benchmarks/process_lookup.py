@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PROCESS_LOOKUP.PY - Пошук процесу: індекс ProcessWatch проти повного перебору process_iter
+Використання:
+    python benchmarks/process_lookup.py [--extra 300] [--lookups 200]
+--extra - скільки додаткових процесів запустити (на ПК магазину їх зазвичай 150-300).
+"до"              - як check_if_running раніше: psutil.process_iter(['name']) на кожен запит;
+"індекс (тепле)"  - ProcessWatch.find в межах TTL (лише перевірка знайдених PID);
+"індекс (оновл.)" - ProcessWatch.find з примусовим оновленням (psutil.pids + назви нових PID).
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import psutil
+
+from process_watch import ProcessWatch
+
+PATTERN = "anydesk"
+
+
+def full_scan():
+    """Старий підхід: перебір усіх процесів з читанням назви"""
+    return [p.info['pid'] for p in psutil.process_iter(['pid', 'name'])
+            if p.info['name'] and PATTERN in p.info['name'].lower()]
+
+
+def measure(lookup, lookups):
+    """Тривалість кожного пошуку, мкс"""
+    durations = []
+    for _ in range(lookups):
+        started = time.perf_counter()
+        lookup()
+        durations.append((time.perf_counter() - started) * 1e6)
+    return sorted(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Індекс процесів проти process_iter")
+    parser.add_argument("--extra", type=int, default=300, help="додаткових процесів")
+    parser.add_argument("--lookups", type=int, default=200, help="пошуків у кожному варіанті")
+    args = parser.parse_args()
+
+    extra = [subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"]) for _ in range(args.extra)]
+    try:
+        time.sleep(1)  # Дати процесам стартувати
+        print(f"Процесів у системі: {len(psutil.pids())}\n")
+
+        watch = ProcessWatch(ttl=60)
+        watch.refresh()
+
+        def forced():
+            watch.refresh(force=True)
+            watch.find(PATTERN)
+
+        variants = [
+            ("до (process_iter)", full_scan),
+            ("індекс (тепле)", lambda: watch.find(PATTERN)),
+            ("індекс (оновл.)", forced),
+        ]
+        print(f"{'варіант':<20}{'p50, мкс':>11}{'p95, мкс':>11}{'сер., мкс':>11}")
+        results = {}
+        for name, lookup in variants:
+            durations = measure(lookup, args.lookups)
+            results[name] = statistics.median(durations)
+            print(f"{name:<20}{results[name]:>11.0f}{durations[int(len(durations) * 0.95) - 1]:>11.0f}"
+                  f"{statistics.mean(durations):>11.0f}")
+
+        base = results["до (process_iter)"]
+        print(f"\nприскорення: тепле x{base / results['індекс (тепле)']:.0f}, "
+              f"з оновленням x{base / results['індекс (оновл.)']:.1f}")
+    finally:
+        for process in extra:
+            process.kill()
+        for process in extra:
+            process.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+STARTUP_LATENCY.PY - Час до першого вікна, коли GitHub повільний або недоступний
+Використання:
+    python benchmarks/startup_latency.py [--delay 5]
+Локальний сервер замість GitHub API у трьох режимах:
+  slow      - відповідає через --delay секунд;
+  blackhole - приймає з'єднання і мовчить (спрацьовує таймаут requests, 10 сек);
+  refused   - порт закритий.
+"до"    - перевірка оновлень синхронно перед вікном (як було check_and_update при імпорті);
+"після" - UpdateService у фоні, вікно одразу.
+Без дисплея вікно не створюється - міряється час до моменту його створення.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from updater import UpdaterManager, UpdateService
+
+
+def start_github_stub(mode, delay):
+    """Сервер замість api.github.com. Повертає (URL, функція зупинки)."""
+    if mode == "refused":
+        probe = socket.socket()
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        return f"http://127.0.0.1:{port}/latest", lambda: None
+
+    if mode == "blackhole":
+        # Ядро завершує TCP рукостискання, але запит ніхто не читає
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(16)
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/latest", sock.close
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = json.dumps({"tag_name": "v0.0.1", "assets": []}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/latest", server.shutdown
+
+
+class StubUpdater(UpdaterManager):
+    """UpdaterManager з увімкненими оновленнями і кешем релізу в тимчасовій теці"""
+
+    def __init__(self, api_url, cache_dir):
+        super().__init__()
+        self.GITHUB_API_URL = api_url
+        self.RELEASE_CACHE_FILE = Path(cache_dir) / "release_cache.json"
+
+    def is_enabled(self):
+        return True
+
+
+def show_window():
+    """Створити і намалювати вікно. Повертає False, якщо дисплея немає."""
+    import tkinter
+
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        return False
+    root.update()
+    root.destroy()
+    return True
+
+
+def time_to_window(updater, background):
+    started = time.perf_counter()
+    if background:
+        UpdateService(updater=updater).start()
+    else:
+        updater.find_update()
+    has_display = show_window()
+    return time.perf_counter() - started, has_display
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Час до першого вікна при повільному GitHub")
+    parser.add_argument("--delay", type=float, default=5, help="затримка відповіді в режимі slow (сек)")
+    args = parser.parse_args()
+
+    # Логи updater не потрібні в результатах
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'режим':<11}{'до, сек':>10}{'після, сек':>12}")
+    has_display = True
+    for mode in ("slow", "blackhole", "refused"):
+        row = []
+        for background in (False, True):
+            url, stop = start_github_stub(mode, args.delay)
+            with tempfile.TemporaryDirectory() as cache_dir:
+                seconds, has_display = time_to_window(StubUpdater(url, cache_dir), background)
+            stop()
+            row.append(seconds)
+        print(f"{mode:<11}{row[0]:>10.2f}{row[1]:>12.2f}")
+
+    if not has_display:
+        print("\nℹ️ Дисплея немає: час виміряно до моменту створення вікна")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
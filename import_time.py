@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IMPORT_TIME.PY - Час холодного старту RemoteHand (python -X importtime)
+Використання:
+    python import_time.py [--budget-ms 150] [--runs 5] [--top 15]
+Імпортує src/main.py в окремому процесі (DEV режим, без вікна) кілька разів,
+бере найкращий результат і показує найдорожчі імпорти.
+Windows-модулі, яких немає на цій ОС, підміняються порожніми заглушками.
+Код виходу 1 - перевищено бюджет або на старті завантажився "важкий" модуль.
+"""
+
+import os
+import re
+import sys
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from importlib.util import find_spec
+
+SRC_DIR = Path(__file__).resolve().parent / "src"
+
+# Модулі лише для Windows (pywin32, stdlib), потрібні для імпорту на інших ОС
+WINDOWS_MODULES = ("win32api", "win32event", "win32con", "winerror", "winreg")
+
+# Мають імпортуватися при першому використанні функції, а не при старті
+FORBIDDEN_AT_STARTUP = ("requests", "psutil", "keyring", "winreg", "telegram", "httpx")
+
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(module, stub_dir):
+    """
+    Один запуск: ({модуль: (власний час, сумарний час)} в мікросекундах, {модуль: прямі імпорти}).
+    importtime друкує вкладені імпорти перед модулем, що їх викликав.
+    """
+    env = dict(os.environ)
+    env["REMOTEHAND_DEV_MODE"] = "1"
+    env["PYTHONPATH"] = os.pathsep.join([str(SRC_DIR), stub_dir])
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} завершився з кодом {result.returncode}:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    children = {}
+    pending = {}  # глибина -> модулі, що ще чекають на "батька"
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            depth = (len(indent) - 1) // 2
+            timings[name] = (int(self_us), int(cumulative_us))
+            children[name] = pending.pop(depth + 1, [])
+            pending.setdefault(depth, []).append(name)
+    return timings, children
+
+
+def write_stubs(stub_dir):
+    """Порожні заглушки для Windows-модулів, яких немає на цій ОС"""
+    stubbed = [name for name in WINDOWS_MODULES if find_spec(name) is None]
+    for name in stubbed:
+        (Path(stub_dir) / f"{name}.py").write_text("", encoding="utf-8")
+    return stubbed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Час холодного старту RemoteHand")
+    parser.add_argument("--budget-ms", type=float, default=150, help="бюджет на import main (мс)")
+    parser.add_argument("--runs", type=int, default=5, help="кількість запусків (береться найкращий)")
+    parser.add_argument("--top", type=int, default=15, help="скільки найдорожчих імпортів показати")
+    parser.add_argument("--module", default="main", help="модуль для імпорту")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="rh_importtime_") as stub_dir:
+        stubbed = write_stubs(stub_dir)
+        if stubbed:
+            print(f"🧩 Заглушки: {', '.join(stubbed)}")
+
+        # Перший запуск - прогрів (компіляція .pyc), в результат не йде
+        measure(args.module, stub_dir)
+        runs = [measure(args.module, stub_dir) for _ in range(max(args.runs, 1))]
+
+    best, children = min(runs, key=lambda run: run[0][args.module][1])
+    total_ms = best[args.module][1] / 1000
+    samples = sorted(timings[args.module][1] / 1000 for timings, _ in runs)
+    print(f"⏱️ import {args.module}: {total_ms:.1f} мс (найкращий з {len(runs)}, "
+          f"медіана {samples[len(samples) // 2]:.1f} мс)")
+
+    # Прямі імпорти модуля - найдорожчі першими (вкладені вже пораховані в них)
+    direct = sorted(children[args.module], key=lambda name: best[name][1], reverse=True)
+    print(f"\n{'сумарно, мс':>12} {'власний, мс':>12}  модуль")
+    for name in direct[:args.top]:
+        self_us, cumulative_us = best[name]
+        print(f"{cumulative_us / 1000:>12.1f} {self_us / 1000:>12.1f}  {name}")
+
+    failed = False
+    loaded = [name for name in FORBIDDEN_AT_STARTUP if name in best]
+    if loaded:
+        print(f"\n❌ На старті завантажено: {', '.join(loaded)} - мають імпортуватися при першому використанні")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"\n❌ Бюджет перевищено: {total_ms:.1f} мс > {args.budget_ms:g} мс")
+        failed = True
+
+    if not failed:
+        print(f"\n✅ В межах бюджету ({args.budget_ms:g} мс)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MAKE_DELTA.PY - Бінарний патч між двома збірками RemoteHand.exe
+Використання:
+    python make_delta.py OLD.exe NEW.exe PATCH.rhpatch
+Патч одразу перевіряється: застосовується до OLD і порівнюється з NEW.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Додати src в path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from delta_update import make_patch, apply_patch
+
+
+def main():
+    if len(sys.argv) != 4:
+        print(__doc__)
+        return 2
+
+    old_path, new_path, patch_path = (Path(arg) for arg in sys.argv[1:])
+
+    patch_size = make_patch(old_path, new_path, patch_path)
+    new_size = new_path.stat().st_size
+    print(f"🧩 Патч: {patch_size / 1024:.1f} KB ({patch_size * 100 / new_size:.1f}% від {new_size / 1024 / 1024:.2f} MB)")
+
+    # Перевірка: зібрати новий файл з патча
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rebuilt = apply_patch(old_path, patch_path, Path(tmp_dir) / "rebuilt.exe")
+        if rebuilt.read_bytes() != new_path.read_bytes():
+            print("❌ Перевірка не пройдена: зібраний файл відрізняється")
+            return 1
+
+    print("✅ Патч перевірено")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
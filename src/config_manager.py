@@ -1,57 +1,331 @@
 import json
 import os
+import errno
+import sys
+import time
+import atexit
+import weakref
+import threading
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class _FileLock:
+    """Міжпроцесне блокування файлу (msvcrt на Windows, flock на інших ОС)"""
+
+    TIMEOUT = 60  # секунд очікування зайнятого блокування на Windows
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'a+b')
+        if sys.platform == 'win32':
+            import msvcrt
+            deadline = time.monotonic() + self.TIMEOUT
+            while True:
+                try:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError as e:
+                    # LK_LOCK здається після ~10 сек зайнятого блокування (EDEADLOCK) - чекаємо далі,
+                    # але не довше TIMEOUT; інші помилки - не конкуренція, повторювати марно
+                    if e.errno == errno.EDEADLOCK and time.monotonic() < deadline:
+                        continue
+                    self._file.close()
+                    if e.errno == errno.EDEADLOCK:
+                        raise TimeoutError(f"Блокування {self.path} зайняте понад {self.TIMEOUT} сек") from e
+                    raise
+        else:
+            import fcntl
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if sys.platform == 'win32':
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+
+
+# Живі менеджери конфігу: незаписані зміни записуються при виході.
+# Один обробник atexit на модуль - екземпляри не тримаються в пам'яті до кінця процесу
+_instances = weakref.WeakSet()
+
+
+def _commit_all():
+    for config in list(_instances):
+        config.commit()
+
+
+atexit.register(_commit_all)
+
+
 class ConfigManager:
-    """Менеджер конфігурації"""
+    """
+    Менеджер конфігурації, спільний для кількох процесів програми.
+    Запис відкладений (write-behind): set() лише змінює дані в пам'яті, а файл
+    записується одним махом через DEBOUNCE_SECONDS після останньої зміни,
+    на commit() або при виході з блоку "with config:".
+    Запис - під файловим блокуванням: свіжий вміст з диска + наші змінені ключі,
+    лічильник версій "_version" +1. Чужі зміни підхоплюються ліниво (при get),
+    підписники отримують множину змінених ключів.
+    """
+
+    DEBOUNCE_SECONDS = 0.5
+    WATCH_INTERVAL = 2.0  # секунд між перевірками файлу фоновим потоком
+    VERSION_KEY = "_version"
 
-    def __init__(self):
+    def __init__(self, debounce=None):
         self.config_dir = Path.home() / ".remotehand"
         self.config_dir.mkdir(exist_ok=True)
         self.config_file = self.config_dir / "config.json"
+        self.lock_file = self.config_dir / "config.lock"
+        self.debounce = self.DEBOUNCE_SECONDS if debounce is None else debounce
+
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._pending = set()  # Ключі, змінені в цьому процесі і ще не записані
+        self._timer = None
+        self._flush_at = 0.0
+        self._batch_depth = 0
+        self._subscribers = []
+        self._watch_stop = threading.Event()
+        self.write_count = 0
 
+        self._signature = None
+        self.version = 0
         self.config = self.load()
 
+        # Незаписані зміни не губляться при виході
+        _instances.add(self)
+
+    # ============ ФАЙЛ ============
+
+    def _file_signature(self):
+        """Дешева ознака зміни файлу (os.replace змінює inode і mtime)"""
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _read_file(self):
+        """(дані без службових ключів, версія; None - файл без версії: змінений вручну або старою версією програми)"""
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, 0
+        if not isinstance(data, dict):
+            return {}, 0
+        version = data.pop(self.VERSION_KEY, None)
+        return data, version if isinstance(version, int) or version is None else 0
+
     def load(self):
         """Завантажити конфіг"""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                pass
-        return {}
+        self._signature = self._file_signature()
+        data, version = self._read_file()
+        self.version = version or 0
+        return data
 
     def save(self):
-        """Зберегти конфіг в JSON файл"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Помилка збереження конфігу: {e}")
+        """
+        Зберегти конфіг: під файловим блокуванням перечитати диск, накласти свої змінені ключі,
+        версія +1, атомарний запис (тимчасовий файл + fsync + os.replace).
+        """
+        with self._write_lock:
+            try:
+                with _FileLock(self.lock_file):
+                    missing = not self.config_file.exists()
+                    disk, version = self._read_file()
+                    with self._lock:
+                        pending = set(self._pending)
+                        merged = dict(disk)
+                        # Файл видалено - записати весь поточний конфіг, а не лише змінені ключі
+                        for key in (set(self.config) if missing else pending):
+                            merged[key] = self.config[key]
+                        # Файл без версії (або зі старішою) не відкочує лічильник назад
+                        version = max(version or 0, self.version) + 1
+                        data = json.dumps({**merged, self.VERSION_KEY: version}, ensure_ascii=False, indent=2)
 
-    def set(self, key, value):
-        """Встановити значення"""
-        self.config[key] = value
+                    tmp_path = self.config_file.with_name(f"{self.config_file.name}.{os.getpid()}.tmp")
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.config_file)
+                    signature = self._file_signature()
+            except Exception as e:
+                logger.error(f"Помилка збереження конфігу: {e}")
+                return
+
+            self.write_count += 1
+            with self._lock:
+                # Ключі, змінені під час запису, лишаються в черзі
+                self._pending -= {key for key in pending if self.config.get(key) == merged[key]}
+                changed = self._apply(merged, version, signature)
+            self._notify(changed)
+
+    def _apply(self, data, version, signature):
+        """Прийняти дані з диска (поверх - наші незаписані ключі). Повертає змінені ключі."""
+        merged = dict(data)
+        for key in self._pending:
+            merged[key] = self.config[key]
+        changed = {key for key in set(merged) | set(self.config) if merged.get(key) != self.config.get(key)}
+        self.config = merged
+        self.version = version
+        self._signature = signature
+        return changed
+
+    def refresh(self):
+        """Підхопити зміни інших процесів (тільки якщо файл змінився і версія новіша)"""
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        if signature is None:
+            # Файл видалено: поточний конфіг лишається, наступний save() створить файл знову
+            self._signature = None
+            return
+        data, version = self._read_file()
+        with self._lock:
+            if version is None:
+                # Файл змінено вручну або старою версією програми (без "_version") - він новіший за наш стан
+                version = self.version
+            elif version <= self.version:
+                # Файл прочитано без блокування: поки читали, save() міг записати новішу версію -
+                # старіші дані не накладаються, версія не йде назад
+                if version == self.version:
+                    self._signature = signature
+                return
+            changed = self._apply(data, version, signature)
+        if changed:
+            logger.info(f"🔄 Конфіг змінено іншим процесом: {', '.join(sorted(changed))}")
+            self._notify(changed)
+
+    # ============ ПІДПИСКИ ============
+
+    def subscribe(self, callback):
+        """callback(changed_keys) - при змінах (своїх і інших процесів)"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [cb for cb in self._subscribers if cb is not callback]
+
+    def _notify(self, changed):
+        if not changed:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(set(changed))
+            except Exception as e:
+                logger.warning(f"⚠️ Помилка підписника конфігу: {e}")
+
+    def start_watch(self, interval=None):
+        """Фонова перевірка файлу - щоб підписники дізнавались про зміни без get()"""
+        interval = interval or self.WATCH_INTERVAL
+
+        def watch():
+            while not self._watch_stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.debug(f"Перевірка конфігу: {e}")
+
+        threading.Thread(target=watch, name="ConfigWatch", daemon=True).start()
+
+    # ============ ВІДКЛАДЕНИЙ ЗАПИС ============
+
+    def commit(self):
+        """Записати відкладені зміни зараз"""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+        self.save()
+
+    def _schedule_save(self):
+        with self._lock:
+            if self._batch_depth:
+                return  # Запис - при виході з блоку with
+            if self.debounce > 0:
+                # Кожна нова зміна відсуває запис; таймер один на всю серію змін
+                self._flush_at = time.monotonic() + self.debounce
+                if self._timer is None:
+                    self._start_timer(self.debounce)
+                return
         self.save()
 
+    def _start_timer(self, delay):
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            if self._timer is None:
+                return  # Вже записано через commit()
+            remaining = self._flush_at - time.monotonic()
+            if remaining > 0:
+                self._start_timer(remaining)
+                return
+            self._timer = None
+        self.commit()
+
+    def __enter__(self):
+        with self._lock:
+            self._batch_depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self._batch_depth -= 1
+            if self._batch_depth:
+                return
+        self.commit()
+
+    # ============ ДОСТУП ============
+
+    def set(self, key, value):
+        """Встановити значення (запис у файл - відкладений)"""
+        with self._lock:
+            changed = self.config.get(key) != value
+            self.config[key] = value
+            self._pending.add(key)
+        self._schedule_save()
+        if changed:
+            self._notify({key})
+
     def get(self, key, default=""):
         """Отримати значення"""
+        self.refresh()
         return self.config.get(key, default)
 
     def is_first_run(self):
         """Перевірити чи перший запуск"""
-        store = self.config.get('store', '')
-        location = self.config.get('location', '')
+        store = self.get('store', '')
+        location = self.get('location', '')
         return not store or not location
 
     @property
     def store_location_text(self):
         """Отримати текст магазину/локації"""
-        store = self.config.get('store', 'Невідомо')
-        location = self.config.get('location', 'Невідомо')
+        store = self.get('store', 'Невідомо')
+        location = self.get('location', 'Невідомо')
         return f"{store} / {location}"
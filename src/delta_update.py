@@ -0,0 +1,130 @@
+import hashlib
+import logging
+import lzma
+import struct
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Формат патча:
+#   MAGIC | sha256(старий) | sha256(новий) | розмір нового (u64) | LZMA(операції)
+# Операція: довжина літерала (u32), зміщення в старому файлі (u64), довжина копії (u32), літерал
+PATCH_MAGIC = b"RHDELTA1"
+HEADER_FORMAT = "<8s32s32sQ"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+OP_FORMAT = "<IQI"
+OP_SIZE = struct.calcsize(OP_FORMAT)
+
+BLOCK_SIZE = 64  # Мінімальний збіг, який варто копіювати
+
+
+def _extend_match(old, new, old_pos, new_pos):
+    """Довжина збігу old[old_pos:] і new[new_pos:] (спочатку великими кроками)"""
+    length = 0
+    for step in (64 * 1024, 4096, 256, 16, 1):
+        while (old_pos + length + step <= len(old) and new_pos + length + step <= len(new)
+               and old[old_pos + length:old_pos + length + step] == new[new_pos + length:new_pos + length + step]):
+            length += step
+    return length
+
+
+def make_patch_bytes(old, new):
+    """Побудувати бінарний патч old -> new"""
+    # Індекс блоків старого файлу (вирівняних по BLOCK_SIZE)
+    index = {}
+    for pos in range(0, len(old) - BLOCK_SIZE + 1, BLOCK_SIZE):
+        index.setdefault(old[pos:pos + BLOCK_SIZE], pos)
+
+    ops = bytearray()
+    literal_start = 0
+    pos = 0
+    limit = len(new) - BLOCK_SIZE
+
+    while pos <= limit:
+        old_pos = index.get(new[pos:pos + BLOCK_SIZE])
+        if old_pos is None:
+            pos += 1
+            continue
+
+        # Розширити збіг назад - за рахунок ще не записаного літерала
+        while pos > literal_start and old_pos > 0 and new[pos - 1] == old[old_pos - 1]:
+            pos -= 1
+            old_pos -= 1
+
+        length = _extend_match(old, new, old_pos, pos)
+        literal = new[literal_start:pos]
+        ops += struct.pack(OP_FORMAT, len(literal), old_pos, length)
+        ops += literal
+
+        pos += length
+        literal_start = pos
+
+    literal = new[literal_start:]
+    if literal:
+        ops += struct.pack(OP_FORMAT, len(literal), 0, 0)
+        ops += literal
+
+    header = struct.pack(
+        HEADER_FORMAT,
+        PATCH_MAGIC,
+        hashlib.sha256(old).digest(),
+        hashlib.sha256(new).digest(),
+        len(new),
+    )
+    return header + lzma.compress(bytes(ops), preset=9)
+
+
+def read_patch_header(patch):
+    """Прочитати заголовок патча: (sha256 старого, sha256 нового, розмір нового)"""
+    if len(patch) < HEADER_SIZE:
+        raise ValueError("Патч пошкоджено: замалий розмір")
+
+    magic, old_sha256, new_sha256, new_size = struct.unpack_from(HEADER_FORMAT, patch)
+    if magic != PATCH_MAGIC:
+        raise ValueError("Патч пошкоджено: невідомий формат")
+    return old_sha256.hex(), new_sha256.hex(), new_size
+
+
+def apply_patch_bytes(old, patch):
+    """Застосувати патч до old. Результат перевіряється по SHA-256 з заголовка."""
+    old_sha256, new_sha256, new_size = read_patch_header(patch)
+
+    if hashlib.sha256(old).hexdigest() != old_sha256:
+        raise ValueError("Патч створено для іншої версії файлу")
+
+    ops = lzma.decompress(patch[HEADER_SIZE:])
+    new = bytearray()
+    pos = 0
+    while pos < len(ops):
+        literal_len, old_pos, copy_len = struct.unpack_from(OP_FORMAT, ops, pos)
+        pos += OP_SIZE
+        new += ops[pos:pos + literal_len]
+        pos += literal_len
+        if copy_len:
+            if old_pos + copy_len > len(old):
+                raise ValueError("Патч пошкоджено: копіювання за межі файлу")
+            new += old[old_pos:old_pos + copy_len]
+
+    if len(new) != new_size or hashlib.sha256(new).hexdigest() != new_sha256:
+        raise ValueError("SHA-256 результату не збігається з патчем")
+    return bytes(new)
+
+
+def make_patch(old_path, new_path, patch_path):
+    """Створити патч між двома файлами. Повертає розмір патча."""
+    old = Path(old_path).read_bytes()
+    new = Path(new_path).read_bytes()
+    patch = make_patch_bytes(old, new)
+    Path(patch_path).write_bytes(patch)
+    logger.info(f"✅ Патч створено: {patch_path} ({len(patch) / 1024:.1f} KB, новий файл {len(new) / 1024 / 1024:.2f} MB)")
+    return len(patch)
+
+
+def apply_patch(old_path, patch_path, out_path):
+    """Застосувати патч до файлу і записати результат в out_path"""
+    old = Path(old_path).read_bytes()
+    patch = Path(patch_path).read_bytes()
+    new = apply_patch_bytes(old, patch)
+    Path(out_path).write_bytes(new)
+    logger.info(f"✅ Патч застосовано: {out_path}")
+    return Path(out_path)
@@ -0,0 +1,298 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(path, block_size=1024 * 1024):
+    """Порахувати SHA-256 файлу"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Downloader:
+    """
+    Завантаження файлів з докачуванням і повторними спробами.
+    Якщо сервер підтримує HTTP Range - файл качається кількома сегментами паралельно,
+    стан сегментів зберігається поруч (.part.state), тож обірване завантаження продовжується.
+    """
+
+    ATTEMPTS = 5
+    TIMEOUT = (10, 30)  # (з'єднання, читання) секунд
+    MIN_CHUNK_SIZE = 16 * 1024
+    MAX_CHUNK_SIZE = 1024 * 1024
+    SEGMENTS = 4
+    MIN_SEGMENT_SIZE = 1024 * 1024  # Менші файли качаємо одним потоком
+    STATE_SAVE_INTERVAL = 1.0  # секунд між збереженнями стану сегментів
+
+    def __init__(self, segments=None, attempts=None, timeout=None, session=None):
+        self.segments = segments or self.SEGMENTS
+        self.attempts = attempts or self.ATTEMPTS
+        self.timeout = timeout or self.TIMEOUT
+        self._session = session
+
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """HTTP сесія (requests імпортується при першому завантаженні, а не при старті програми)"""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.segments)
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+            return self._session
+
+    # ============ ПУБЛІЧНЕ API ============
+
+    def download(self, url, dest_path, expected_sha256=None, on_progress=None):
+        """
+        Завантажити url у dest_path: спершу в .part, перевірка SHA-256 (якщо задано),
+        потім атомарна заміна. on_progress(downloaded, total) - з робочих потоків.
+        Повертає True при успіху.
+        """
+        dest_path = Path(dest_path)
+        part_path = dest_path.with_name(dest_path.name + ".part")
+
+        if not self.fetch(url, part_path, on_progress):
+            return False
+
+        if expected_sha256:
+            actual_sha256 = file_sha256(part_path)
+            if actual_sha256 != expected_sha256.lower():
+                logger.error(f"❌ SHA-256 не збігається: {actual_sha256} != {expected_sha256}")
+                part_path.unlink(missing_ok=True)
+                return False
+            logger.info("🔒 SHA-256 перевірено")
+
+        os.replace(part_path, dest_path)
+        return True
+
+    def fetch(self, url, part_path, on_progress=None):
+        """
+        Завантажити url у part_path з докачуванням (без перевірки і перейменування).
+        Повертає True, якщо файл завантажено повністю.
+        """
+        part_path = Path(part_path)
+        state_path = part_path.with_name(part_path.name + ".state")
+
+        try:
+            state = self._load_state(state_path, url)
+            if state is not None and not part_path.exists():
+                state_path.unlink(missing_ok=True)
+                state = None
+            if state is None and not part_path.exists():
+                total_size, ranges = self._probe(url)
+                if ranges and self.segments > 1 and total_size >= 2 * self.MIN_SEGMENT_SIZE:
+                    state = self._new_state(url, total_size)
+                    with open(part_path, 'wb') as f:
+                        f.truncate(total_size)
+                    self._save_state(state_path, state)
+
+            if state is not None:
+                ok = self._fetch_segments(url, part_path, state, state_path, on_progress)
+            else:
+                ok = self._fetch_single(url, part_path, on_progress)
+        except Exception as e:
+            logger.error(f"❌ Помилка завантаження {url}: {e}")
+            return False
+
+        if ok:
+            state_path.unlink(missing_ok=True)
+        return ok
+
+    # ============ ОДИН ПОТІК ============
+
+    def _probe(self, url):
+        """(розмір, чи підтримує сервер Range) - запит першого байта"""
+        with self.session.get(url, headers={"Range": "bytes=0-0"}, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            if response.status_code == 206:
+                return int(response.headers.get('content-range', '*/0').rsplit('/', 1)[-1] or 0), True
+            return int(response.headers.get('content-length', 0)), False
+
+    def _stream_to(self, response, f, on_chunk):
+        """Переписати тіло відповіді у файл з адаптивним розміром блоку"""
+        chunk_size = self.MIN_CHUNK_SIZE * 4
+        while True:
+            started = time.monotonic()
+            chunk = response.raw.read(chunk_size, decode_content=True)
+            if not chunk:
+                break
+            written = f.write(chunk)
+            on_chunk(len(chunk) if written is None else written)
+
+            # Адаптивний розмір блоку: швидке читання - більший блок, повільне - менший
+            elapsed = time.monotonic() - started
+            if elapsed < 0.1 and chunk_size < self.MAX_CHUNK_SIZE:
+                chunk_size *= 2
+            elif elapsed > 1.0 and chunk_size > self.MIN_CHUNK_SIZE:
+                chunk_size //= 2
+
+    def _single_attempt(self, url, part_path, on_progress=None):
+        """
+        Одна спроба завантаження з докачуванням (HTTP Range).
+        Повертає True, якщо файл завантажено повністю.
+        """
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 416:
+                # Файл вже завантажено повністю
+                return True
+            response.raise_for_status()
+
+            if offset and response.status_code != 206:
+                logger.info("↩️ Сервер не підтримує докачування - завантаження з початку")
+                offset = 0
+
+            if response.status_code == 206:
+                total_size = int(response.headers.get('content-range', '*/0').rsplit('/', 1)[-1] or 0)
+            else:
+                total_size = int(response.headers.get('content-length', 0))
+
+            if offset:
+                logger.info(f"⏯️ Докачування з {offset / 1024 / 1024:.2f} MB")
+
+            downloaded = offset
+
+            def on_chunk(size):
+                nonlocal downloaded
+                downloaded += size
+                if on_progress:
+                    on_progress(downloaded, total_size)
+
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                self._stream_to(response, f, on_chunk)
+
+        return total_size == 0 or downloaded >= total_size
+
+    def _fetch_single(self, url, part_path, on_progress=None):
+        """Завантажити файл одним потоком (з докачуванням і повторними спробами)"""
+        for attempt in range(1, self.attempts + 1):
+            try:
+                if self._single_attempt(url, part_path, on_progress):
+                    return True
+                raise IOError("з'єднання обірвано до кінця файлу")
+            except Exception as e:
+                logger.warning(f"⚠️ Спроба {attempt}/{self.attempts} не вдалася: {e}")
+                if attempt == self.attempts:
+                    logger.error(f"❌ Помилка завантаження: {e}")
+                    return False
+                time.sleep(min(2 ** attempt, 30))
+        return False
+
+    # ============ ПАРАЛЕЛЬНІ СЕГМЕНТИ ============
+
+    def _new_state(self, url, total_size):
+        segment_size = -(-total_size // self.segments)
+        segments = []
+        for start in range(0, total_size, segment_size):
+            end = min(start + segment_size, total_size) - 1
+            segments.append({"start": start, "end": end, "done": 0})
+        return {"url": url, "size": total_size, "segments": segments}
+
+    def _load_state(self, state_path, url):
+        """Стан незавершеного сегментного завантаження (тільки для того ж URL)"""
+        try:
+            state = json.loads(state_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if state.get("url") != url or not state.get("segments"):
+            state_path.unlink(missing_ok=True)
+            return None
+        return state
+
+    def _save_state(self, state_path, state):
+        with self._lock:
+            data = json.dumps(state)
+        tmp_path = state_path.with_name(state_path.name + ".tmp")
+        tmp_path.write_text(data, encoding='utf-8')
+        os.replace(tmp_path, state_path)
+
+    def _fetch_segments(self, url, part_path, state, state_path, on_progress=None):
+        total_size = state["size"]
+        segments = state["segments"]
+        downloaded = sum(segment["done"] for segment in segments)
+        if downloaded:
+            logger.info(f"⏯️ Докачування з {downloaded / 1024 / 1024:.2f} MB")
+        logger.info(f"📥 Завантаження в {len(segments)} потоки ({total_size / 1024 / 1024:.2f} MB)")
+
+        last_saved = [time.monotonic()]
+
+        def on_chunk(segment, size):
+            nonlocal downloaded
+            with self._lock:
+                segment["done"] += size
+                downloaded += size
+                current = downloaded
+                save_due = time.monotonic() - last_saved[0] >= self.STATE_SAVE_INTERVAL
+                if save_due:
+                    last_saved[0] = time.monotonic()
+                if on_progress:
+                    on_progress(current, total_size)
+            if save_due:
+                self._save_state(state_path, state)
+
+        pending = [segment for segment in segments if segment["start"] + segment["done"] <= segment["end"]]
+        with ThreadPoolExecutor(max_workers=self.segments, thread_name_prefix="Download") as executor:
+            results = list(executor.map(lambda segment: self._fetch_segment(url, part_path, segment, on_chunk),
+                                        pending))
+        self._save_state(state_path, state)
+        return all(results)
+
+    def _fetch_segment(self, url, part_path, segment, on_chunk):
+        """Завантажити один сегмент (з повторними спробами з місця обриву)"""
+        for attempt in range(1, self.attempts + 1):
+            start = segment["start"] + segment["done"]
+            if start > segment["end"]:
+                return True
+            try:
+                headers = {"Range": f"bytes={start}-{segment['end']}"}
+                with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                    if response.status_code != 206:
+                        raise IOError(f"сервер не віддав сегмент (HTTP {response.status_code})")
+
+                    with open(part_path, 'r+b') as f:
+                        f.seek(start)
+                        self._stream_to(response, _Limited(f, segment["end"] - start + 1),
+                                        lambda size: on_chunk(segment, size))
+
+                if segment["start"] + segment["done"] > segment["end"]:
+                    return True
+                raise IOError("з'єднання обірвано до кінця сегмента")
+            except Exception as e:
+                logger.warning(f"⚠️ Сегмент {segment['start']}: спроба {attempt}/{self.attempts} не вдалася: {e}")
+                if attempt == self.attempts:
+                    return False
+                time.sleep(min(2 ** attempt, 30))
+        return False
+
+
+class _Limited:
+    """Файл, у який можна записати не більше limit байт (зайве від сервера відкидаємо)"""
+
+    def __init__(self, f, limit):
+        self._f = f
+        self._left = limit
+
+    def write(self, data):
+        if len(data) > self._left:
+            data = data[:self._left]
+        self._f.write(data)
+        self._left -= len(data)
+        return len(data)
@@ -0,0 +1,112 @@
+import math
+import time
+import logging
+import threading
+from array import array
+
+from prober import Prober, summarize
+from link_stats import LinkStats
+
+logger = logging.getLogger(__name__)
+
+
+class RingBuffer:
+    """
+    Кільцевий буфер замірів фіксованого розміру (array('d')).
+    Пам'ять не росте, скільки б програма не працювала. Втрата пакета - NaN.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.values = array('d', bytes(8 * capacity))
+        self.index = 0
+        self.count = 0
+
+    def append(self, timestamp, value):
+        self.timestamps[self.index] = timestamp
+        self.values[self.index] = math.nan if value is None else value
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def since(self, start_time):
+        """Заміри, новіші за start_time (від старих до нових). None - втрата."""
+        samples = []
+        for i in range(self.count):
+            pos = (self.index - self.count + i) % self.capacity
+            if self.timestamps[pos] >= start_time:
+                value = self.values[pos]
+                samples.append(None if math.isnan(value) else value)
+        return samples
+
+
+class LinkMonitor:
+    """Фоновий моніторинг якості зв'язку: кожні кілька секунд один замір на кожну ціль"""
+
+    INTERVAL = 5  # секунд між циклами
+    HISTORY_HOURS = 24
+
+    def __init__(self, targets, interval=None, prober=None):
+        """targets: {назва: (хост, порт для TCP, метод "auto"/"icmp"/"tcp")}"""
+        self.targets = dict(targets)
+        self.interval = interval or self.INTERVAL
+        self.prober = prober or Prober()
+
+        capacity = int(self.HISTORY_HOURS * 3600 / self.interval)
+        self._buffers = {name: RingBuffer(capacity) for name in self.targets}
+        self.stats = {name: LinkStats() for name in self.targets}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Запустити моніторинг у фоновому потоці"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="LinkMonitor", daemon=True)
+        self._thread.start()
+        logger.info(f"📈 Моніторинг зв'язку запущено ({', '.join(self.targets)}; кожні {self.interval} сек)")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        next_at = time.monotonic()
+        while not self._stop.is_set():
+            for name, (host, port, method) in self.targets.items():
+                try:
+                    rtt = self.prober.probe_once(host, port, method)
+                except Exception as e:
+                    logger.debug(f"Моніторинг {name}: {e}")
+                    rtt = None
+                self.record(name, rtt)
+
+            next_at += self.interval
+            self._stop.wait(max(0.0, next_at - time.monotonic()))
+
+    def record(self, name, rtt, timestamp=None):
+        """Додати замір (RTT в мс або None при втраті)"""
+        timestamp = timestamp or time.time()
+        with self._lock:
+            self._buffers[name].append(timestamp, rtt)
+            if self.stats[name].add(rtt, timestamp):
+                logger.warning(f"📈 Стрибок затримки {name}: {rtt:.0f} мс (норма ~{self.stats[name].ewma:.0f} мс)")
+
+    def samples(self, name, minutes):
+        """Заміри цілі за останні minutes хвилин"""
+        with self._lock:
+            return self._buffers[name].since(time.time() - minutes * 60)
+
+    def latency(self, minutes):
+        """
+        Перцентилі, втрати і стрибки по кожній цілі за останні minutes хвилин - з гістограм LinkStats
+        (те саме вікно, що й history, з точністю до хвилини) + базова лінія EWMA.
+        """
+        with self._lock:
+            return {name: stats.snapshot(minutes) for name, stats in self.stats.items()}
+
+    def history(self, minutes):
+        """Статистика summarize() по кожній цілі за останні minutes хвилин"""
+        return {name: summarize(self.samples(name, minutes)) for name in self.targets}
@@ -0,0 +1,190 @@
+import math
+import time
+from array import array
+from collections import deque
+
+
+class LatencyHistogram:
+    """
+    Гістограма затримок у стилі HDR: логарифмічні кошики з фіксованою відносною точністю.
+    Пам'ять постійна (~3 КБ), скільки б замірів не додали.
+    """
+
+    MIN_VALUE = 0.01  # мс
+    MAX_VALUE = 60000.0  # мс
+    PRECISION = 0.02  # Відносна похибка перцентилів (2%)
+
+    def __init__(self):
+        self._log_base = math.log1p(self.PRECISION)
+        self.bucket_count = self._bucket(self.MAX_VALUE) + 1
+        self.counts = array('I', bytes(4 * self.bucket_count))
+        self.total = 0
+
+    def _bucket(self, value):
+        value = min(max(value, self.MIN_VALUE), self.MAX_VALUE)
+        return int(math.log(value / self.MIN_VALUE) / self._log_base)
+
+    def _bucket_value(self, index):
+        """Середина кошика"""
+        low = self.MIN_VALUE * math.exp(index * self._log_base)
+        return low * (1 + self.PRECISION / 2)
+
+    def add(self, value):
+        self.counts[self._bucket(value)] += 1
+        self.total += 1
+
+    def clear(self):
+        # Частини вікна очищаються щохвилини - нульовий масив одним викликом, а не цикл по кошиках
+        self.counts = array('I', bytes(4 * self.bucket_count))
+        self.total = 0
+
+    def percentiles(self, quantiles, others=()):
+        """Перцентилі (0..100) з урахуванням інших гістограм (для ковзного вікна)"""
+        histograms = [h for h in (self, *others) if h.total]
+        total = sum(h.total for h in histograms)
+        if not total:
+            return {q: None for q in quantiles}
+
+        targets = sorted((max(1, math.ceil(q / 100 * total)), q) for q in quantiles)
+        result = {}
+        cumulative = 0
+        position = 0
+        for index in range(self.bucket_count):
+            cumulative += sum(h.counts[index] for h in histograms)
+            while position < len(targets) and cumulative >= targets[position][0]:
+                result[targets[position][1]] = round(self._bucket_value(index), 2)
+                position += 1
+            if position == len(targets):
+                break
+        return result
+
+
+class LinkStats:
+    """
+    Потокова статистика по одному хосту з постійною пам'яттю:
+    перцентилі затримки і втрати (кільце гістограм по SLOTS_PER_WINDOW частинах вікна),
+    EWMA базова лінія і детектор стрибків.
+    """
+
+    WINDOW_SECONDS = 3600  # Найдовше вікно перцентилів і втрат
+    SLOTS_PER_WINDOW = 60  # Гістограма на кожну 1/60 вікна (хвилину) - вікно будь-якої довжини з точністю до частини
+    EWMA_ALPHA = 0.05
+    SPIKE_SIGMAS = 4  # Стрибок: RTT вище базової лінії на SPIKE_SIGMAS відхилень...
+    SPIKE_MIN_DELTA = 50.0  # ...і не менше ніж на 50 мс (щоб не реагувати на шум в LAN)
+    SPIKE_RESEED_AFTER = 5  # Стільки стрибків поспіль - це новий рівень затримки (інший маршрут), а не стрибки
+    WARMUP_SAMPLES = 10
+    MAX_SPIKES_KEPT = 256
+
+    def __init__(self, window_seconds=None):
+        self.window_seconds = window_seconds or self.WINDOW_SECONDS
+        self.slot_seconds = self.window_seconds / self.SLOTS_PER_WINDOW
+
+        # Кільце: поточна (неповна) частина + SLOTS_PER_WINDOW повних.
+        # Для кожної частини - її номер (час // slot_seconds), гістограма і [відправлено, втрачено]
+        slots = self.SLOTS_PER_WINDOW + 1
+        self._slot_ids = [None] * slots
+        self._histograms = [LatencyHistogram() for _ in range(slots)]
+        self._counts = [[0, 0] for _ in range(slots)]
+        self._first_sample = None
+
+        self.sent = 0
+        self.lost = 0
+        self.ewma = None
+        self.ewm_variance = 0.0
+        self.spike_times = deque(maxlen=self.MAX_SPIKES_KEPT)
+        self._spike_streak = []  # RTT стрибків поспіль
+
+    def _slot(self, timestamp):
+        """Позиція частини вікна для заміру або None, якщо замір старший за все кільце"""
+        slot_id = int(timestamp // self.slot_seconds)
+        position = slot_id % len(self._slot_ids)
+        current = self._slot_ids[position]
+        if current == slot_id:
+            return position
+        if current is not None and current > slot_id:
+            return None
+        self._slot_ids[position] = slot_id
+        self._histograms[position].clear()
+        self._counts[position] = [0, 0]
+        return position
+
+    def add(self, rtt, timestamp=None):
+        """Додати замір: RTT в мс або None (втрата). Повертає True, якщо це стрибок."""
+        now = timestamp or time.time()
+        if self._first_sample is None or now < self._first_sample:
+            self._first_sample = now
+        position = self._slot(now)
+        self.sent += 1
+        if position is not None:
+            self._counts[position][0] += 1
+
+        if rtt is None:
+            self.lost += 1
+            if position is not None:
+                self._counts[position][1] += 1
+            return False
+
+        if position is not None:
+            self._histograms[position].add(rtt)
+
+        if self.ewma is None:
+            self.ewma = rtt
+            return False
+
+        deviation = rtt - self.ewma
+        is_spike = (self.sent - self.lost > self.WARMUP_SAMPLES
+                    and deviation > max(self.SPIKE_SIGMAS * math.sqrt(self.ewm_variance), self.SPIKE_MIN_DELTA))
+        if is_spike:
+            self._spike_streak.append(rtt)
+            if len(self._spike_streak) < self.SPIKE_RESEED_AFTER:
+                # Окремий стрибок не зсуває базову лінію - інакше кілька стрибків "стануть нормою"
+                self.spike_times.append(now)
+                return True
+
+            # Затримка стабільно на новому рівні: базова лінія - з цієї серії, далі це норма
+            mean = sum(self._spike_streak) / len(self._spike_streak)
+            self.ewm_variance = sum((value - mean) ** 2 for value in self._spike_streak) / len(self._spike_streak)
+            self.ewma = mean
+            self._spike_streak.clear()
+            return False
+
+        self._spike_streak.clear()
+        self.ewma += self.EWMA_ALPHA * deviation
+        self.ewm_variance = (1 - self.EWMA_ALPHA) * (self.ewm_variance + self.EWMA_ALPHA * deviation ** 2)
+        return False
+
+    def spikes_since(self, start_time):
+        return sum(1 for t in self.spike_times if t >= start_time)
+
+    def snapshot(self, minutes=None):
+        """
+        Перцентилі, втрати і стрибки за останні minutes хвилин (за замовчуванням - вікно) -
+        з гістограм частин вікна, що перетинаються з цим інтервалом; window_minutes - скільки
+        інтервал реально охоплює (не більше вікна і не раніше першого заміру). Плюс базова лінія.
+        """
+        now = time.time()
+        start_time = now - (minutes * 60 if minutes is not None else self.window_seconds)
+        start_time = max(start_time, now - self.window_seconds, self._first_sample or now)
+        first_id = int(start_time // self.slot_seconds)
+        last_id = int(now // self.slot_seconds)
+
+        selected = [position for position, slot_id in enumerate(self._slot_ids)
+                    if slot_id is not None and first_id <= slot_id <= last_id]
+
+        histograms = [self._histograms[position] for position in selected]
+        if histograms:
+            pcts = histograms[0].percentiles((50, 95, 99), others=histograms[1:])
+        else:
+            pcts = dict.fromkeys((50, 95, 99))
+        sent = sum(self._counts[position][0] for position in selected)
+        lost = sum(self._counts[position][1] for position in selected)
+        return {
+            "p50": pcts[50],
+            "p95": pcts[95],
+            "p99": pcts[99],
+            "ewma": round(self.ewma, 2) if self.ewma is not None else None,
+            "stddev": round(math.sqrt(self.ewm_variance), 2),
+            "spikes": self.spikes_since(start_time),
+            "loss": round(lost * 100 / sent, 1) if sent else 0.0,
+            "window_minutes": round((now - start_time) / 60, 1),
+        }
@@ -0,0 +1,159 @@
+import os
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+TEXT_FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+
+
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """
+    Ротація опівночі або при перевищенні max_bytes - що настане раніше.
+    Архіви: RemoteHand.log.2025-11-10, RemoteHand.log.2025-11-10.1, ...;
+    зберігаються backup_count найновіших (за часом зміни).
+    """
+
+    RETRY_SECONDS = 60  # Файл зайнятий іншим процесом (Windows) - наступна спроба ротації не раніше
+
+    def __init__(self, filename, max_bytes, backup_count, encoding='utf-8'):
+        super().__init__(filename, when='midnight', backupCount=backup_count, encoding=encoding)
+        self.max_bytes = max_bytes
+        self._retry_at = 0.0
+
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes <= 0 or time.monotonic() < self._retry_at:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        return self.stream.tell() >= self.max_bytes
+
+    def rotation_filename(self, default_name):
+        # Кілька ротацій за день (за розміром): наступний номер після найбільшого,
+        # щоб не перезаписати архів і щоб номери йшли в порядку створення
+        name = super().rotation_filename(default_name)
+        directory, base_name = os.path.split(name)
+        taken = [entry[len(base_name):] for entry in os.listdir(directory) if entry.startswith(base_name)]
+        if "" not in taken and not any(suffix[1:].isdigit() for suffix in taken):
+            return name
+        indices = [int(suffix[1:]) for suffix in taken if suffix[:1] == "." and suffix[1:].isdigit()]
+        return f"{name}.{max(indices, default=0) + 1}"
+
+    def rotate(self, source, dest):
+        try:
+            super().rotate(source, dest)
+        except OSError:
+            # Пишемо далі в той самий файл; без паузи спроба повторювалась би на кожному записі
+            self._retry_at = time.monotonic() + self.RETRY_SECONDS
+
+    def getFilesToDelete(self):
+        directory, base_name = os.path.split(self.baseFilename)
+        prefix = base_name + "."
+        backups = [os.path.join(directory, name) for name in os.listdir(directory) if name.startswith(prefix)]
+        if len(backups) <= self.backupCount:
+            return []
+        backups.sort(key=os.path.getmtime)
+        return backups[:len(backups) - self.backupCount]
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Один запис - один рядок JSON (для машинного розбору логів)"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(QueueHandler):
+    """
+    Черга в межах процесу: запис не треба серіалізувати, тому в потоці, що логує,
+    лише підставляємо аргументи; час, рівень і формат додає потік запису.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(log_dir, base_name="RemoteHand", json_lines=False, level=logging.INFO,
+                  max_bytes=5 * 1024 * 1024, backup_count=14):
+    """
+    Логування через чергу: UI і робочі потоки лише кладуть запис у чергу,
+    у файл (з ротацією) і в консоль пише окремий потік QueueListener.
+    json_lines=True - файл <base_name>.jsonl з рядками JSON замість тексту.
+    Повертає шлях до поточного файлу логу.
+    """
+    log_file = log_dir / f"{base_name}.{'jsonl' if json_lines else 'log'}"
+
+    file_handler = SizedTimedRotatingFileHandler(log_file, max_bytes, backup_count)
+    file_handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(TEXT_FORMAT))
+    handlers = [file_handler]
+
+    # EXE без консолі: sys.stdout = None
+    if sys.stdout is not None:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_QueueHandler(log_queue))
+
+    # Дописати чергу у файл перед виходом (atexit виконується до logging.shutdown)
+    atexit.register(listener.stop)
+    return log_file
+
+
+def remove_old_logs(log_dir, pattern="RemoteHand_2*.log", max_age_days=7):
+    """
+    Прибрати старі логи формату "один файл на запуск" (RemoteHand_20251110_101010.log,
+    до ротації) - у фоновому потоці, щоб тисячі файлів не гальмували старт.
+    """
+    logger = logging.getLogger(__name__)
+
+    def cleanup():
+        removed = 0
+        cutoff = time.time() - max_age_days * 24 * 3600
+        try:
+            for old_log in log_dir.glob(pattern):
+                try:
+                    if old_log.stat().st_mtime < cutoff:
+                        old_log.unlink()
+                        removed += 1
+                except OSError:
+                    continue
+        except Exception as e:
+            logger.warning(f"⚠️ Не вдалося видалити старі логи: {e}")
+        if removed:
+            logger.info(f"🗑️ Видалено старих логів: {removed}")
+
+    thread = threading.Thread(target=cleanup, name="LogCleanup", daemon=True)
+    thread.start()
+    return thread
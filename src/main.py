@@ -2,53 +2,56 @@ import sys
 import os
 import logging
 from pathlib import Path
-from datetime import datetime
-import customtkinter as ctk
-from tkinter import messagebox
+
+# Таймер фаз запуску - якомога раніше (REMOTEHAND_TIMING=0 вимикає)
+from timing import startup_timer
+
+with startup_timer.span("import_ui"):
+    import customtkinter as ctk
+    from tkinter import messagebox
+import html
 import threading
+import socket
 import ctypes
 import subprocess
 import time
+from importlib.util import find_spec
+
+# Службові режими (процес оновлення, встановлення пароля) не показують вікно
+SERVICE_MODE = len(sys.argv) > 1 and sys.argv[1] in ('--apply-update', '--set-anydesk-password')
 
 # ✅ НАЛАШТУВАННЯ ЛОГУВАННЯ В ФАЙЛ (НА ПОЧАТКУ!)
-if getattr(sys, 'frozen', False):
-    # EXE режим - логи поруч з exe
-    log_dir = Path(sys.executable).parent / "logs"
-else:
-    # DEV режим
-    log_dir = Path(__file__).parent.parent / "logs"
-
-log_dir.mkdir(exist_ok=True)
-
-# Створити лог файл з датою та часом
-log_file = log_dir / f"RemoteHand_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-
-# Налаштувати логування
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Один файл з ротацією (опівночі або за розміром) замість файлу на кожен запуск;
+# запис - через чергу у фоновому потоці. REMOTEHAND_LOG_FORMAT=json - рядки JSON.
+with startup_timer.span("logging"):
+    from log_setup import setup_logging, remove_old_logs
+
+    if getattr(sys, 'frozen', False):
+        # EXE режим - логи поруч з exe
+        log_dir = Path(sys.executable).parent / "logs"
+    else:
+        # DEV режим
+        log_dir = Path(__file__).parent.parent / "logs"
+
+    log_dir.mkdir(exist_ok=True)
+
+    # Службовий процес працює паралельно з основним - окремий файл, щоб не ділити ротацію
+    log_file = setup_logging(
+        log_dir,
+        base_name="RemoteHand_service" if SERVICE_MODE else "RemoteHand",
+        json_lines=os.getenv('REMOTEHAND_LOG_FORMAT') == 'json',
+    )
 
 logger = logging.getLogger(__name__)
-logger.info(f"📝 Лог файл створено: {log_file}")
+logger.info(f"📝 Лог файл: {log_file}")
 logger.info(f"🚀 Запуск RemoteHand...")
 
-# Видалити старі логи (старше 7 днів)
-try:
-    current_time = time.time()
-    for old_log in log_dir.glob("RemoteHand_*.log"):
-        if current_time - old_log.stat().st_mtime > 7 * 24 * 3600:
-            old_log.unlink()
-            logger.info(f"🗑️ Видалено старий лог: {old_log.name}")
-except Exception as e:
-    logger.warning(f"⚠️ Не вдалося видалити старі логи: {e}")
+# Заміри фаз запуску (один рядок JSON на запуск; аналіз - timing_report.py)
+TIMING_FILE = log_dir / "startup_timing.jsonl"
 
-# Завантажити .env файл
-from dotenv import load_dotenv
+# Видалити старі логи попереднього формату (старше 7 днів) - у фоні
+with startup_timer.span("log_cleanup"):
+    remove_old_logs(log_dir)
 
 
 def get_resource_path(relative_path):
@@ -68,52 +71,54 @@ DEV_MODE = os.getenv('REMOTEHAND_DEV_MODE') == '1'
 logger.info(f"{'🔧 DEV РЕЖИМ' if DEV_MODE else '✅ PRODUCTION РЕЖИМ'}")
 
 # Завантажуємо .env
-if DEV_MODE:
-    env_path = get_resource_path(".env")
-    if env_path.exists():
-        load_dotenv(dotenv_path=env_path)
-        logger.info(f"🔧 DEV: Завантажено .env файл з {env_path}")
+with startup_timer.span("env"):
+    if DEV_MODE:
+        env_path = get_resource_path(".env")
+        if env_path.exists():
+            from dotenv import load_dotenv
+            load_dotenv(dotenv_path=env_path)
+            logger.info(f"🔧 DEV: Завантажено .env файл з {env_path}")
+        else:
+            logger.warning(f"⚠️ DEV: .env файл не знайдено за шляхом {env_path}")
     else:
-        logger.warning(f"⚠️ DEV: .env файл не знайдено за шляхом {env_path}")
-else:
-    # PRODUCTION - .env вбудований в EXE
-    env_path = get_resource_path(".env")
-    if env_path.exists():
-        load_dotenv(dotenv_path=env_path)
-        logger.info(f"✅ PROD: Завантажено .env з {env_path}")
+        # PRODUCTION - .env вбудований в EXE
+        env_path = get_resource_path(".env")
+        if env_path.exists():
+            from dotenv import load_dotenv
+            load_dotenv(dotenv_path=env_path)
+            logger.info(f"✅ PROD: Завантажено .env з {env_path}")
 
 # ============ ОНОВЛЕННЯ (ТІЛЬКИ В PROD) ============
-if not DEV_MODE:
-    try:
-        from updater import check_and_update
+# Перевірка на GitHub виконується у фоні після відкриття вікна (UpdateService).
+# Тут лише встановлюється оновлення, вже завантажене під час попереднього запуску.
+if not DEV_MODE and not SERVICE_MODE:
+    with startup_timer.span("updater"):
+        try:
+            from updater import apply_pending_update
 
-        check_and_update()
-    except Exception as e:
-        logger.warning(f"Помилка перевірки оновлень: {e}")
+            apply_pending_update()
+        except Exception as e:
+            logger.warning(f"Помилка перевірки оновлень: {e}")
 
 # ============ ІМПОРТИ ============
-from utils import close_all_rdp_sessions, test_connection
-from config import RDP_HOST, RDP_PORT, PING_HOST, APP_NAME, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID
-from config_manager import ConfigManager
-from telegram_api import TelegramAPI
-from setup_wizard import SetupWizard
-from network_test import NetworkTest
+with startup_timer.span("imports"):
+    from utils import close_all_rdp_sessions, test_connection
+    from config import RDP_HOST, RDP_PORT, PING_HOST, APP_NAME, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID
+    from config_manager import ConfigManager
+    from telegram_api import TelegramAPI
+    from setup_wizard import SetupWizard
+    from network_test import NetworkTest
+    from updater import UpdateService
 
-try:
-    from rdp_manager import RDPManager
 
-    rdp_manager_available = True
-except ImportError as e:
-    rdp_manager_available = False
-    logger.warning(f"rdp_manager не доступна: {e}")
+def modules_available(*names):
+    """Чи встановлені модулі (find_spec лише шукає їх, не імпортуючи)"""
+    return all(find_spec(name) is not None for name in names)
 
-try:
-    from anydesk_manager import AnyDeskManager
 
-    anydesk_available = True
-except ImportError as e:
-    anydesk_available = False
-    logger.warning(f"anydesk_manager не доступна: {e}")
+# RDP і AnyDesk менеджери (keyring, winreg, psutil) імпортуються при першому використанні
+rdp_manager_available = modules_available("winreg", "keyring")
+anydesk_available = modules_available("psutil", "requests")
 
 # ============ iOS СТИЛЬ ============
 IOS_BG_COLOR = "#f2f2f7"
@@ -124,6 +129,11 @@ IOS_CARD_BORDER = "#E0E0E0"
 IOS_CARD_RADIUS = 15
 IOS_BUTTON_RADIUS = 12
 
+# ============ ФОНОВЕ ОНОВЛЕННЯ ============
+UPDATE_START_DELAY_MS = 1000  # Затримка старту перевірки після відкриття вікна
+UPDATE_IDLE_CHECK_MS = 30000  # Як часто перевіряти, чи можна встановити оновлення
+UPDATE_IDLE_SECONDS = 300  # Скільки часу без дій користувача вважається "неактивністю"
+
 
 class RemoteHandApp(ctk.CTk):
 
@@ -139,7 +149,8 @@ class RemoteHandApp(ctk.CTk):
         return base_path / relative_path
 
     def __init__(self):
-        super().__init__()
+        with startup_timer.span("window"):
+            super().__init__()
 
         # Налаштування вікна
         self.title(APP_NAME)
@@ -162,30 +173,97 @@ class RemoteHandApp(ctk.CTk):
             logger.error(f"❌ Помилка встановлення іконки: {e}")
 
         # Ініціалізація менеджерів
-        self.config = ConfigManager()
+        with startup_timer.span("config"):
+            self.config = ConfigManager()
 
         logger.info(f"Telegram token: {'✅ встановлено' if TELEGRAM_TOKEN else '❌ НЕ встановлено'}")
         logger.info(f"Telegram chat_id: {'✅ встановлено' if TELEGRAM_CHAT_ID else '❌ НЕ встановлено'}")
 
-        self.telegram = TelegramAPI(TELEGRAM_TOKEN, TELEGRAM_CHAT_ID)
+        with startup_timer.span("managers"):
+            self.telegram = TelegramAPI(TELEGRAM_TOKEN, TELEGRAM_CHAT_ID)
+            self.telegram.enable_outbox()
 
-        if rdp_manager_available:
-            self.rdp_manager = RDPManager(self.config, self.telegram)
-        else:
-            self.rdp_manager = None
+            # Створюються при першому зверненні (див. rdp_manager / anydesk_manager)
+            self._managers = {}
 
-        if anydesk_available:
-            self.anydesk_manager = AnyDeskManager(self.config, self.telegram)
-        else:
-            self.anydesk_manager = None
+            self.network_test = NetworkTest(self.config, self.telegram)
 
-        self.network_test = NetworkTest(self.config, self.telegram)
+        with startup_timer.span("setup_ui"):
+            self.setup_ui()
 
-        self.setup_ui()
+        # Зміни конфігу з інших процесів/вікон - одразу в UI
+        self.config.subscribe(self._on_config_changed)
+        self.config.start_watch()
+
+        # Фонові оновлення - стартують вже після запуску mainloop()
+        self.update_service = UpdateService(on_status=self.set_update_status)
+        self.install_update_on_exit = False
+        self._last_activity = time.monotonic()
+        for sequence in ("<Key>", "<Button>", "<Motion>"):
+            self.bind_all(sequence, self._on_user_activity, add="+")
+        # Фоновий моніторинг зв'язку - історія для миттєвого тесту мережі
+        self.after(UPDATE_START_DELAY_MS, self.network_test.start_monitor)
+        self.after(UPDATE_START_DELAY_MS, self._start_process_watch)
+        # Асинхронний транспорт Telegram (python-telegram-bot, httpx) - у фоні; до того працює requests
+        self.after(UPDATE_START_DELAY_MS, lambda: threading.Thread(
+            target=self.telegram.enable_async_transport, name="TelegramTransport", daemon=True).start())
+
+        if not DEV_MODE:
+            self.after(UPDATE_START_DELAY_MS, self.update_service.start)
+            self.after(UPDATE_IDLE_CHECK_MS, self._apply_update_when_idle)
 
         if self.config.is_first_run():
             self.show_setup_wizard()
 
+        # Запуск завершено, коли mainloop вперше дійшов до простою (вікно намальоване)
+        self._init_done_at = time.perf_counter()
+        self.after_idle(self._finish_startup_timing)
+
+    def _finish_startup_timing(self):
+        """Записати заміри фаз запуску (один рядок у TIMING_FILE)"""
+        startup_timer.add("first_idle", (time.perf_counter() - self._init_done_at) * 1000)
+        record = startup_timer.save(TIMING_FILE, version=self.app_version, dev=DEV_MODE)
+        if record:
+            logger.info(f"⏱️ Запуск: {startup_timer.summary()}")
+
+    # ============ ЛІНИВІ МЕНЕДЖЕРИ ============
+
+    def _lazy_manager(self, name, factory):
+        """Створити менеджер при першому зверненні; None - якщо його модулі недоступні"""
+        if name not in self._managers:
+            try:
+                with startup_timer.span(name):
+                    self._managers[name] = factory()
+            except ImportError as e:
+                logger.warning(f"{name} не доступна: {e}")
+                self._managers[name] = None
+        return self._managers[name]
+
+    @property
+    def rdp_manager(self):
+        def create():
+            from rdp_manager import RDPManager
+            return RDPManager(self.config, self.telegram)
+
+        return self._lazy_manager("rdp_manager", create) if rdp_manager_available else None
+
+    @property
+    def anydesk_manager(self):
+        def create():
+            from anydesk_manager import AnyDeskManager
+            return AnyDeskManager(self.config, self.telegram)
+
+        return self._lazy_manager("anydesk_manager", create) if anydesk_available else None
+
+    def _start_process_watch(self):
+        """Індекс процесів: події запуску/завершення AnyDesk і RDP клієнта (psutil - вже після старту)"""
+        from process_watch import get_process_watch
+
+        self.process_watch = get_process_watch()
+        self.process_watch.subscribe("anydesk", self._on_process_event)
+        self.process_watch.subscribe("mstsc.exe", self._on_process_event)
+        self.process_watch.start()
+
     def get_app_version(self):
         """Отримати версію програми"""
         try:
@@ -212,15 +290,22 @@ class RemoteHandApp(ctk.CTk):
         """Показати вікно налаштування"""
 
         def on_setup_complete(result):
-            self.config.set("store", result["store"])
-            self.config.set("location", result["location"])
-            if result.get("user_name"):
-                self.config.set("user_name", result["user_name"])
+            # Один запис файлу на всі поля
+            with self.config:
+                self.config.set("store", result["store"])
+                self.config.set("location", result["location"])
+                if result.get("user_name"):
+                    self.config.set("user_name", result["user_name"])
             self.refresh_ui()
 
         wizard = SetupWizard(self, on_setup_complete)
         self.wait_window(wizard)
 
+    def _on_config_changed(self, changed_keys):
+        """Оновити підпис магазину/ПІБ (викликається з будь-якого потоку)"""
+        if changed_keys & {"store", "location", "user_name"}:
+            self.after(0, self.refresh_ui)
+
     def refresh_ui(self):
         """Оновити UI"""
         user_info = self.config.store_location_text
@@ -343,6 +428,18 @@ class RemoteHandApp(ctk.CTk):
         )
         test_btn.pack(fill="x", pady=(0, 10), padx=15)
 
+        route_btn = ctk.CTkButton(
+            test_frame,
+            text="🛣️ Маршрут до 1С",
+            command=self.run_route_test,
+            height=40,
+            font=ctk.CTkFont(size=12, weight="bold"),
+            corner_radius=IOS_BUTTON_RADIUS,
+            fg_color="#5AC8FA",
+            hover_color="#0A84FF"
+        )
+        route_btn.pack(fill="x", pady=(0, 10), padx=15)
+
         # Розділювач
         separator = ctk.CTkFrame(test_frame, height=1, fg_color=IOS_CARD_BORDER)
         separator.pack(fill="x", padx=15, pady=5)
@@ -394,9 +491,10 @@ class RemoteHandApp(ctk.CTk):
         version_frame = ctk.CTkFrame(self, fg_color="transparent")
         version_frame.pack(anchor="s", pady=(0, 8))
 
+        self.app_version = self.get_app_version()
         version_label = ctk.CTkLabel(
             version_frame,
-            text=f"v{self.get_app_version()}",
+            text=f"v{self.app_version}",
             font=ctk.CTkFont(size=9, weight="bold"),
             text_color=IOS_SUBTEXT_COLOR
         )
@@ -410,6 +508,36 @@ class RemoteHandApp(ctk.CTk):
         )
         self.update_status_label.pack(side="left", padx=5)
 
+    def _on_user_activity(self, event=None):
+        """Запам'ятати час останньої дії користувача"""
+        self._last_activity = time.monotonic()
+
+    def _apply_update_when_idle(self):
+        """
+        Встановити завантажене оновлення, якщо користувач неактивний.
+        Вікно закривається звичайним шляхом: main() збереже конфіг, відправить чергу звітів
+        і лише потім запустить процес оновлення (sys.exit з колбеку after() це б пропустив).
+        """
+        if self.update_service.is_ready:
+            idle_for = time.monotonic() - self._last_activity
+            if idle_for >= UPDATE_IDLE_SECONDS:
+                logger.info(f"💤 Користувач неактивний {idle_for:.0f} сек - закриваю для оновлення")
+                self.install_update_on_exit = True
+                self.destroy()
+                return
+
+        self.after(UPDATE_IDLE_CHECK_MS, self._apply_update_when_idle)
+
+    def _on_process_event(self, event, name, pid):
+        """Запуск/завершення AnyDesk або RDP клієнта (викликається з фонового потоку)"""
+        logger.info(f"{'▶️' if event == 'started' else '⏹️'} {name} (PID: {pid}): {event}")
+        if event == "exited" and name == "mstsc.exe":
+            self.after(0, lambda: self.set_status("ℹ️ RDP сесію закрито", "info"))
+
+    def set_update_status(self, text, color):
+        """Показати статус оновлення (безпечно з фонового потоку)"""
+        self.after(0, lambda: self.update_status_label.configure(text=text, text_color=color))
+
     def open_rdp(self):
         """Відкрити RDP"""
         if not self.rdp_manager:
@@ -467,9 +595,18 @@ class RemoteHandApp(ctk.CTk):
 
         self.set_status("⏳ Запуск AnyDesk...", "processing")
 
+        last_percent = [-1]
+
+        def on_progress(downloaded, total):
+            if total:
+                percent = int(downloaded * 100 / total)
+                if percent != last_percent[0]:
+                    last_percent[0] = percent
+                    self.after(0, lambda: self.set_status(f"📥 Завантаження AnyDesk: {percent}%", "processing"))
+
         def anydesk_task():
             try:
-                anydesk_id, pwd = self.anydesk_manager.start(None)
+                anydesk_id, pwd = self.anydesk_manager.start(None, on_progress)
 
                 if anydesk_id:
                     self.set_status(f"✅ AnyDesk запущено\n🆔 ID: {anydesk_id}", "success")
@@ -496,9 +633,12 @@ class RemoteHandApp(ctk.CTk):
         """Запустити тест мережі"""
         self.set_status("⏳ Тест мережі...", "processing")
 
+        def on_host_result(name, line):
+            self.set_status(f"⏳ Тест мережі...\n{line}", "processing")
+
         def test_task():
             try:
-                result = self.network_test.run_full_test()
+                result = self.network_test.run_full_test(on_host_result)
                 self.set_status(f"{result['status']}", result['color'])
             except Exception as e:
                 logger.error(f"Помилка тесту: {e}")
@@ -507,6 +647,24 @@ class RemoteHandApp(ctk.CTk):
         thread = threading.Thread(target=test_task, daemon=True)
         thread.start()
 
+    def run_route_test(self):
+        """Запустити трасування маршруту до сервера 1С"""
+        self.set_status("⏳ Трасування маршруту...", "processing")
+
+        def on_progress(text):
+            self.set_status(f"⏳ Трасування маршруту: {text}", "processing")
+
+        def route_task():
+            try:
+                result = self.network_test.run_route_test(on_progress=on_progress)
+                self.set_status(f"{result['status']}", result['color'])
+            except Exception as e:
+                logger.error(f"Помилка трасування: {e}")
+                self.set_status("❌ Помилка трасування", "error")
+
+        thread = threading.Thread(target=route_task, daemon=True)
+        thread.start()
+
     def set_status(self, text, status_type="info"):
         """Встановити статус з кольором"""
         color_map = {
@@ -518,28 +676,33 @@ class RemoteHandApp(ctk.CTk):
         self.status_label.configure(text=text, text_color=color_map.get(status_type, "gray"))
 
 
-def run_password_setter(anydesk_path, password):
+def run_password_setter(anydesk_path, password, notify=None):
     """
-    Встановлення пароля AnyDesk в адмін режимі
-    Створює прапорець після завершення
+    Встановлення пароля AnyDesk в адмін режимі.
+    notify = (адреса, токен): результат (успіх/помилка + код) повідомляється
+    батьківському процесу через CompletionListener.
     """
-    FLAG_FILE_PATH = Path(os.environ.get("PROGRAMDATA", "C:/")) / ".rh_pass_set_flag"
-
     logger.info(f"[*] Запуск в режимі встановлення пароля для: {anydesk_path}")
-    logger.info(f"[*] Шлях до прапорця: {FLAG_FILE_PATH}")
+
+    def finish(ok, code, message=""):
+        if notify:
+            from completion_channel import report_completion
+            if report_completion(notify[0], notify[1], ok, code, message):
+                logger.info("✅ Результат передано основному процесу")
+        sys.exit(0 if ok else 1)
 
     try:
         is_admin = ctypes.windll.shell32.IsUserAnAdmin()
         if not is_admin:
             logger.error("[!] Потрібні адмін права для --set-anydesk-password")
-            sys.exit(1)
+            finish(False, None, "Немає адмін прав")
     except Exception as e:
         logger.error(f"[!] Не вдалося перевірити права: {e}")
-        sys.exit(1)
+        finish(False, None, f"Не вдалося перевірити права: {e}")
 
     if not anydesk_path or not os.path.exists(anydesk_path):
         logger.error(f"[!] Шлях AnyDesk не знайдено: {anydesk_path}")
-        sys.exit(1)
+        finish(False, None, "Шлях AnyDesk не знайдено")
 
     try:
         logger.info(f"[*] Встановлюю пароль AnyDesk (у адмін режимі)...")
@@ -559,40 +722,66 @@ def run_password_setter(anydesk_path, password):
         logger.info(f"[CODE] {result.returncode}")
         if result.returncode in [0, 8000]:
             logger.info("[✓] Пароль встановлено!")
+            finish(True, result.returncode)
         else:
             logger.error(f"[!] Код помилки: {result.returncode}")
             logger.error(f"[STDOUT] {result.stdout}")
             logger.error(f"[STDERR] {result.stderr}")
+            finish(False, result.returncode, (result.stderr or result.stdout).strip()[:500])
 
-        # Створюємо прапорець
-        try:
-            with open(FLAG_FILE_PATH, 'w') as f:
-                f.write('ok')
-            logger.info(f"✅ Створено прапорець: {FLAG_FILE_PATH}")
-        except Exception as e:
-            logger.error(f"❌ Не вдалося створити прапорець: {e}")
+    except Exception as e:
+        logger.error(f"[!] Критична помилка: {e}")
+        finish(False, None, str(e))
 
-        sys.exit(0)
 
+def send_crash_report(app, error):
+    """Звіт про критичну помилку в Telegram - із замірами фаз запуску (помилка часто саме на старті)"""
+    try:
+        telegram = app.telegram if app is not None else TelegramAPI(TELEGRAM_TOKEN, TELEGRAM_CHAT_ID)
+        config = app.config if app is not None else ConfigManager()
+        telegram.send_error_report(
+            config.store_location_text,
+            socket.gethostname(),
+            html.escape(f"{type(error).__name__}: {error}"),
+            timing_summary=startup_timer.summary(),
+        )
+        telegram.flush_outbox(timeout=5)
     except Exception as e:
-        logger.error(f"[!] Критична помилка: {e}")
-        sys.exit(1)
+        logger.error(f"Не вдалося надіслати звіт про помилку: {e}")
 
 
 def main():
     """Головна функція"""
+    # Обробка режиму оновлення (запускається новим EXE)
+    if len(sys.argv) > 1 and sys.argv[1] == '--apply-update':
+        try:
+            from updater import run_apply_update
+
+            target_path = sys.argv[2]
+            parent_pid = int(sys.argv[3])
+            ok = run_apply_update(target_path, parent_pid)
+        except Exception as e:
+            logger.error(f"Помилка режиму оновлення: {e}")
+            sys.exit(1)
+        sys.exit(0 if ok else 1)
+
     # Обробка адмін-режиму для AnyDesk
     if len(sys.argv) > 1 and sys.argv[1] == '--set-anydesk-password':
         try:
             anydesk_path = sys.argv[2] if len(sys.argv) > 2 else None
             password = os.getenv("ANYDESK_PASSWORD", "r3moteh4nd")
-            run_password_setter(anydesk_path, password)
+            notify = None
+            if '--notify' in sys.argv:
+                index = sys.argv.index('--notify')
+                notify = tuple(sys.argv[index + 1:index + 3]) if len(sys.argv) >= index + 3 else None
+            run_password_setter(anydesk_path, password, notify)
         except Exception as e:
             logger.error(f"Помилка запуску password_setter: {e}")
             sys.exit(1)
         sys.exit(0)
 
     # Звичайний запуск
+    app = None
     try:
         logger.info("=" * 60)
         logger.info("ЗАПУСК REMOTEHAND")
@@ -601,11 +790,22 @@ def main():
         app = RemoteHandApp()
         app.mainloop()
 
+        app.config.commit()
+
+        # Дати шанс відправити звіти, що лишились в черзі
+        app.telegram.flush_outbox(timeout=5)
+        app.telegram.close()
+
+        # Оновлення - після звичайного завершення; новий процес дочекається нашого виходу
+        if app.install_update_on_exit:
+            app.update_service.apply(exit_process=False)
+
         logger.info("=" * 60)
         logger.info("REMOTEHAND ЗАВЕРШЕНО")
         logger.info("=" * 60)
     except Exception as e:
         logger.error(f"КРИТИЧНА ПОМИЛКА: {e}", exc_info=True)
+        send_crash_report(app, e)
         raise
 
 
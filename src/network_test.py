@@ -1,77 +1,250 @@
-import subprocess
-import re
 import socket
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import tempfile
 
+from config import PING_HOST, RDP_HOST, RDP_PORT
+from prober import Prober
+from link_monitor import LinkMonitor
+from link_stats import LinkStats
+from route_tracer import RouteTracer
+from throughput import ThroughputProbe
+
 logger = logging.getLogger(__name__)
 
 
 class NetworkTest:
     """Тестування мережі з звітом"""
 
+    # Хости за замовчуванням; можна змінити ключем "network_hosts" в config.json
+    DEFAULT_HOSTS = {
+        "1С Сервер": PING_HOST,
+        "Google DNS": "8.8.8.8"
+    }
+
+    DEFAULT_TCP_PORT = 443
+
+    # Серія замірів (можна змінити ключами "probe_count" / "probe_interval" в config.json)
+    PROBE_COUNT = 20
+    PROBE_INTERVAL = 0.5  # секунд
+
+    # Фоновий моніторинг ("monitor_interval" / "history_minutes" в config.json)
+    RDP_TARGET_NAME = "1С RDP порт"
+    MONITOR_INTERVAL = 5  # секунд
+    HISTORY_MINUTES = 10
+    MIN_HISTORY_SAMPLES = 12  # Менше замірів - історії ще недостатньо, тест "з нуля"
+
+    LATENCY_WARN_MS = 200  # p95 вище цього - RDP помітно "підвисає"
+
+    # Тест швидкості: "throughput_endpoint" ("хост" або "хост:порт") в config.json вмикає тест,
+    # "throughput_seconds" / "throughput_streams" - тривалість і кількість TCP потоків
+    THROUGHPUT_SECONDS = 5
+    THROUGHPUT_STREAMS = 4
+
+    # Трасування маршруту ("route_rounds" / "route_max_hops" в config.json)
+    ROUTE_ROUNDS = 10
+    ROUTE_MAX_HOPS = 30
+
     def __init__(self, config_manager, telegram_api):
         self.config = config_manager
         self.telegram = telegram_api
+        self.prober = Prober()
+        self.monitor = None
+
+    def get_hosts(self):
+        """Список хостів для тесту {назва: адреса}"""
+        hosts = self.config.get("network_hosts", None)
+        if isinstance(hosts, dict) and hosts:
+            return hosts
+        return dict(self.DEFAULT_HOSTS)
+
+    def get_tcp_port(self, host):
+        """Порт для TCP заміру, якщо ICMP недоступний"""
+        return RDP_PORT if host == RDP_HOST else self.DEFAULT_TCP_PORT
+
+    def parse_host(self, address):
+        """"хост" або "хост:порт" -> (хост, порт для TCP)"""
+        host, _, port = str(address).partition(":")
+        return host, int(port) if port else self.get_tcp_port(host)
 
-    def run_ping_test(self, host, count=20):
-        """Виконати ping тест на хосту"""
+    def run_ping_test(self, address, count=None):
+        """Виконати серію замірів RTT (без запуску ping.exe)"""
+        host, port = self.parse_host(address)
+        count = count or int(self.config.get("probe_count", self.PROBE_COUNT) or self.PROBE_COUNT)
+        interval = float(self.config.get("probe_interval", self.PROBE_INTERVAL) or self.PROBE_INTERVAL)
         try:
-            result = subprocess.run(
-                ['ping', host, '-n', str(count)],
-                capture_output=True,
-                text=True,
-                encoding='cp1252',
-                timeout=60,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            return result.stdout
+            return self.prober.probe(host, count=count, interval=interval, port=port)
         except Exception as e:
-            logger.error(f"Помилка ping: {e}")
-            return f"Помилка при тестуванні {host}: {str(e)}"
+            logger.error(f"Помилка заміру {address}: {e}")
+            return None
+
+    def get_monitor_targets(self):
+        """Цілі фонового моніторингу: хости тесту + RDP порт 1С"""
+        targets = {}
+        for name, address in self.get_hosts().items():
+            host, port = self.parse_host(address)
+            targets[name] = (host, port, "auto")
+        targets[self.RDP_TARGET_NAME] = (RDP_HOST, RDP_PORT, "tcp")
+        return targets
+
+    def start_monitor(self):
+        """Запустити фоновий моніторинг якості зв'язку"""
+        if self.monitor is None:
+            interval = float(self.config.get("monitor_interval", self.MONITOR_INTERVAL) or self.MONITOR_INTERVAL)
+            self.monitor = LinkMonitor(self.get_monitor_targets(), interval=interval, prober=self.prober)
+            self.monitor.start()
+        return self.monitor
+
+    def get_history(self):
+        """Статистика моніторингу за останні хвилини або None, якщо історії замало"""
+        if self.monitor is None:
+            return None, 0
 
-    def parse_ping_loss(self, ping_output):
-        """Витягти відсоток втрати пакетів"""
+        minutes = float(self.config.get("history_minutes", self.HISTORY_MINUTES) or self.HISTORY_MINUTES)
+        history = self.monitor.history(minutes)
+        if not history or min(stats["sent"] for stats in history.values()) < self.MIN_HISTORY_SAMPLES:
+            return None, minutes
+
+        latency = self.monitor.latency(minutes)
+        for name, stats in history.items():
+            stats["latency"] = latency[name]
+        return history, minutes
+
+    def run_throughput_test(self):
+        """Тест швидкості до сервера throughput_server.py або None, якщо сервер не налаштовано"""
+        endpoint = self.config.get("throughput_endpoint", None)
+        if not endpoint:
+            return None
+
+        host, _, port = str(endpoint).partition(":")
+        probe = ThroughputProbe(
+            host,
+            port=int(port) if port else None,
+            duration=float(self.config.get("throughput_seconds", self.THROUGHPUT_SECONDS) or self.THROUGHPUT_SECONDS),
+            streams=int(self.config.get("throughput_streams", self.THROUGHPUT_STREAMS) or self.THROUGHPUT_STREAMS),
+        )
         try:
-            match = re.search(r'(\d+)%\s+(потерь|loss)', ping_output, re.IGNORECASE)
-            if match:
-                return int(match.group(1))
-            return 0
-        except:
-            return -1
-
-    def run_full_test(self):
-        """(ОНОВЛЕНО) Запустити повний тест мережі"""
+            return probe.run()
+        except Exception as e:
+            logger.error(f"Помилка тесту швидкості {endpoint}: {e}")
+            return {"error": str(e), "endpoint": endpoint}
+
+    def _format_throughput(self, result):
+        """Рядок звіту для тесту швидкості"""
+        if "error" in result:
+            return f"❌ Швидкість ({result['endpoint']}): Помилка тестування"
+        return (f"🚀 Швидкість ({result['endpoint']}): ↓ {result['download']:.1f} Мбіт/с, "
+                f"↑ {result['upload']:.1f} Мбіт/с ({result['streams']} потоки, {result['seconds']:g} сек)")
+
+    def _test_host(self, name, address):
+        """Тест одного хоста: (рядок звіту, втрати або None при помилці, чи є стрибки затримки)"""
+        stats = self.run_ping_test(address)
+        if stats is not None:
+            latency = LinkStats()
+            for rtt in stats["samples"]:
+                latency.add(rtt)
+            stats["latency"] = latency.snapshot()
+
+        line, loss = self._format_result(name, self.parse_host(address)[0], stats)
+        return line, loss, self.has_latency_issue((stats or {}).get("latency") or {})
+
+    def _format_result(self, name, host, stats):
+        """Рядок звіту і втрати (або None) за статистикою замірів"""
+        if stats is None:
+            return f"❌ {name} ({host}): Помилка тестування", None
+        if stats.get("unresolved"):
+            return f"❌ {name} ({host}): {stats['loss']:g}% втрати, адресу не знайдено (DNS)", stats["loss"]
+
+        loss = stats["loss"]
+        latency = stats.get("latency") or {}
+        status = "✅" if loss == 0 and not self.has_latency_issue(latency) else ("⚠️" if loss <= 15 else "❌")
+        rtt = f", {stats['avg']:.0f} мс (±{stats['jitter']:.0f})" if stats["avg"] is not None else ""
+        if latency.get("p50") is not None:
+            rtt += f"\n    p50/p95/p99: {latency['p50']:.0f}/{latency['p95']:.0f}/{latency['p99']:.0f} мс"
+        if latency.get("spikes"):
+            rtt += f", стрибків: {latency['spikes']}"
+        return f"{status} {name} ({host}): {loss:g}% втрати{rtt}", loss
+
+    def has_latency_issue(self, latency):
+        """Стрибки затримки або високий p95 - те, що "заморожує" RDP сесію"""
+        p95 = latency.get("p95")
+        return bool(latency.get("spikes")) or (p95 is not None and p95 > self.LATENCY_WARN_MS)
+
+    def run_full_test(self, on_host_result=None):
+        """
+        (ОНОВЛЕНО) Запустити повний тест мережі.
+        Хости пінгуються паралельно; on_host_result(name, line) викликається для кожного,
+        щойно його результат готовий.
+        """
         pc_name = socket.gethostname()
         store_location = self.config.store_location_text
         # (НОВЕ) Отримуємо ПІБ
         user_name = self.config.get("user_name", "")
 
-        hosts = {
-            "1С Сервер": "23.88.7.196",
-            "Google DNS": "8.8.8.8"
-        }
+        history, minutes = self.get_history()
+        header = ""
+
+        results = {}
+        losses = []  # Лише хости, які вдалося виміряти (помилка тесту - не 0% втрат)
+        latency_issue = False
+
+        def collect(name, line, loss):
+            results[name] = line
+            if loss is not None:
+                losses.append(loss)
+            if on_host_result:
+                try:
+                    on_host_result(name, line)
+                except Exception as e:
+                    logger.warning(f"⚠️ Помилка обробки результату {name}: {e}")
 
-        report_parts = []
-        total_loss = 0
+        if history is not None:
+            # Миттєвий звіт з фонового моніторингу замість нової серії замірів
+            order = list(history)
+            samples = max(stats["sent"] for stats in history.values())
+            header = f"📈 За останні {minutes:g} хв ({samples} замірів):\n"
+            for name, stats in history.items():
+                latency_issue |= self.has_latency_issue(stats["latency"])
+                collect(name, *self._format_result(name, self.monitor.targets[name][0], stats))
+        else:
+            hosts = self.get_hosts()
+            order = list(hosts)
+            with ThreadPoolExecutor(max_workers=len(hosts) or 1) as executor:
+                futures = {executor.submit(self._test_host, name, ip): name for name, ip in hosts.items()}
+                for future in as_completed(futures):
+                    line, loss, issue = future.result()
+                    latency_issue |= issue
+                    collect(futures[future], line, loss)
 
-        for name, ip in hosts.items():
-            ping_output = self.run_ping_test(ip)
-            loss = self.parse_ping_loss(ping_output)
+        # Звіт - в порядку хостів з налаштувань, а не в порядку завершення
+        report_parts = [results[name] for name in order]
 
-            if loss >= 0:
-                status = "✅" if loss == 0 else ("⚠️" if loss <= 15 else "❌")
-                report_parts.append(f"{status} {name} ({ip}): {loss}% втрати")
-                total_loss += loss
-            else:
-                report_parts.append(f"❌ {name} ({ip}): Помилка тестування")
+        # Швидкість - після пінгів: повне завантаження каналу спотворило б затримки
+        throughput = self.run_throughput_test()
+        if throughput is not None:
+            line = self._format_throughput(throughput)
+            report_parts.append(line)
+            if on_host_result:
+                try:
+                    on_host_result("throughput", line)
+                except Exception as e:
+                    logger.warning(f"⚠️ Помилка обробки результату швидкості: {e}")
 
-        avg_loss = total_loss / len(hosts) if hosts else 0
+        avg_loss = sum(losses) / len(losses) if losses else None
 
-        if avg_loss == 0:
+        if avg_loss is None:
+            status_text = "❌ Тест не вдався"
+            color = "red"
+        elif avg_loss == 0 and not latency_issue and len(losses) < len(order):
+            status_text = "⚠️ Не всі хости перевірено"
+            color = "orange"
+        elif avg_loss == 0 and not latency_issue:
             status_text = "✅ Мережа в нормі"
             color = "green"
+        elif avg_loss == 0:
+            status_text = "⚠️ Стрибки затримки"
+            color = "orange"
         elif avg_loss <= 15:
             status_text = "⚠️ Є невеликі проблеми"
             color = "orange"
@@ -80,11 +253,81 @@ class NetworkTest:
             color = "red"
 
         # (ОНОВЛЕНО) Відправити в Telegram разом з ПІБ
-        test_report = "\n".join(report_parts)
+        test_report = header + "\n".join(report_parts)
         self.telegram.send_network_report(store_location, pc_name, test_report, user_name)
 
         return {
             "status": status_text,
             "color": color,
-            "details": test_report
-        }
\ No newline at end of file
+            "details": test_report,
+            "throughput": throughput
+        }
+
+    def run_route_test(self, address=PING_HOST, on_progress=None):
+        """
+        Трасування маршруту в стилі MTR: де саме втрачаються пакети -
+        роутер магазину, провайдер чи сторона хостингу.
+        on_progress(текст) викликається після кожного раунду.
+        """
+        pc_name = socket.gethostname()
+        store_location = self.config.store_location_text
+        user_name = self.config.get("user_name", "")
+
+        host, _ = self.parse_host(address)
+        tracer = RouteTracer(
+            prober=self.prober,
+            max_hops=int(self.config.get("route_max_hops", self.ROUTE_MAX_HOPS) or self.ROUTE_MAX_HOPS),
+            rounds=int(self.config.get("route_rounds", self.ROUTE_ROUNDS) or self.ROUTE_ROUNDS),
+        )
+
+        def on_round(number, total):
+            if on_progress:
+                on_progress(f"раунд {number}/{total}")
+
+        try:
+            trace = tracer.trace(host, on_round)
+        except OSError as e:
+            logger.error(f"Трасування {host} неможливе: {e}")
+            return {
+                "status": "❌ Трасування недоступне",
+                "color": "red",
+                "details": str(e)
+            }
+
+        hops = trace["hops"]
+        final_loss = hops[-1]["loss"] if trace["reached"] else 100.0
+
+        # Перший хоп, з якого втрати тягнуться аж до цілі - саме там проблема
+        # (втрати лише на проміжному хопі - зазвичай обмеження ICMP на роутері)
+        problem_hop = None
+        if final_loss > 0:
+            for hop in hops:
+                if hop["loss"] > 0 and all(later["loss"] > 0 for later in hops[hop["ttl"]:]):
+                    problem_hop = hop
+                    break
+
+        if not trace["reached"]:
+            status_text = "❌ Ціль недосяжна"
+            color = "red"
+        elif final_loss == 0:
+            status_text = "✅ Маршрут в нормі"
+            color = "green"
+        elif final_loss <= 15:
+            status_text = "⚠️ Є невеликі втрати на маршруті"
+            color = "orange"
+        else:
+            status_text = "❌ Серйозні втрати на маршруті"
+            color = "red"
+
+        summary = f"🛣️ Маршрут до {host} ({trace['target']}), {trace['rounds']} раундів:\n"
+        if problem_hop:
+            summary += f"Втрати починаються з хопа {problem_hop['ttl']} ({problem_hop['address'] or '???'})\n"
+        report = summary + RouteTracer.format_table(trace)
+
+        self.telegram.send_network_report(store_location, pc_name, report, user_name)
+
+        return {
+            "status": status_text,
+            "color": color,
+            "details": report
+        }
@@ -0,0 +1,287 @@
+import os
+import sys
+import time
+import struct
+import socket
+import logging
+import itertools
+import threading
+
+logger = logging.getLogger(__name__)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMP_TIME_EXCEEDED = 11
+WIN_IP_TTL_EXPIRED_TRANSIT = 11013
+
+
+def _checksum(data):
+    """Контрольна сума ICMP (RFC 1071)"""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def summarize(samples, sent=None):
+    """
+    Статистика по RTT (мс): None в samples - втрачений пакет.
+    Повертає {sent, received, loss, min, avg, max, jitter}.
+    """
+    sent = len(samples) if sent is None else sent
+    rtts = [rtt for rtt in samples if rtt is not None]
+    received = len(rtts)
+
+    stats = {
+        "sent": sent,
+        "received": received,
+        "loss": round((sent - received) * 100 / sent, 1) if sent else 0.0,
+        "min": None,
+        "avg": None,
+        "max": None,
+        "jitter": None,
+    }
+    if rtts:
+        stats["min"] = round(min(rtts), 2)
+        stats["avg"] = round(sum(rtts) / received, 2)
+        stats["max"] = round(max(rtts), 2)
+        # Джитер: середня різниця між сусідніми RTT
+        if received > 1:
+            stats["jitter"] = round(sum(abs(b - a) for a, b in zip(rtts, rtts[1:])) / (received - 1), 2)
+        else:
+            stats["jitter"] = 0.0
+    return stats
+
+
+class Prober:
+    """
+    Вимірювання RTT без запуску ping.exe:
+    ICMP (Windows - IcmpSendEcho, Linux - непривілейований сокет, або raw) або TCP connect.
+    """
+
+    _sequence = itertools.count(1)
+    _sequence_lock = threading.Lock()
+
+    def __init__(self, timeout=1.0):
+        self.timeout = timeout
+        self._icmp_mode = None  # None - ще не перевіряли, "" - недоступно
+
+    # ============ ICMP ============
+
+    def icmp_mode(self):
+        """Який ICMP доступний: "windows", "dgram", "raw" або "" """
+        if self._icmp_mode is not None:
+            return self._icmp_mode
+
+        mode = ""
+        if sys.platform == 'win32':
+            try:
+                import ctypes
+                ctypes.windll.iphlpapi.IcmpCreateFile
+                mode = "windows"
+            except Exception:
+                pass
+        else:
+            for candidate, sock_type in (("dgram", socket.SOCK_DGRAM), ("raw", socket.SOCK_RAW)):
+                try:
+                    socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP).close()
+                    mode = candidate
+                    break
+                except OSError:
+                    continue
+
+        self._icmp_mode = mode
+        logger.info(f"📡 ICMP: {mode or 'недоступний, використовую TCP'}")
+        return mode
+
+    def _next_sequence(self):
+        with self._sequence_lock:
+            return next(self._sequence) & 0xFFFF
+
+    def _icmp_echo_socket(self, ip, timeout, raw, ttl=None):
+        """
+        ICMP echo через сокет. Повертає (результат, адреса відповіді, RTT мс):
+        результат - "reply", "ttl_expired" або None (немає відповіді).
+        """
+        ident = os.getpid() & 0xFFFF
+        seq = self._next_sequence()
+        payload = b"RemoteHand" + struct.pack("!d", time.perf_counter())
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+        packet = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, _checksum(header + payload), ident, seq) + payload
+
+        sock_type = socket.SOCK_RAW if raw else socket.SOCK_DGRAM
+        with socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP) as sock:
+            if ttl is not None:
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+
+            deadline = time.perf_counter() + timeout
+            started = time.perf_counter()
+            sock.sendto(packet, (ip, 0))
+
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None, None, None
+                sock.settimeout(remaining)
+                try:
+                    data, (address, _) = sock.recvfrom(2048)
+                except socket.timeout:
+                    return None, None, None
+                elapsed = (time.perf_counter() - started) * 1000
+
+                if raw:
+                    data = data[(data[0] & 0x0F) * 4:]  # Пропустити IP заголовок
+                if len(data) < 8:
+                    continue
+                reply_type, _, _, reply_ident, reply_seq = struct.unpack("!BBHHH", data[:8])
+
+                # Непривілейований сокет: ядро саме підставляє ідентифікатор
+                if reply_type == ICMP_ECHO_REPLY and reply_seq == seq and (not raw or reply_ident == ident):
+                    return "reply", address, elapsed
+
+                # Time Exceeded: всередині - IP заголовок і початок нашого пакета
+                if reply_type == ICMP_TIME_EXCEEDED and raw and len(data) >= 36:
+                    inner = data[8:]
+                    inner = inner[(inner[0] & 0x0F) * 4:]
+                    if len(inner) >= 8:
+                        _, _, _, inner_ident, inner_seq = struct.unpack("!BBHHH", inner[:8])
+                        if inner_ident == ident and inner_seq == seq:
+                            return "ttl_expired", address, elapsed
+
+    def _icmp_echo_windows(self, ip, timeout, ttl=None):
+        """ICMP echo через IcmpSendEcho (без адмін прав). Повертає як _icmp_echo_socket."""
+        import ctypes
+        from ctypes import wintypes
+
+        class IP_OPTION_INFORMATION(ctypes.Structure):
+            _fields_ = [("Ttl", ctypes.c_ubyte), ("Tos", ctypes.c_ubyte), ("Flags", ctypes.c_ubyte),
+                        ("OptionsSize", ctypes.c_ubyte), ("OptionsData", ctypes.c_void_p)]
+
+        class ICMP_ECHO_REPLY_STRUCT(ctypes.Structure):
+            _fields_ = [("Address", wintypes.ULONG), ("Status", wintypes.ULONG),
+                        ("RoundTripTime", wintypes.ULONG), ("DataSize", wintypes.USHORT),
+                        ("Reserved", wintypes.USHORT), ("Data", ctypes.c_void_p),
+                        ("Options", IP_OPTION_INFORMATION)]
+
+        iphlpapi = ctypes.WinDLL("iphlpapi", use_last_error=True)
+        iphlpapi.IcmpCreateFile.restype = wintypes.HANDLE
+        iphlpapi.IcmpSendEcho.argtypes = [wintypes.HANDLE, wintypes.ULONG, ctypes.c_void_p, wintypes.WORD,
+                                          ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD, wintypes.DWORD]
+        iphlpapi.IcmpCloseHandle.argtypes = [wintypes.HANDLE]
+
+        payload = b"RemoteHand"
+        reply_size = ctypes.sizeof(ICMP_ECHO_REPLY_STRUCT) + len(payload) + 8
+        reply = ctypes.create_string_buffer(reply_size)
+        address = struct.unpack("<L", socket.inet_aton(ip))[0]
+
+        options = None
+        if ttl is not None:
+            options = ctypes.byref(IP_OPTION_INFORMATION(Ttl=ttl))
+
+        handle = iphlpapi.IcmpCreateFile()
+        try:
+            started = time.perf_counter()
+            count = iphlpapi.IcmpSendEcho(handle, address, payload, len(payload), options,
+                                          reply, reply_size, int(timeout * 1000))
+            elapsed = (time.perf_counter() - started) * 1000
+
+            echo_reply = ICMP_ECHO_REPLY_STRUCT.from_buffer(reply)
+            status = echo_reply.Status if count else ctypes.get_last_error()
+            reply_address = socket.inet_ntoa(struct.pack("<L", echo_reply.Address)) if echo_reply.Address else None
+
+            if status == 0:
+                return "reply", reply_address, elapsed
+            if status == WIN_IP_TTL_EXPIRED_TRANSIT and reply_address:
+                return "ttl_expired", reply_address, elapsed
+            return None, None, None
+        finally:
+            iphlpapi.IcmpCloseHandle(handle)
+
+    def icmp_ping(self, host, timeout=None):
+        """Один ICMP echo. RTT в мс або None (втрата)"""
+        result, _, elapsed = self.icmp_echo(host, timeout)
+        return elapsed if result == "reply" else None
+
+    def icmp_echo(self, host, timeout=None, ttl=None):
+        """
+        ICMP echo з можливістю обмежити TTL (для трасування).
+        Повертає (результат "reply"/"ttl_expired"/"unresolved"/None, адреса відповіді, RTT мс);
+        "unresolved" - ім'я хоста не вдалося перетворити на адресу (DNS).
+        """
+        timeout = timeout or self.timeout
+        mode = self.icmp_mode()
+        if not mode:
+            raise OSError("ICMP недоступний")
+        if ttl is not None and mode == "dgram":
+            raise OSError("Трасування потребує raw сокета (права адміністратора)")
+
+        try:
+            ip = socket.gethostbyname(host)
+        except OSError as e:
+            logger.debug(f"ICMP {host}: адресу не знайдено ({e})")
+            return "unresolved", None, None
+
+        try:
+            if mode == "windows":
+                return self._icmp_echo_windows(ip, timeout, ttl)
+            return self._icmp_echo_socket(ip, timeout, raw=(mode == "raw"), ttl=ttl)
+        except OSError as e:
+            logger.debug(f"ICMP {host}: {e}")
+            return None, None, None
+
+    # ============ TCP ============
+
+    def tcp_ping(self, host, port, timeout=None):
+        """Час TCP з'єднання (мс) або None. Відмова (RST) теж означає, що хост відповів."""
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                pass
+        except ConnectionRefusedError:
+            pass
+        except OSError:
+            return None
+        return (time.perf_counter() - started) * 1000
+
+    # ============ СЕРІЯ ЗАМІРІВ ============
+
+    def probe_once(self, host, port=None, method="auto", timeout=None):
+        """Один замір: RTT в мс або None"""
+        if method == "icmp" or (method == "auto" and self.icmp_mode()):
+            return self.icmp_ping(host, timeout)
+        if port is None:
+            raise ValueError("Для TCP заміру потрібен порт")
+        return self.tcp_ping(host, port, timeout)
+
+    def probe(self, host, count=20, interval=0.5, port=None, method="auto"):
+        """
+        Серія замірів з інтервалом interval секунд.
+        Повертає статистику summarize() + "samples" (RTT в мс або None) + "method".
+        Ім'я хоста перетворюється на адресу один раз; якщо не вдалося -
+        100% втрат і "unresolved": True (без замірів).
+        """
+        if method == "auto":
+            method = "icmp" if self.icmp_mode() else "tcp"
+
+        try:
+            ip = socket.gethostbyname(host)
+        except OSError as e:
+            logger.warning(f"⚠️ {host}: адресу не знайдено ({e})")
+            ip = None
+
+        samples = []
+        next_at = time.perf_counter()
+        for i in range(count if ip else 0):
+            samples.append(self.probe_once(ip, port, method))
+            next_at += interval
+            if i < count - 1:
+                time.sleep(max(0.0, next_at - time.perf_counter()))
+
+        stats = summarize(samples if ip else [None] * count)
+        stats["samples"] = samples if ip else [None] * count
+        stats["method"] = method if method == "icmp" else f"tcp:{port}"
+        stats["unresolved"] = ip is None
+        return stats
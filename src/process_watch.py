@@ -0,0 +1,198 @@
+import time
+import logging
+import threading
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessWatch:
+    """
+    Індекс процесів (PID, час створення) -> назва з інкрементальним оновленням:
+    psutil.pids() дешевий, а назву читаємо лише для нових PID.
+    Індекс оновлюється не частіше ніж раз на TTL секунд (або примусово).
+    Підписники отримують події "started"/"exited" для процесів, що їх цікавлять;
+    поки вони є, відомі PID перевіряються за часом створення - перевикористаний PID
+    (інший процес з тим самим номером) - це завершення старого і запуск нового.
+    """
+
+    TTL = 2.0  # секунд
+    WATCH_INTERVAL = 2.0  # секунд між оновленнями фонового потоку
+
+    def __init__(self, ttl=None):
+        self.ttl = self.TTL if ttl is None else ttl
+        self._processes = {}  # pid -> (час створення або None, назва в нижньому регістрі)
+        self._refreshed_at = None
+        self._subscribers = []  # (підрядок назви, callback)
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ============ ІНДЕКС ============
+
+    def refresh(self, force=False):
+        """Оновити індекс, якщо він застарів (або force=True)"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._refreshed_at is not None and now - self._refreshed_at < self.ttl:
+                return
+
+            current = set(psutil.pids())
+            known = set(self._processes)
+
+            exited = [(pid, self._processes.pop(pid)[1]) for pid in known - current]
+            new = current - known
+            if self._subscribers:
+                # Лише для подій: find() і так перевіряє знайдені PID
+                for pid in known & current:
+                    created, name = self._processes[pid]
+                    if not _same_process(pid, created):
+                        del self._processes[pid]
+                        exited.append((pid, name))
+                        new.add(pid)
+
+            started = []
+            for pid in new:
+                identity = _identify(pid)
+                if identity is None:
+                    continue
+                self._processes[pid] = identity
+                started.append((pid, identity[1]))
+
+            first_scan = self._refreshed_at is None
+            self._refreshed_at = now
+            subscribers = list(self._subscribers)
+
+        # Перше сканування - це не "запуск" процесів, а знайомство з ними
+        if not first_scan:
+            self._notify(subscribers, "exited", exited)
+            self._notify(subscribers, "started", started)
+
+    def _notify(self, subscribers, event, processes):
+        for pid, name in processes:
+            for pattern, callback in subscribers:
+                if pattern in name:
+                    try:
+                        callback(event, name, pid)
+                    except Exception as e:
+                        logger.warning(f"⚠️ Помилка підписника процесів ({name}): {e}")
+
+    def _select(self, match):
+        """PID, чиї назви підходять; знайдені перевіряємо (PID міг бути перевикористаний)"""
+        self.refresh()
+        with self._lock:
+            candidates = [(pid, created, name) for pid, (created, name) in self._processes.items() if match(name)]
+
+        result = []
+        exited, started = [], []
+        for pid, created, name in candidates:
+            identity = _identify(pid)
+            if identity is None:
+                self.forget(pid)
+                exited.append((pid, name))
+                continue
+            with self._lock:
+                self._processes[pid] = identity
+            if identity[0] != created and created is not None:
+                exited.append((pid, name))
+                started.append((pid, identity[1]))
+            if match(identity[1]):
+                result.append(pid)
+
+        if exited or started:
+            with self._lock:
+                subscribers = list(self._subscribers)
+            self._notify(subscribers, "exited", exited)
+            self._notify(subscribers, "started", started)
+        return result
+
+    def find(self, pattern):
+        """PID процесів, у назві яких є pattern (без урахування регістру)"""
+        pattern = pattern.lower()
+        return self._select(lambda name: pattern in name)
+
+    def pids(self, name):
+        """PID процесів з точною назвою (без урахування регістру)"""
+        name = name.lower()
+        return self._select(lambda process_name: process_name == name)
+
+    def is_running(self, pattern):
+        return bool(self.find(pattern))
+
+    def forget(self, pid):
+        """Прибрати PID з індексу (процес щойно завершено нами)"""
+        with self._lock:
+            self._processes.pop(pid, None)
+
+    # ============ ПІДПИСКИ ============
+
+    def subscribe(self, pattern, callback):
+        """callback(event, name, pid) для процесів, у назві яких є pattern; event - "started"/"exited" """
+        with self._lock:
+            self._subscribers.append((pattern.lower(), callback))
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [(p, cb) for p, cb in self._subscribers if cb is not callback]
+
+    def start(self, interval=None):
+        """Фонове оновлення - щоб події приходили без явних запитів"""
+        if self._thread and self._thread.is_alive():
+            return
+        interval = interval or self.WATCH_INTERVAL
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="ProcessWatch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.refresh(force=True)
+            except Exception as e:
+                logger.debug(f"Оновлення індексу процесів: {e}")
+            self._stop.wait(interval)
+
+
+def _identify(pid):
+    """(час створення, назва) процесу або None, якщо його вже немає"""
+    try:
+        process = psutil.Process(pid)
+        name = process.name().lower()
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+    try:
+        created = process.create_time()
+    except psutil.NoSuchProcess:
+        return None
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        created = None  # Час недоступний - такий процес впізнаємо лише за PID
+    return created, name
+
+
+def _same_process(pid, created):
+    """Чи PID досі належить процесу, створеному в created"""
+    if created is None:
+        return True
+    try:
+        return psutil.Process(pid).create_time() == created
+    except psutil.NoSuchProcess:
+        return False
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        return True
+
+
+_default_watch = None
+_default_lock = threading.Lock()
+
+
+def get_process_watch():
+    """Спільний індекс процесів для всієї програми"""
+    global _default_watch
+    with _default_lock:
+        if _default_watch is None:
+            _default_watch = ProcessWatch()
+        return _default_watch
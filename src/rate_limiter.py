@@ -0,0 +1,69 @@
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Токен-бакет для обмеження частоти запитів (бюджет на процес).
+    reserve() одразу бронює токен і повертає, скільки секунд треба почекати,
+    тож працює і зі звичайними потоками, і з asyncio.
+    """
+
+    def __init__(self, rate, burst, jitter=0.2):
+        self.rate = rate  # токенів за секунду
+        self.capacity = burst
+        self.jitter = jitter  # Випадкова добавка до паузи (частка), щоб ПК не стукали одночасно
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        self.throttled_count = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _delay_for(self, tokens, now):
+        delay = max(0.0, self._blocked_until - now)
+        if tokens < 1:
+            delay = max(delay, (1 - tokens) / self.rate)
+        return delay
+
+    def time_until_available(self):
+        """Скільки чекати до вільного токена (без бронювання)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return self._delay_for(self._tokens, now)
+
+    def reserve(self):
+        """Забронювати токен. Повертає паузу в секундах перед запитом."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            delay = self._delay_for(self._tokens, now)
+            self._tokens -= 1
+
+            if delay > 0:
+                delay += random.uniform(0, delay * self.jitter)
+                self.throttled_count += 1
+                self.total_wait += delay
+            return delay
+
+    def acquire(self):
+        """Дочекатися токена (блокуюче)"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def penalize(self, retry_after):
+        """Сервер відповів 429: зупинити всі запити процесу на retry_after секунд"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._tokens = min(self._tokens, 0.0)
@@ -0,0 +1,106 @@
+import time
+import socket
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from prober import Prober, summarize
+
+logger = logging.getLogger(__name__)
+
+
+class RouteTracer:
+    """
+    Діагностика маршруту в стилі MTR: кілька раундів, у кожному всі хопи (TTL 1..N)
+    опитуються паралельно. Тривалість обмежена: раундів * (таймаут + пауза).
+    """
+
+    MAX_HOPS = 30
+    ROUNDS = 10
+    TIMEOUT = 1.0  # секунд на відповідь хопа
+    ROUND_INTERVAL = 0.2  # пауза між раундами
+
+    def __init__(self, prober=None, max_hops=None, rounds=None, timeout=None, hop_probe=None):
+        """
+        hop_probe(host, ttl, timeout) -> ("reply"/"ttl_expired"/None, адреса, RTT мс).
+        За замовчуванням - ICMP echo з обмеженим TTL (Prober.icmp_echo).
+        """
+        self.prober = prober or Prober()
+        self.max_hops = max_hops or self.MAX_HOPS
+        self.rounds = rounds or self.ROUNDS
+        self.timeout = timeout or self.TIMEOUT
+        self.hop_probe = hop_probe or (lambda host, ttl, timeout: self.prober.icmp_echo(host, timeout, ttl=ttl))
+
+    def _probe_hop(self, host, ttl):
+        try:
+            return self.hop_probe(host, ttl, self.timeout)
+        except OSError:
+            raise  # Трасування неможливе взагалі (немає raw ICMP)
+        except Exception as e:
+            logger.debug(f"Хоп {ttl} до {host}: {e}")
+            return None, None, None
+
+    def trace(self, host, on_round=None):
+        """
+        Трасування до host. on_round(номер, раундів) викликається після кожного раунду.
+        Повертає {"host", "target", "reached", "rounds", "hops": [{ttl, address, sent, received, loss, ...}]}.
+        Якщо трасування неможливе (немає raw ICMP), hop_probe кидає OSError.
+        """
+        target = socket.gethostbyname(host)
+        samples = {ttl: [] for ttl in range(1, self.max_hops + 1)}
+        addresses = {ttl: Counter() for ttl in samples}
+        dest_ttl = None  # Найменший TTL, на якому відповіла сама ціль
+
+        with ThreadPoolExecutor(max_workers=self.max_hops, thread_name_prefix="RouteTracer") as executor:
+            for round_number in range(1, self.rounds + 1):
+                last_ttl = dest_ttl or self.max_hops
+                futures = {ttl: executor.submit(self._probe_hop, target, ttl) for ttl in range(1, last_ttl + 1)}
+
+                for ttl, future in futures.items():
+                    result, address, rtt = future.result()
+                    samples[ttl].append(rtt if result else None)
+                    if address:
+                        addresses[ttl][address] += 1
+                    if result == "reply" and (dest_ttl is None or ttl < dest_ttl):
+                        dest_ttl = ttl
+
+                if on_round:
+                    on_round(round_number, self.rounds)
+
+                if round_number < self.rounds:
+                    time.sleep(self.ROUND_INTERVAL)
+
+        hops = []
+        for ttl in range(1, (dest_ttl or self.max_hops) + 1):
+            stats = summarize(samples[ttl])
+            stats["ttl"] = ttl
+            stats["address"] = addresses[ttl].most_common(1)[0][0] if addresses[ttl] else None
+            hops.append(stats)
+
+        # Хвіст без жодної відповіді (ціль не досягнута) - показуємо лише перший такий хоп
+        if dest_ttl is None:
+            while len(hops) > 1 and hops[-1]["address"] is None and hops[-2]["address"] is None:
+                hops.pop()
+
+        return {
+            "host": host,
+            "target": target,
+            "reached": dest_ttl is not None,
+            "rounds": self.rounds,
+            "hops": hops,
+        }
+
+    @staticmethod
+    def format_table(trace):
+        """Компактна таблиця для Telegram (<pre>)"""
+        lines = [f"{'#':>2} {'Хоп':<15} {'Втр%':>5} {'Сер':>5} {'Мін':>5} {'Макс':>5} {'Дж':>4}"]
+        for hop in trace["hops"]:
+            address = hop["address"] or "???"
+            if hop["avg"] is None:
+                lines.append(f"{hop['ttl']:>2} {address:<15} {hop['loss']:>5.0f} {'-':>5} {'-':>5} {'-':>5} {'-':>4}")
+                continue
+            lines.append(
+                f"{hop['ttl']:>2} {address:<15} {hop['loss']:>5.0f} {hop['avg']:>5.0f} "
+                f"{hop['min']:>5.0f} {hop['max']:>5.0f} {hop['jitter']:>4.0f}"
+            )
+        return "<pre>" + "\n".join(lines) + "</pre>"
@@ -1,18 +1,47 @@
-import requests
 import logging
 import time
 import os
+import threading
 from pathlib import Path
+from rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
 
+class TelegramRejectedError(Exception):
+    """Telegram відхилив запит (4xx, крім 429) - повтор не допоможе"""
+
+
 class TelegramAPI:
     """Розширена Telegram API для звітування"""
 
-    def __init__(self, token, chat_id):
+    API_BASE_URL = "https://api.telegram.org"
+
+    # Таймаути (з'єднання, читання) в секундах
+    MESSAGE_TIMEOUT = (5, 10)
+    FILE_TIMEOUT = (5, 30)
+
+    # Повтори при мережевих помилках, 429 і 5xx
+    MAX_RETRIES = 3
+    MAX_RETRY_AFTER = 60  # Довше чекати на retry_after не має сенсу - краще повідомити про помилку
+
+    # Скільки чекати на всю пачку deliver_many через асинхронний транспорт
+    DELIVER_TIMEOUT = 120  # секунд
+
+    # Бюджет процесу: Telegram дозволяє ~20 повідомлень на хвилину в одну групу
+    RATE_LIMIT = 20 / 60  # повідомлень за секунду
+    RATE_BURST = 3
+
+    def __init__(self, token, chat_id, api_base_url=None):
         self.token = token
         self.chat_id = chat_id
+        self.api_base_url = api_base_url or self.API_BASE_URL
+        self.rate_limiter = TokenBucket(self.RATE_LIMIT, self.RATE_BURST)
+
+        # ✅ Одна сесія на всі запити: DNS/TCP/TLS з'єднання перевикористовуються (keep-alive).
+        # Створюється при першому запиті - requests не імпортується на старті програми
+        self._session = None
+        self._session_lock = threading.Lock()
 
         # ⚠️ ПЕРЕВІРА ТОКЕНІВ
         if not token:
@@ -22,9 +51,183 @@ class TelegramAPI:
             logger.error("❌ Telegram chat_id не встановлено!")
             self.api_url = None
         else:
-            self.api_url = f"https://api.telegram.org/bot{token}"
+            self.api_url = f"{self.api_base_url}/bot{token}"
             logger.info(f"✅ Telegram налаштовано (токен: {token[:20]}...)")
 
+        self.outbox = None
+        self.transport = None
+
+    @property
+    def session(self):
+        """Спільна HTTP сесія (створюється при першому зверненні)"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+            return self._session
+
+    def enable_async_transport(self):
+        """Перейти на асинхронний транспорт (python-telegram-bot, один event loop)"""
+        if not self.api_url or self.transport is not None:
+            return self.transport
+
+        try:
+            from telegram_async import AsyncTelegramTransport
+
+            self.transport = AsyncTelegramTransport(self.token, self.chat_id, self.api_base_url,
+                                                    rate_limiter=self.rate_limiter)
+        except Exception as e:
+            logger.warning(f"⚠️ Асинхронний транспорт недоступний, використовую requests: {e}")
+        return self.transport
+
+    def enable_outbox(self, db_path=None):
+        """Увімкнути постійну чергу: звіти відправляються у фоні і не губляться без мережі"""
+        if not self.api_url:
+            return None
+        if self.outbox is None:
+            from telegram_outbox import TelegramOutbox
+
+            self.outbox = TelegramOutbox(self, db_path)
+            self.outbox.start()
+        return self.outbox
+
+    def flush_outbox(self, timeout=5):
+        """Дочекатися відправки черги (наприклад, перед виходом)"""
+        if self.outbox is None:
+            return True
+        return self.outbox.flush(timeout)
+
+    def _get_retry_after(self, response):
+        """Скільки секунд Telegram просить почекати (429 Too Many Requests)"""
+        try:
+            retry_after = response.json().get("parameters", {}).get("retry_after")
+            if retry_after is not None:
+                return float(retry_after)
+        except ValueError:
+            pass
+        try:
+            return float(response.headers.get("Retry-After", 1))
+        except ValueError:
+            return 1.0
+
+    def _post(self, method, timeout, files=None, **kwargs):
+        """POST до Bot API з повторами (мережеві помилки, 5xx, 429 з retry_after)"""
+        import requests
+
+        url = f"{self.api_url}/{method}"
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            is_last = attempt == self.MAX_RETRIES
+
+            # Файли при повторі треба читати з початку
+            for f in (files or {}).values():
+                f.seek(0)
+
+            self.rate_limiter.acquire()
+
+            try:
+                response = self.session.post(url, files=files, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if is_last:
+                    raise
+                delay = 0.5 * 2 ** attempt
+                logger.warning(f"⚠️ Telegram недоступний ({e}), повтор через {delay:.1f} сек")
+                time.sleep(delay)
+                continue
+
+            if response.status_code == 429 and not is_last:
+                retry_after = self._get_retry_after(response)
+                if retry_after <= self.MAX_RETRY_AFTER:
+                    # Пауза для всіх відправок процесу - очікування буде в rate_limiter.acquire()
+                    logger.warning(f"⏳ Telegram 429: повтор через {retry_after:.0f} сек")
+                    self.rate_limiter.penalize(retry_after)
+                    continue
+
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                raise TelegramRejectedError(f"{response.status_code}: {response.text[:200]}")
+
+            if response.status_code >= 500 and not is_last:
+                delay = 0.5 * 2 ** attempt
+                logger.warning(f"⚠️ Telegram {response.status_code}, повтор через {delay:.1f} сек")
+                time.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            return response
+
+    def close(self):
+        """Закрити HTTP з'єднання (і звільнити незавершені повідомлення черги)"""
+        if self.outbox is not None:
+            self.outbox.stop(timeout=1)
+        if self.transport is not None:
+            self.transport.close()
+        if self._session is not None:
+            self._session.close()
+
+    def deliver_message(self, text, parse_mode="HTML"):
+        """Відправити повідомлення (помилки - винятками)"""
+        if self.transport is not None:
+            self.transport.send_message_sync(text, parse_mode)
+            logger.info("✅ Повідомлення надіслано в Telegram")
+            return
+
+        payload = {
+            "chat_id": self.chat_id,
+            "text": text,
+            "parse_mode": parse_mode
+        }
+        self._post("sendMessage", self.MESSAGE_TIMEOUT, json=payload)
+        logger.info("✅ Повідомлення надіслано в Telegram")
+
+    def deliver_many(self, messages):
+        """
+        Відправити кілька повідомлень [(text, parse_mode), ...].
+        З асинхронним транспортом - паралельно. Повертає список: None або виняток для кожного.
+        """
+        if self.transport is not None:
+            from concurrent.futures import TimeoutError as FutureTimeoutError
+
+            futures = [self.transport.submit(self.transport.send_message(text, parse_mode))
+                       for text, parse_mode in messages]
+            deadline = time.monotonic() + self.DELIVER_TIMEOUT
+            results = []
+            for future in futures:
+                try:
+                    future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    results.append(None)
+                except FutureTimeoutError as e:
+                    # Завислий запит не тримає чергу: скасувати, повідомлення лишиться для повтору
+                    future.cancel()
+                    results.append(e)
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        results = []
+        for text, parse_mode in messages:
+            # Після мережевої помилки решту не пробуємо - Telegram недоступний
+            if results and results[-1] is not None and not isinstance(results[-1], TelegramRejectedError):
+                results.append(results[-1])
+                continue
+            try:
+                self.deliver_message(text, parse_mode)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def send_message_nowait(self, text, parse_mode="HTML"):
+        """Відправити без очікування результату (fire-and-forget)"""
+        if self.transport is not None:
+            self.transport.send_message_nowait(text, parse_mode)
+            return True
+        return self.queue_message(text, parse_mode)
+
     def send_message(self, text, parse_mode="HTML"):
         """Відправити текстове повідомлення"""
         if not self.api_url:
@@ -33,23 +236,25 @@ class TelegramAPI:
             return False
 
         try:
-            payload = {
-                "chat_id": self.chat_id,
-                "text": text,
-                "parse_mode": parse_mode
-            }
-            response = requests.post(
-                f"{self.api_url}/sendMessage",
-                json=payload,
-                timeout=10
-            )
-            response.raise_for_status()
-            logger.info("✅ Повідомлення надіслано в Telegram")
+            self.deliver_message(text, parse_mode)
             return True
         except Exception as e:
             logger.error(f"❌ Помилка відправки Telegram: {e}")
             return False
 
+    def queue_message(self, text, parse_mode="HTML"):
+        """Поставити повідомлення в постійну чергу (або відправити одразу, якщо черги немає)"""
+        if self.outbox is None:
+            return self.send_message(text, parse_mode)
+
+        try:
+            self.outbox.enqueue(text, parse_mode)
+            logger.info(f"📬 Повідомлення в черзі Telegram (глибина: {self.outbox.depth()})")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Помилка черги Telegram, відправляю напряму: {e}")
+            return self.send_message(text, parse_mode)
+
     def send_file(self, file_path, caption="", file_type="document"):
         """Відправити файл (document або photo)"""
         if not self.api_url:
@@ -57,6 +262,11 @@ class TelegramAPI:
             return False
 
         try:
+            if self.transport is not None:
+                self.transport.submit(self.transport.send_file(file_path, caption, file_type)).result()
+                logger.info(f"✅ Файл надіслано в Telegram")
+                return True
+
             with open(file_path, 'rb') as f:
                 files = {file_type: f}
                 payload = {
@@ -65,13 +275,7 @@ class TelegramAPI:
                     "parse_mode": "HTML"
                 }
                 endpoint = "sendDocument" if file_type == "document" else "sendPhoto"
-                response = requests.post(
-                    f"{self.api_url}/{endpoint}",
-                    files=files,
-                    data=payload,
-                    timeout=30
-                )
-                response.raise_for_status()
+                self._post(endpoint, self.FILE_TIMEOUT, files=files, data=payload)
             logger.info(f"✅ Файл надіслано в Telegram")
             return True
         except Exception as e:
@@ -92,11 +296,13 @@ class TelegramAPI:
             f"<b>Результати:</b>\n"
             f"{test_results}"
         )
-        return self.send_message(report)
+        return self.queue_message(report)
 
     def send_anydesk_info(self, store_location, user_name, pc_name, anydesk_id, password):
         """
-        Відправити AnyDesk інформацію (покращене форматування)
+        Відправити AnyDesk інформацію (покращене форматування).
+        Напряму, повз постійну чергу: пароль не записується на диск (в outbox.sqlite і його WAL).
+        Якщо Telegram недоступний - повідомлення втрачається, ID і пароль є у вікні програми.
         """
         user_info = f"\n<b>👤 Користувач:</b> {user_name}" if user_name else ""
 
@@ -120,10 +326,10 @@ class TelegramAPI:
             f"<b>Час:</b> {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
             f"✅ Користувач підключився до 1С"
         )
-        return self.send_message(message)
+        return self.queue_message(message)
 
-    def send_error_report(self, store_location, pc_name, error_text):
-        """Відправити звіт про помилку"""
+    def send_error_report(self, store_location, pc_name, error_text, timing_summary=None):
+        """Відправити звіт про помилку (timing_summary - заміри запуску, StartupTimer.summary())"""
         message = (
             f"<b>❌ Помилка</b>\n\n"
             f"<b>Магазин/Локація:</b> {store_location}\n"
@@ -131,4 +337,6 @@ class TelegramAPI:
             f"<b>Час:</b> {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
             f"<b>Деталі:</b>\n<code>{error_text}</code>"
         )
-        return self.send_message(message)
\ No newline at end of file
+        if timing_summary:
+            message += f"\n\n<b>⏱️ Запуск:</b> <code>{timing_summary}</code>"
+        return self.queue_message(message)
\ No newline at end of file
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTelegramTransport:
+    """
+    Асинхронний транспорт Telegram на базі python-telegram-bot.
+    Один довгоживучий event loop у фоновому потоці; всі відправки йдуть
+    паралельно через спільний пул keep-alive з'єднань (HTTP/1.1 або HTTP/2).
+    """
+
+    POOL_SIZE = 4
+    CONNECT_TIMEOUT = 5
+    READ_TIMEOUT = 10
+    WRITE_TIMEOUT = 30
+    POOL_TIMEOUT = 10
+
+    MAX_RETRIES = 3
+    MAX_RETRY_AFTER = 60
+
+    def __init__(self, token, chat_id, api_base_url="https://api.telegram.org", rate_limiter=None):
+        # Імпорт тут: без python-telegram-bot TelegramAPI працює через requests
+        from telegram import Bot
+        from telegram.request import HTTPXRequest
+
+        self.chat_id = chat_id
+        self.rate_limiter = rate_limiter
+
+        try:
+            import h2  # noqa: F401
+            http_version = "2"
+        except ImportError:
+            http_version = "1.1"
+
+        request = HTTPXRequest(
+            connection_pool_size=self.POOL_SIZE,
+            connect_timeout=self.CONNECT_TIMEOUT,
+            read_timeout=self.READ_TIMEOUT,
+            write_timeout=self.WRITE_TIMEOUT,
+            pool_timeout=self.POOL_TIMEOUT,
+            http_version=http_version,
+        )
+        self.bot = Bot(token, base_url=f"{api_base_url}/bot", request=request)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="TelegramAsync", daemon=True)
+        self._thread.start()
+        self.submit(self._initialize())
+
+        logger.info(f"✅ Асинхронний транспорт Telegram запущено (HTTP/{http_version})")
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _initialize(self):
+        # Без мережі get_me() не пройде - але пул з'єднань вже ініціалізовано
+        try:
+            await self.bot.initialize()
+        except Exception as e:
+            logger.warning(f"⚠️ Telegram: ініціалізація без get_me ({e})")
+
+    def _translate_error(self, error):
+        """Помилки python-telegram-bot -> помилки TelegramAPI"""
+        from telegram import error as tg_error
+        from telegram_api import TelegramRejectedError
+
+        if isinstance(error, (tg_error.BadRequest, tg_error.Forbidden, tg_error.InvalidToken)):
+            return TelegramRejectedError(str(error))
+        return error
+
+    async def _call(self, method, *args, **kwargs):
+        """Виклик Bot API з повторами (мережеві помилки, RetryAfter)"""
+        from telegram import error as tg_error
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            is_last = attempt == self.MAX_RETRIES
+            if self.rate_limiter:
+                delay = self.rate_limiter.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            try:
+                return await method(*args, **kwargs)
+            except tg_error.RetryAfter as e:
+                if is_last or e.retry_after > self.MAX_RETRY_AFTER:
+                    raise
+                logger.warning(f"⏳ Telegram 429: повтор через {e.retry_after} сек")
+                if self.rate_limiter:
+                    # Пауза для всіх відправок процесу - очікування буде в reserve()
+                    self.rate_limiter.penalize(e.retry_after)
+                else:
+                    await asyncio.sleep(e.retry_after)
+            except (tg_error.BadRequest, tg_error.Forbidden, tg_error.InvalidToken) as e:
+                raise self._translate_error(e) from e
+            except (tg_error.TimedOut, tg_error.NetworkError) as e:
+                if is_last:
+                    raise
+                delay = 0.5 * 2 ** attempt
+                logger.warning(f"⚠️ Telegram недоступний ({e}), повтор через {delay:.1f} сек")
+                await asyncio.sleep(delay)
+
+    # ============ AWAITABLE API (всередині event loop) ============
+
+    async def send_message(self, text, parse_mode="HTML"):
+        """Відправити повідомлення (awaitable)"""
+        return await self._call(self.bot.send_message, self.chat_id, text, parse_mode=parse_mode)
+
+    async def send_file(self, file_path, caption="", file_type="document"):
+        """Відправити файл (awaitable)"""
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if file_type == "document":
+            return await self._call(self.bot.send_document, self.chat_id, data,
+                                    caption=caption, parse_mode="HTML", filename=Path(file_path).name)
+        return await self._call(self.bot.send_photo, self.chat_id, data, caption=caption, parse_mode="HTML")
+
+    # ============ API ДЛЯ ЗВИЧАЙНИХ ПОТОКІВ ============
+
+    def submit(self, coro):
+        """Запустити корутину в event loop транспорту, повертає concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def send_message_sync(self, text, parse_mode="HTML", timeout=120):
+        """Відправити і дочекатися результату"""
+        return self.submit(self.send_message(text, parse_mode)).result(timeout)
+
+    def send_message_nowait(self, text, parse_mode="HTML"):
+        """Відправити без очікування (помилки лише логуються)"""
+        future = self.submit(self.send_message(text, parse_mode))
+        future.add_done_callback(self._log_failure)
+        return future
+
+    @staticmethod
+    def _log_failure(future):
+        if not future.cancelled() and future.exception():
+            logger.error(f"❌ Помилка відправки Telegram: {future.exception()}")
+
+    def close(self, timeout=5):
+        """Закрити з'єднання і зупинити event loop"""
+        try:
+            self.submit(self.bot.shutdown()).result(timeout)
+        except Exception as e:
+            logger.warning(f"⚠️ Telegram: помилка закриття транспорту: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
@@ -0,0 +1,270 @@
+import os
+import uuid
+import random
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+
+from telegram_api import TelegramRejectedError
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramOutbox:
+    """
+    Постійна черга повідомлень Telegram (SQLite в ~/.remotehand).
+    Повідомлення спочатку записуються на диск, а фоновий потік відправляє їх,
+    тож звіт не губиться, якщо Telegram недоступний, а UI не чекає на мережу.
+    Перед відправкою рядки атомарно позначаються (claimed_by), тож кілька копій
+    програми на одному ПК не відправляють те саме повідомлення двічі.
+    """
+
+    DB_FILE = Path.home() / ".remotehand" / "outbox.sqlite"
+
+    BATCH_SIZE = 10  # Скільки повідомлень з черги об'єднувати за раз
+    MAX_MESSAGE_LENGTH = 4096  # Ліміт Telegram на одне повідомлення
+    BATCH_SEPARATOR = "\n\n➖➖➖➖➖\n\n"
+
+    MIN_BACKOFF = 2  # секунд
+    MAX_BACKOFF = 300
+
+    # Позначка "відправляється" старша за це - власник завис або завершився, рядок знову вільний
+    CLAIM_TIMEOUT = 300  # секунд
+
+    def __init__(self, telegram_api, db_path=None):
+        self.telegram = telegram_api
+        self.db_path = Path(db_path or self.DB_FILE)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._idle = threading.Condition(self._lock)
+        self._thread = None
+        self._backoff = 0
+
+        self.sent_count = 0
+        self.failed_attempts = 0
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # Відправлені рядки затираються нулями, а не лишаються у вільних сторінках файлу
+        self._db.execute("PRAGMA secure_delete=ON")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " created REAL NOT NULL,"
+            " text TEXT NOT NULL,"
+            " parse_mode TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " claimed_by TEXT,"
+            " claimed_at REAL)"
+        )
+        # Черга зі старішої версії - без колонок позначки
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(outbox)")}
+        for column, column_type in (("claimed_by", "TEXT"), ("claimed_at", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE outbox ADD COLUMN {column} {column_type}")
+
+    # ============ ПУБЛІЧНИЙ API ============
+
+    def start(self):
+        """Запустити фоновий потік відправки"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TelegramOutbox", daemon=True)
+        self._thread.start()
+
+        pending = self.depth()
+        if pending:
+            logger.info(f"📬 В черзі Telegram {pending} ненадісланих повідомлень")
+
+    def enqueue(self, text, parse_mode="HTML"):
+        """Додати повідомлення в чергу (лише запис на диск, без мережі)"""
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO outbox (created, text, parse_mode) VALUES (?, ?, ?)",
+                (time.time(), text, parse_mode)
+            )
+        self._wakeup.set()
+        return cursor.lastrowid
+
+    def depth(self):
+        """Кількість ненадісланих повідомлень"""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def flush(self, timeout=5):
+        """Спробувати відправити все з черги (наприклад, перед виходом)"""
+        deadline = time.monotonic() + timeout
+        self._backoff = 0
+        self._wakeup.set()
+
+        with self._idle:
+            while True:
+                pending = self._db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+                remaining = deadline - time.monotonic()
+                if not pending:
+                    return True
+                if remaining <= 0 or not (self._thread and self._thread.is_alive()):
+                    logger.warning(f"⚠️ В черзі Telegram лишилось {pending} повідомлень")
+                    return False
+                self._idle.wait(min(remaining, 0.5))
+
+    def stop(self, timeout=5):
+        """Зупинити фоновий потік (черга лишається на диску)"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return
+        # Те, що не встигли відправити, - знову вільне для інших копій програми
+        self._release()
+
+    # ============ ФОНОВИЙ ПОТІК ============
+
+    def _fetch_batch(self):
+        """Взяти і позначити як свої до BATCH_SIZE вільних повідомлень"""
+        with self._lock:
+            now = time.time()
+            # BEGIN IMMEDIATE - блокування запису бази: між SELECT і UPDATE інша копія не втрутиться
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._db.execute(
+                    "SELECT id, text, parse_mode FROM outbox"
+                    " WHERE claimed_by IS NULL OR claimed_by = ? OR claimed_at < ?"
+                    " ORDER BY id LIMIT ?",
+                    (self.worker_id, now - self.CLAIM_TIMEOUT, self.BATCH_SIZE)
+                ).fetchall()
+                if rows:
+                    ids = [row[0] for row in rows]
+                    self._db.execute(
+                        f"UPDATE outbox SET claimed_by = ?, claimed_at = ? WHERE id IN ({','.join('?' * len(ids))})",
+                        (self.worker_id, now, *ids)
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            return rows
+
+    def _delete(self, ids):
+        with self._lock:
+            self._db.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+            self._idle.notify_all()
+
+    def _mark_attempt(self, ids):
+        """Невдала спроба: повідомлення лишається в черзі і знову вільне"""
+        with self._lock:
+            self._db.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, claimed_by = NULL, claimed_at = NULL WHERE id = ?",
+                [(i,) for i in ids]
+            )
+
+    def _release(self):
+        with self._lock:
+            self._db.execute("UPDATE outbox SET claimed_by = NULL, claimed_at = NULL WHERE claimed_by = ?",
+                             (self.worker_id,))
+
+    def _group_batch(self, rows):
+        """Об'єднати повідомлення в групи, що вміщаються в одне повідомлення Telegram"""
+        groups = []
+        for row_id, text, parse_mode in rows:
+            if groups:
+                ids, last_text, last_mode = groups[-1]
+                combined = last_text + self.BATCH_SEPARATOR + text
+                if last_mode == parse_mode and len(combined) <= self.MAX_MESSAGE_LENGTH:
+                    groups[-1] = (ids + [row_id], combined, parse_mode)
+                    continue
+            groups.append(([row_id], text, parse_mode))
+        return groups
+
+    def _drain(self):
+        """Відправити все, що є в черзі. Повертає False при мережевій помилці."""
+        while not self._stop.is_set():
+            # Поки ліміт вичерпано, нові звіти накопичуються і підуть одним повідомленням
+            delay = self.telegram.rate_limiter.time_until_available()
+            if delay > 0:
+                logger.info(f"⏳ Ліміт Telegram: пауза {delay:.1f} сек, в черзі {self.depth()} повідомлень")
+                if self._stop.wait(delay):
+                    return True
+
+            rows = self._fetch_batch()
+            if not rows:
+                return True
+
+            groups = self._group_batch(rows)
+            results = self.telegram.deliver_many([(text, parse_mode) for _, text, parse_mode in groups])
+
+            network_error = None
+            for (ids, text, parse_mode), error in zip(groups, results):
+                if error is None:
+                    self._delete(ids)
+                    self.sent_count += len(ids)
+                elif isinstance(error, TelegramRejectedError):
+                    self._handle_rejected(ids, rows, error)
+                else:
+                    self._mark_attempt(ids)
+                    network_error = error
+
+            if network_error is not None:
+                self.failed_attempts += 1
+                logger.warning(f"⚠️ Telegram недоступний, в черзі {self.depth()} повідомлень: {network_error}")
+                return False
+        return True
+
+    def _handle_rejected(self, ids, rows, error):
+        """Повідомлення відхилено (наприклад, некоректний HTML) - повтор не допоможе"""
+        if len(ids) > 1:
+            # Об'єднане повідомлення - відправити кожне окремо, щоб не загубити решту
+            logger.warning(f"⚠️ Telegram відхилив об'єднане повідомлення, відправляю окремо: {error}")
+            singles = [row for row in rows if row[0] in ids]
+            results = self.telegram.deliver_many([(text, parse_mode) for _, text, parse_mode in singles])
+            for (row_id, _, _), single_error in zip(singles, results):
+                if single_error is None or isinstance(single_error, TelegramRejectedError):
+                    if single_error is not None:
+                        logger.error(f"❌ Telegram відхилив повідомлення, видалено з черги: {single_error}")
+                    self._delete([row_id])
+                else:
+                    self._mark_attempt([row_id])
+            return
+
+        logger.error(f"❌ Telegram відхилив повідомлення, видалено з черги: {error}")
+        self._delete(ids)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                if self._drain():
+                    self._backoff = 0
+                else:
+                    self._backoff = min(max(self._backoff * 2, self.MIN_BACKOFF), self.MAX_BACKOFF)
+            except Exception as e:
+                logger.error(f"❌ Помилка черги Telegram: {e}")
+                self._backoff = self.MAX_BACKOFF
+
+            with self._idle:
+                self._idle.notify_all()
+
+            if not self._backoff:
+                self._wakeup.wait()  # Чекати нових повідомлень
+                continue
+
+            # Пауза після помилки (випадковий зсув - щоб ПК магазинів не повторювали запити одночасно).
+            # Нові повідомлення її не переривають - інакше Telegram смикали б з частотою черги;
+            # раніше будить лише stop() або flush() (він скидає _backoff)
+            deadline = time.monotonic() + self._backoff * random.uniform(1.0, 1.25)
+            while self._backoff and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wakeup.wait(remaining)
+                self._wakeup.clear()
@@ -0,0 +1,199 @@
+import os
+import time
+import struct
+import socket
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Протокол: клієнт шле MAGIC + команда (D - завантаження, U - відвантаження) + тривалість (мс).
+# D: сервер віддає дані, поки не мине тривалість, і закриває з'єднання.
+# U: клієнт шле дані і закриває запис; сервер відповідає, скільки байт отримав (!Q).
+MAGIC = b"RHTP1"
+HEADER = struct.Struct("!5scI")
+COUNT = struct.Struct("!Q")
+
+DOWNLOAD = b"D"
+UPLOAD = b"U"
+
+BLOCK_SIZE = 256 * 1024  # Один виклик sendfile
+PAYLOAD_SIZE = 4 * 1024 * 1024  # Файл з випадковими даними (не стискається по дорозі)
+RECV_BUFFER_SIZE = 256 * 1024
+
+
+def make_payload_file(size=PAYLOAD_SIZE):
+    """Тимчасовий файл з випадковими даними для socket.sendfile"""
+    payload = tempfile.TemporaryFile()
+    payload.write(os.urandom(size))
+    payload.flush()
+    payload.seek(0)
+    return payload
+
+
+def _recv_exactly(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("З'єднання закрито передчасно")
+        data += chunk
+    return data
+
+
+def send_for(sock, payload, duration):
+    """Слати дані з payload через sendfile (zero-copy), поки не мине duration секунд. Повертає байти."""
+    payload_size = os.fstat(payload.fileno()).st_size
+    deadline = time.perf_counter() + duration
+    total = 0
+    offset = 0
+    while time.perf_counter() < deadline:
+        count = min(BLOCK_SIZE, payload_size - offset)
+        total += sock.sendfile(payload, offset, count)
+        offset = (offset + count) % payload_size
+    return total
+
+
+def drain(sock, deadline=None):
+    """Читати в один буфер (recv_into) до EOF або до deadline. Повертає байти."""
+    buffer = bytearray(RECV_BUFFER_SIZE)
+    view = memoryview(buffer)
+    total = 0
+    while deadline is None or time.perf_counter() < deadline:
+        try:
+            received = sock.recv_into(view)
+        except socket.timeout:
+            break
+        if not received:
+            break
+        total += received
+    return total
+
+
+class ThroughputProbe:
+    """
+    Вимірювання швидкості завантаження/відвантаження паралельними TCP потоками
+    до сервера throughput_server.py.
+    """
+
+    DEFAULT_PORT = 5201
+    DURATION = 5  # секунд на кожен напрямок
+    STREAMS = 4
+    CONNECT_TIMEOUT = 5
+
+    def __init__(self, host, port=None, duration=None, streams=None):
+        self.host = host
+        self.port = port or self.DEFAULT_PORT
+        self.duration = duration or self.DURATION
+        self.streams = streams or self.STREAMS
+
+    def _connect(self, command):
+        sock = socket.create_connection((self.host, self.port), timeout=self.CONNECT_TIMEOUT)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.sendall(HEADER.pack(MAGIC, command, int(self.duration * 1000)))
+        return sock
+
+    def _download_stream(self):
+        """Один потік завантаження: (байт, секунд)"""
+        with self._connect(DOWNLOAD) as sock:
+            started = time.perf_counter()
+            # Запас на затримку: сервер сам закриє з'єднання після duration
+            sock.settimeout(self.CONNECT_TIMEOUT)
+            total = drain(sock, deadline=started + self.duration + self.CONNECT_TIMEOUT)
+            return total, time.perf_counter() - started
+
+    def _upload_stream(self, payload):
+        """Один потік відвантаження: (байт, секунд). Рахуємо те, що сервер справді отримав."""
+        with self._connect(UPLOAD) as sock:
+            started = time.perf_counter()
+            sock.settimeout(self.duration + self.CONNECT_TIMEOUT)
+            send_for(sock, payload, self.duration)
+            sock.shutdown(socket.SHUT_WR)
+            (received,) = COUNT.unpack(_recv_exactly(sock, COUNT.size))
+            return received, time.perf_counter() - started
+
+    def _run_streams(self, task):
+        with ThreadPoolExecutor(max_workers=self.streams, thread_name_prefix="Throughput") as executor:
+            results = list(executor.map(lambda _: task(), range(self.streams)))
+        total = sum(size for size, _ in results)
+        elapsed = max(seconds for _, seconds in results)
+        return round(total * 8 / elapsed / 1_000_000, 2) if elapsed else 0.0
+
+    def run(self):
+        """
+        Завантаження, потім відвантаження.
+        Повертає {"download", "upload" (Мбіт/с), "streams", "seconds", "endpoint"}.
+        """
+        download = self._run_streams(self._download_stream)
+
+        def upload():
+            # Свій файл на потік: без sendfile (Windows) позиція файлу спільна для дескриптора
+            with make_payload_file() as payload:
+                return self._upload_stream(payload)
+        upload_mbps = self._run_streams(upload)
+
+        return {
+            "download": download,
+            "upload": upload_mbps,
+            "streams": self.streams,
+            "seconds": self.duration,
+            "endpoint": f"{self.host}:{self.port}",
+        }
+
+
+class ThroughputServer:
+    """Сервер для тесту швидкості (кожне з'єднання - окремий потік)"""
+
+    MAX_DURATION = 30  # секунд - не даємо клієнту тримати канал довше
+
+    def __init__(self, host="0.0.0.0", port=ThroughputProbe.DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self._sock = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Відкрити сокет (port=0 - будь-який вільний). Повертає фактичний порт."""
+        self._sock = socket.create_server((self.host, self.port))
+        self._sock.settimeout(0.5)
+        self.port = self._sock.getsockname()[1]
+        return self.port
+
+    def serve_forever(self):
+        if self._sock is None:
+            self.start()
+        while not self._stop.is_set():
+            try:
+                conn, address = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._handle, args=(conn, address), daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sock:
+            self._sock.close()
+
+    def _handle(self, conn, address):
+        with conn:
+            try:
+                conn.settimeout(self.MAX_DURATION + 10)
+                magic, command, duration_ms = HEADER.unpack(_recv_exactly(conn, HEADER.size))
+                if magic != MAGIC:
+                    return
+                duration = min(duration_ms / 1000, self.MAX_DURATION)
+
+                if command == DOWNLOAD:
+                    with make_payload_file() as payload:
+                        sent = send_for(conn, payload, duration)
+                    logger.info(f"↓ {address[0]}: {sent / 1024 / 1024:.1f} MB за {duration:g} сек")
+                elif command == UPLOAD:
+                    received = drain(conn)
+                    conn.sendall(COUNT.pack(received))
+                    logger.info(f"↑ {address[0]}: {received / 1024 / 1024:.1f} MB")
+            except OSError as e:
+                logger.debug(f"Тест швидкості {address[0]}: {e}")
@@ -0,0 +1,105 @@
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class _NullSpan:
+    """Вимкнений таймер: спільний порожній контекстний менеджер"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class StartupTimer:
+    """
+    Заміри фаз запуску: with timer.span("config"): ...
+    Наприкінці запуску save() дописує один рядок JSON у файл замірів (один запуск - один запис).
+    Вимкнений таймер (REMOTEHAND_TIMING=0) не міряє нічого і нічого не пише.
+    """
+
+    ENV_VAR = "REMOTEHAND_TIMING"
+    MAX_FILE_SIZE = 1024 * 1024  # Більший файл перейменовується в .1 (зберігається одна копія)
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = os.getenv(self.ENV_VAR, "1") != "0"
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.spans = {}  # назва -> мс (в порядку завершення)
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        """Контекстний менеджер: тривалість блоку записується під назвою name"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name):
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000)
+
+    def add(self, name, duration_ms):
+        """Записати готовий замір (повторна назва - сума)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.spans[name] = round(self.spans.get(name, 0.0) + duration_ms, 2)
+
+    def elapsed_ms(self):
+        """Скільки пройшло від створення таймера"""
+        return round((time.perf_counter() - self.started) * 1000, 2)
+
+    def record(self, **extra):
+        """Запис для файлу замірів"""
+        with self._lock:
+            spans = dict(self.spans)
+        return {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "pid": os.getpid(),
+            "total_ms": self.elapsed_ms(),
+            "spans": spans,
+            **extra,
+        }
+
+    def summary(self):
+        """Короткий текст для звітів: "всього 812 мс: ui 420, config 35, ..." (найдовші першими)"""
+        if not self.enabled:
+            return ""
+        with self._lock:
+            spans = sorted(self.spans.items(), key=lambda item: item[1], reverse=True)
+        parts = ", ".join(f"{name} {duration:.0f}" for name, duration in spans)
+        return f"всього {self.elapsed_ms():.0f} мс: {parts}" if parts else f"всього {self.elapsed_ms():.0f} мс"
+
+    def save(self, path, **extra):
+        """Дописати запис запуску в JSONL файл path. Повертає запис (None - таймер вимкнено)."""
+        if not self.enabled:
+            return None
+        record = self.record(**extra)
+        try:
+            if os.path.exists(path) and os.path.getsize(path) > self.MAX_FILE_SIZE:
+                os.replace(path, f"{path}.1")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"⚠️ Не вдалося записати заміри запуску: {e}")
+        return record
+
+
+# Таймер поточного запуску (створюється при першому імпорті - якомога раніше)
+startup_timer = StartupTimer()
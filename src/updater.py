@@ -1,11 +1,15 @@
 import os
 import sys
-import requests
+import json
 import subprocess
 import time
+import shutil
 import logging
+import threading
 from pathlib import Path
 
+from downloader import Downloader, file_sha256
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,6 +17,14 @@ class UpdaterManager:
     GITHUB_REPO = "ShevchukVI/RemoteHand"
     GITHUB_API_URL = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
 
+    # Кеш відповіді GitHub (щоб не витрачати ліміт запитів API)
+    RELEASE_CACHE_FILE = Path.home() / ".remotehand" / "release_cache.json"
+    RELEASE_CACHE_TTL = 6 * 3600  # секунд
+
+    # Завантаження оновлення
+    DOWNLOAD_ATTEMPTS = 5
+    DOWNLOAD_TIMEOUT = (10, 30)  # (з'єднання, читання) секунд
+
     def __init__(self):
         if getattr(sys, 'frozen', False):
             self.current_exe_path = Path(sys.executable)
@@ -32,8 +44,21 @@ class UpdaterManager:
             self.app_dir = Path.cwd()
             self.version_file = self.app_dir / "version.txt"
 
+        self.new_exe_path = self.app_dir / "RemoteHand_new.exe"
+        self.pending_version_file = self.app_dir / "RemoteHand_new.version"
+
+        self.downloader = Downloader(attempts=self.DOWNLOAD_ATTEMPTS, timeout=self.DOWNLOAD_TIMEOUT)
+
+        self.latest_release = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
         self.current_version = self.get_current_version()
 
+    def is_enabled(self):
+        """Оновлення працюють тільки в EXE режимі"""
+        return os.getenv("REMOTEHAND_DEV_MODE") != '1' and getattr(sys, 'frozen', False)
+
     def get_current_version(self):
         """Отримати поточну версію з файлу"""
         if self.version_file.exists():
@@ -49,16 +74,96 @@ class UpdaterManager:
         logger.warning(f"⚠️ version.txt не знайдено за шляхом {self.version_file}, використовую 1.0.0")
         return "1.0.0"
 
+    def load_release_cache(self):
+        """Завантажити кеш відповіді GitHub"""
+        try:
+            with open(self.RELEASE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if isinstance(cache, dict) and isinstance(cache.get("data"), dict):
+                return cache
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"⚠️ Пошкоджений кеш релізу, ігнорую: {e}")
+        return None
+
+    def save_release_cache(self, cache):
+        """Зберегти кеш відповіді GitHub"""
+        try:
+            self.RELEASE_CACHE_FILE.parent.mkdir(exist_ok=True)
+            tmp_path = self.RELEASE_CACHE_FILE.with_name(self.RELEASE_CACHE_FILE.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.RELEASE_CACHE_FILE)
+        except Exception as e:
+            logger.warning(f"⚠️ Не вдалося зберегти кеш релізу: {e}")
+
+    def _count_cache(self, cache, hit):
+        """Оновити лічильники кешу (в пам'яті та в файлі)"""
+        key = "hits" if hit else "misses"
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+        stats = cache.setdefault("stats", {"hits": 0, "misses": 0})
+        stats[key] = stats.get(key, 0) + 1
+
+    def fetch_latest_release(self):
+        """
+        Отримати JSON останнього релізу з урахуванням кешу.
+        Свіжий кеш - без запиту; застарілий - умовний запит (If-None-Match / If-Modified-Since).
+        """
+        cache = self.load_release_cache()
+        now = time.time()
+
+        if cache and now - cache.get("fetched_at", 0) < self.RELEASE_CACHE_TTL:
+            logger.info("📦 Кеш релізу свіжий - запит до GitHub пропущено")
+            self._count_cache(cache, hit=True)
+            self.save_release_cache(cache)
+            return cache["data"]
+
+        headers = {"Accept": "application/vnd.github+json"}
+        if cache:
+            if cache.get("etag"):
+                headers["If-None-Match"] = cache["etag"]
+            if cache.get("last_modified"):
+                headers["If-Modified-Since"] = cache["last_modified"]
+
+        import requests
+
+        logger.info(f"🔍 Запит до GitHub API: {self.GITHUB_API_URL}")
+        response = requests.get(self.GITHUB_API_URL, headers=headers, timeout=10)
+
+        if response.status_code == 304 and cache:
+            logger.info("📦 GitHub: 304 Not Modified - використовую кеш")
+            cache["fetched_at"] = now
+            self._count_cache(cache, hit=True)
+            self.save_release_cache(cache)
+            return cache["data"]
+
+        response.raise_for_status()
+        data = response.json()
+
+        new_cache = {
+            "data": data,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": now,
+            "stats": (cache or {}).get("stats", {"hits": 0, "misses": 0}),
+        }
+        self._count_cache(new_cache, hit=False)
+        self.save_release_cache(new_cache)
+        return data
+
     def get_latest_version(self):
         """Отримати останню версію з GitHub"""
         try:
-            logger.info(f"🔍 Запит до GitHub API: {self.GITHUB_API_URL}")
-            response = requests.get(self.GITHUB_API_URL, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self.fetch_latest_release()
+            self.latest_release = data
             tag = data.get("tag_name", "v1.0.0")
             version = tag.lstrip("v")
-            logger.info(f"📌 Остання версія на GitHub: {version}")
+            logger.info(f"📌 Остання версія на GitHub: {version} "
+                        f"(кеш: {self.cache_hits} влучань / {self.cache_misses} промахів)")
             return version
         except Exception as e:
             logger.error(f"❌ Помилка отримання останньої версії з GitHub: {e}")
@@ -93,34 +198,129 @@ class UpdaterManager:
             logger.error(f"❌ Помилка порівняння версій: {e}")
             return False
 
-    def download_update(self, latest_version):
-        """Завантажити оновлення з GitHub"""
+    def get_release_url(self, version, asset_name):
+        """URL файлу з релізу на GitHub"""
+        return f"https://github.com/{self.GITHUB_REPO}/releases/download/v{version}/{asset_name}"
+
+    def get_expected_sha256(self, version):
+        """Отримати SHA-256 RemoteHand.exe, опублікований разом з релізом"""
+        # GitHub сам повідомляє digest для файлів релізу
+        release = self.latest_release or {}
+        if release.get("tag_name", "").lstrip("v") == version:
+            for asset in release.get("assets", []):
+                digest = asset.get("digest") or ""
+                if asset.get("name") == "RemoteHand.exe" and digest.startswith("sha256:"):
+                    return digest.split(":", 1)[1].lower()
+
+        # Інакше - файл RemoteHand.exe.sha256 з релізу
         try:
-            logger.info(f"📥 Початок завантаження RemoteHand v{latest_version}...")
-
-            download_url = f"https://github.com/{self.GITHUB_REPO}/releases/download/v{latest_version}/RemoteHand.exe"
-            logger.info(f"🔗 URL завантаження: {download_url}")
+            import requests
 
-            response = requests.get(download_url, timeout=60, stream=True)
+            response = requests.get(self.get_release_url(version, "RemoteHand.exe.sha256"),
+                                    timeout=self.DOWNLOAD_TIMEOUT)
             response.raise_for_status()
+            return response.text.split()[0].lower()
+        except Exception as e:
+            logger.warning(f"⚠️ Не вдалося отримати SHA-256 для v{version}: {e}")
+            return None
+
+    def _download_full(self, url, part_path, on_progress=None):
+        """Завантажити файл повністю (паралельні сегменти, докачування, повторні спроби)"""
+        if self.downloader.fetch(url, part_path, on_progress):
+            return True
+        logger.error("❌ Помилка завантаження оновлення")
+        return False
+
+    def get_delta_asset_name(self, latest_version):
+        """Ім'я патча з поточної версії на нову, якщо він є в релізі"""
+        asset_name = f"RemoteHand_{self.current_version}_to_{latest_version}.rhpatch"
+        release = self.latest_release or {}
+        if release.get("tag_name", "").lstrip("v") != latest_version:
+            return None
+        if any(asset.get("name") == asset_name for asset in release.get("assets", [])):
+            return asset_name
+        return None
+
+    def download_delta_update(self, latest_version, part_path, expected_sha256, on_progress=None):
+        """
+        Завантажити бінарний патч і зібрати з нього новий EXE в part_path.
+        Повертає True, лише якщо зібраний файл вже перевірено по SHA-256 релізу;
+        False (без винятків), якщо патча немає або він не пройшов перевірку.
+        """
+        if not self.current_exe_path or not expected_sha256:
+            return False
+
+        asset_name = self.get_delta_asset_name(latest_version)
+        if not asset_name:
+            logger.info("ℹ️ Патч для цієї версії не опубліковано - повне завантаження")
+            return False
 
-            new_exe_path = self.app_dir / "RemoteHand_new.exe"
-            logger.info(f"💾 Збереження в: {new_exe_path}")
+        patch_path = self.app_dir / asset_name
+        try:
+            logger.info(f"🧩 Завантаження патча: {asset_name}")
+            if not self._download_full(self.get_release_url(latest_version, asset_name), patch_path, on_progress):
+                return False
+
+            from delta_update import apply_patch
+            apply_patch(self.current_exe_path, patch_path, part_path)
 
-            with open(new_exe_path, 'wb') as f:
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
-                last_logged_progress = 0
+            if file_sha256(part_path) != expected_sha256:
+                raise ValueError("SHA-256 зібраного файлу не збігається з релізом")
+
+            logger.info(f"✅ Оновлення зібрано з патча ({patch_path.stat().st_size / 1024:.1f} KB)")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Патч не вдалося застосувати, повне завантаження: {e}")
+            part_path.unlink(missing_ok=True)
+            return False
+        finally:
+            patch_path.unlink(missing_ok=True)
+
+    def download_update(self, latest_version, on_progress=None):
+        """
+        Завантажити оновлення з GitHub.
+        Якщо в релізі є патч від поточної версії - завантажується тільки він.
+        Частково завантажений файл докачується, результат перевіряється по SHA-256.
+        on_progress(downloaded, total) викликається під час завантаження.
+        """
+        new_exe_path = self.new_exe_path
+        part_path = self.app_dir / f"RemoteHand_new_{latest_version}.exe.part"
+
+        # Недокачані файли інших версій більше не потрібні
+        for stale in self.app_dir.glob("RemoteHand_new_*.exe.part*"):
+            if stale.name not in (part_path.name, part_path.name + ".state"):
+                stale.unlink(missing_ok=True)
+
+        download_url = self.get_release_url(latest_version, "RemoteHand.exe")
+        logger.info(f"📥 Початок завантаження RemoteHand v{latest_version}...")
+        logger.info(f"🔗 URL завантаження: {download_url}")
+        logger.info(f"💾 Збереження в: {new_exe_path}")
+
+        expected_sha256 = self.get_expected_sha256(latest_version)
+
+        # Спочатку - маленький бінарний патч від поточної версії, інакше - повний файл
+        delta_verified = not part_path.exists() and self.download_delta_update(
+            latest_version, part_path, expected_sha256, on_progress)
+
+        if not delta_verified and not self._download_full(download_url, part_path, on_progress):
+            return None
 
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-                    downloaded += len(chunk)
+        try:
+            if delta_verified:
+                logger.info("🔒 SHA-256 перевірено (зібраний з патча файл)")
+            elif expected_sha256:
+                actual_sha256 = file_sha256(part_path)
+                if actual_sha256 != expected_sha256:
+                    logger.error(f"❌ SHA-256 не збігається: {actual_sha256} != {expected_sha256}")
+                    part_path.unlink(missing_ok=True)
+                    return None
+                logger.info("🔒 SHA-256 перевірено")
+            else:
+                logger.warning("⚠️ Реліз без SHA-256 - перевірку пропущено")
 
-                    if total_size > 0:
-                        progress = (downloaded / total_size) * 100
-                        if progress - last_logged_progress >= 10:
-                            logger.info(f"   Завантажено: {progress:.1f}%")
-                            last_logged_progress = progress
+            # Готовий файл з'являється тільки після повного завантаження
+            os.replace(part_path, new_exe_path)
+            self.pending_version_file.write_text(latest_version, encoding='utf-8')
 
             logger.info(f"✅ Завантажено RemoteHand v{latest_version} успішно!")
             logger.info(f"📊 Розмір файлу: {new_exe_path.stat().st_size / 1024 / 1024:.2f} MB")
@@ -130,129 +330,116 @@ class UpdaterManager:
             logger.error(f"❌ Помилка завантаження оновлення: {e}")
             return None
 
-    def run_update_script(self, new_exe_path: Path):
-        """Створює PowerShell скрипт для оновлення"""
+    def launch_update(self, new_exe_path: Path, exit_process=True):
+        """
+        Запустити новий EXE в режимі --apply-update і завершити поточний процес.
+        Новий процес дочекається нашого виходу, замінить файл і перезапустить програму.
+        exit_process=False - не виходити: процес завершить викликач (після звичайного закриття).
+        Повертає True, якщо процес оновлення запущено.
+        """
         if not self.current_exe_path:
-            logger.warning("⚠️ Неможливо створити скрипт оновлення в DEV режимі.")
-            return
+            logger.warning("⚠️ Неможливо встановити оновлення в DEV режимі.")
+            return False
 
         current_exe_abs = str(self.current_exe_path.resolve())
         new_exe_abs = str(new_exe_path.resolve())
-        log_file = self.app_dir / "logs" / "update.log"
 
-        logger.info(f"📝 Створення PowerShell скрипту оновлення...")
+        logger.info(f"🚀 Запуск оновлення...")
         logger.info(f"   Старий файл: {current_exe_abs}")
         logger.info(f"   Новий файл: {new_exe_abs}")
 
-        # ✅ ВИПРАВЛЕНИЙ PowerShell скрипт (всі дужки на місці!)
-        ps1_content = f"""# RemoteHand Auto-Update Script
-$logFile = "{log_file}"
-$ErrorActionPreference = "Continue"
-
-function Write-Log {{
-    param([string]$message)
-    $timestamp = Get-Date -Format "yyyy-MM-dd HH:mm:ss"
-    $logMessage = "[$timestamp] $message"
-    Write-Host $logMessage
-    Add-Content -Path $logFile -Value $logMessage -Encoding UTF8
-}}
-
-Write-Log "======================================"
-Write-Log " RemoteHand Auto-Update STARTED"
-Write-Log "======================================"
-Write-Log ""
-
-Write-Log "[1/5] Closing RemoteHand..."
-Stop-Process -Name "RemoteHand" -Force -ErrorAction SilentlyContinue
-Write-Log "   Process stopped"
-
-Write-Log "[2/5] Waiting for file unlock (5 sec)..."
-Start-Sleep -Seconds 5
-Write-Log "   Wait complete"
-
-Write-Log "[3/5] Backing up old version..."
-$backupPath = "{current_exe_abs}.backup"
-if (Test-Path "{current_exe_abs}") {{
-    Copy-Item "{current_exe_abs}" $backupPath -Force
-    Write-Log "   Backup created: $backupPath"
-}} else {{
-    Write-Log "   WARNING: Old file not found!"
-}}
-
-Write-Log "[4/5] Replacing with new version..."
-try {{
-    if (-not (Test-Path "{new_exe_abs}")) {{
-        Write-Log "   ERROR: New file not found: {new_exe_abs}"
-        throw "New file not found"
-    }}
-
-    Move-Item "{new_exe_abs}" "{current_exe_abs}" -Force
-    Write-Log "   File replaced successfully!"
-
-    if (Test-Path $backupPath) {{
-        Remove-Item $backupPath -Force
-        Write-Log "   Backup removed"
-    }}
-}} catch {{
-    Write-Log "   Error replacing file: $_"
-
-    if (Test-Path $backupPath) {{
-        Write-Log "   Restoring from backup..."
-        Move-Item $backupPath "{current_exe_abs}" -Force
-        Write-Log "   Restored from backup"
-    }}
-
-    Write-Log "Update FAILED! Press any key to exit..."
-    $null = $Host.UI.RawUI.ReadKey("NoEcho,IncludeKeyDown")
-    exit 1
-}}
-
-Write-Log "[5/5] Starting RemoteHand..."
-Start-Process "{current_exe_abs}"
-Write-Log "   RemoteHand started"
-
-Write-Log ""
-Write-Log "Update complete!"
-Write-Log "This window will close in 3 seconds..."
-Start-Sleep -Seconds 3
-
-# Видалити сам скрипт
-Remove-Item $MyInvocation.MyCommand.Path -Force
-"""
-
-        ps1_path = self.app_dir / "update.ps1"
+        try:
+            subprocess.Popen(
+                [new_exe_abs, "--apply-update", current_exe_abs, str(os.getpid())],
+                creationflags=getattr(subprocess, "DETACHED_PROCESS", 0),
+                cwd=str(self.app_dir),
+                close_fds=True
+            )
+        except Exception as e:
+            logger.error(f"❌ Помилка запуску оновлення: {e}")
+            return False
+
+        if not exit_process:
+            return True
+
+        logger.info("👋 Завершення програми для оновлення")
+        sys.exit(0)
 
+    def cleanup_after_update(self):
+        """Прибрати резервну копію, що лишилась після заміни файлу"""
+        if not self.current_exe_path:
+            return
+
+        backup_path = self.current_exe_path.with_name(self.current_exe_path.name + ".backup")
         try:
-            with open(ps1_path, 'w', encoding='utf-8') as f:
-                f.write(ps1_content)
+            backup_path.unlink()
+            logger.info(f"🗑️ Видалено резервну копію: {backup_path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"⚠️ Не вдалося видалити резервну копію: {e}")
+
+    def find_update(self):
+        """Повернути нову версію, якщо вона є на GitHub"""
+        latest_version = self.get_latest_version()
+        if not latest_version:
+            logger.warning("⚠️ Не вдалося отримати інформацію про останню версію")
+            return None
 
-            logger.info(f"✅ Створено update.ps1 → {ps1_path}")
+        logger.info(f"📌 Поточна версія: {self.current_version}")
+        logger.info(f"📌 Остання версія: {latest_version}")
 
-            # Запуск PowerShell скрипту
-            subprocess.Popen(
-                [
-                    "powershell.exe",
-                    "-ExecutionPolicy", "Bypass",
-                    "-WindowStyle", "Normal",
-                    "-File", str(ps1_path)
-                ],
-                creationflags=subprocess.CREATE_NEW_CONSOLE,
-                cwd=str(self.app_dir)
-            )
+        if self.compare_versions(self.current_version, latest_version):
+            logger.info(f"🔔 ДОСТУПНЕ ОНОВЛЕННЯ: v{latest_version}")
+            return latest_version
 
-            logger.info("🚀 Запущено update.ps1")
-            logger.info("⏱️ Завершення програми через 2 секунди...")
+        logger.info(f"✅ У вас остання версія: v{self.current_version}")
+        return None
 
-            time.sleep(2)
-            sys.exit(0)
+    def get_pending_update(self):
+        """Отримати вже завантажене оновлення (з попереднього запуску)"""
+        if not self.new_exe_path.exists():
+            return None
 
-        except Exception as e:
-            logger.error(f"❌ Помилка створення update.ps1: {e}")
+        try:
+            pending_version = self.pending_version_file.read_text(encoding='utf-8').strip()
+        except Exception:
+            pending_version = ""
+
+        if pending_version and self.compare_versions(self.current_version, pending_version):
+            return self.new_exe_path
+
+        # Застарілий файл (або вже встановлений) - прибрати
+        for path in (self.new_exe_path, self.pending_version_file):
+            try:
+                path.unlink()
+                logger.info(f"🗑️ Видалено застаріле оновлення: {path}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # Процес --apply-update ще може завершуватись
+                logger.warning(f"⚠️ Не вдалося видалити {path}: {e}")
+        return None
+
+    def apply_pending_update(self):
+        """Встановити оновлення, завантажене під час попереднього запуску"""
+        if not self.is_enabled():
+            return False
+
+        self.cleanup_after_update()
+
+        new_exe = self.get_pending_update()
+        if not new_exe:
+            return False
+
+        logger.info(f"🔔 Знайдено завантажене оновлення: {new_exe}")
+        self.launch_update(new_exe)
+        return True
 
     def check_and_update(self):
         """Перевірити та встановити оновлення"""
         try:
-            if os.getenv("REMOTEHAND_DEV_MODE") == '1' or not getattr(sys, 'frozen', False):
+            if not self.is_enabled():
                 logger.info("🔧 DEV режим - пропуск оновлень")
                 return False
 
@@ -260,26 +447,15 @@ Remove-Item $MyInvocation.MyCommand.Path -Force
             logger.info("🔄 ПЕРЕВІРКА ОНОВЛЕНЬ ЗАПУЩЕНА")
             logger.info("=" * 60)
 
-            latest_version = self.get_latest_version()
-            if not latest_version:
-                logger.warning("⚠️ Не вдалося отримати інформацію про останню версію")
-                return False
-
-            logger.info(f"📌 Поточна версія: {self.current_version}")
-            logger.info(f"📌 Остання версія: {latest_version}")
-
-            if self.compare_versions(self.current_version, latest_version):
-                logger.info(f"🔔 ДОСТУПНЕ ОНОВЛЕННЯ: v{latest_version}")
-
+            latest_version = self.find_update()
+            if latest_version:
                 new_exe = self.download_update(latest_version)
                 if new_exe and new_exe.exists():
-                    logger.info(f"✅ Оновлення завантажено! Запуск скрипту оновлення...")
-                    self.run_update_script(new_exe)
+                    logger.info(f"✅ Оновлення завантажено! Запуск оновлення...")
+                    self.launch_update(new_exe)
                     return True
                 else:
                     logger.error("❌ Не вдалося завантажити оновлення.")
-            else:
-                logger.info(f"✅ У вас остання версія: v{self.current_version}")
 
             logger.info("=" * 60)
             return False
@@ -289,7 +465,191 @@ Remove-Item $MyInvocation.MyCommand.Path -Force
             return False
 
 
+class UpdateService:
+    """
+    Фонова служба оновлень.
+    Перевіряє та завантажує оновлення в окремому потоці, не блокуючи вікно.
+    Встановлення - тільки коли користувач неактивний або при наступному запуску.
+    """
+
+    def __init__(self, on_status=None, updater=None):
+        self.updater = updater or UpdaterManager()
+        self.on_status = on_status
+        self.ready_path = None
+        self.ready_version = None
+        self._thread = None
+
+    def _report(self, text, color):
+        """Передати статус в UI"""
+        if self.on_status:
+            try:
+                self.on_status(text, color)
+            except Exception as e:
+                logger.warning(f"⚠️ Не вдалося оновити статус оновлення: {e}")
+
+    def start(self):
+        """Запустити перевірку у фоновому потоці"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(target=self._run, name="UpdateService", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            if not self.updater.is_enabled():
+                logger.info("🔧 DEV режим - пропуск оновлень")
+                return
+
+            logger.info("🔄 Фонова перевірка оновлень...")
+            self._report("🔄", "gray")
+
+            latest_version = self.updater.find_update()
+            if not latest_version:
+                self._report("✅", "green")
+                return
+
+            self._report(f"📥 v{latest_version}", "blue")
+            last_percent = [-1]
+
+            def on_progress(downloaded, total):
+                if total:
+                    percent = int(downloaded * 100 / total)
+                    if percent != last_percent[0]:
+                        last_percent[0] = percent
+                        self._report(f"📥 v{latest_version} {percent}%", "blue")
+
+            new_exe = self.updater.download_update(latest_version, on_progress)
+
+            if new_exe and new_exe.exists():
+                self.ready_path = new_exe
+                self.ready_version = latest_version
+                logger.info(f"✅ Оновлення v{latest_version} готове до встановлення")
+                self._report(f"🔔 v{latest_version}", "orange")
+            else:
+                logger.error("❌ Не вдалося завантажити оновлення.")
+                self._report("⚠️", "orange")
+
+        except Exception as e:
+            logger.error(f"❌ Помилка фонової перевірки оновлень: {e}", exc_info=True)
+            self._report("⚠️", "orange")
+
+    @property
+    def is_ready(self):
+        """Чи завантажено оновлення"""
+        return self.ready_path is not None and self.ready_path.exists()
+
+    def apply(self, exit_process=True):
+        """
+        Встановити завантажене оновлення.
+        exit_process=False - лише запустити процес оновлення; він дочекається, поки програма
+        сама завершиться (після збереження конфігу і відправки черги звітів).
+        """
+        if not self.is_ready:
+            return False
+
+        logger.info(f"🚀 Встановлення оновлення v{self.ready_version}...")
+        return self.updater.launch_update(self.ready_path, exit_process=exit_process)
+
+
 def check_and_update():
     """Функція для виклику з main.py"""
     updater = UpdaterManager()
     return updater.check_and_update()
+
+
+def apply_pending_update():
+    """Встановити оновлення, завантажене під час попереднього запуску"""
+    try:
+        return UpdaterManager().apply_pending_update()
+    except Exception as e:
+        logger.warning(f"Помилка встановлення відкладеного оновлення: {e}")
+        return False
+
+
+# ============ РЕЖИМ --apply-update ============
+
+def wait_for_process_exit(pid, timeout=60):
+    """Дочекатися завершення процесу (без фіксованих пауз)"""
+    import psutil
+
+    try:
+        psutil.Process(pid).wait(timeout=timeout)
+    except psutil.NoSuchProcess:
+        pass
+    except psutil.TimeoutExpired:
+        return False
+    return True
+
+
+def _replace_with_retry(src, dst, timeout=10):
+    """
+    os.replace з повторами: на Windows файл EXE може бути заблокований
+    ще кілька мілісекунд після завершення процесу.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while True:
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if time.monotonic() + delay > deadline:
+                raise
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+
+def swap_files(new_path, target_path, lock_timeout=10):
+    """
+    Атомарно замінити target_path вмістом new_path.
+    Старий файл зберігається як <target>.backup і повертається при помилці.
+    """
+    new_path = Path(new_path)
+    target_path = Path(target_path)
+    staged_path = target_path.with_name(target_path.name + ".staged")
+    backup_path = target_path.with_name(target_path.name + ".backup")
+
+    # Копія, а не переміщення: new_path - це EXE, що зараз виконує заміну
+    shutil.copy2(new_path, staged_path)
+
+    had_target = target_path.exists()
+    if had_target:
+        _replace_with_retry(target_path, backup_path, lock_timeout)
+
+    try:
+        os.replace(staged_path, target_path)
+    except Exception:
+        if had_target:
+            os.replace(backup_path, target_path)
+        staged_path.unlink(missing_ok=True)
+        raise
+
+    return backup_path if had_target else None
+
+
+def run_apply_update(target_path, parent_pid, new_path=None, restart=True):
+    """Точка входу --apply-update: дочекатися виходу старого процесу, замінити файл, перезапустити"""
+    new_path = Path(new_path or sys.executable)
+    target_path = Path(target_path)
+
+    logger.info(f"[*] Оновлення: {new_path} → {target_path} (очікую PID {parent_pid})")
+
+    if not wait_for_process_exit(parent_pid):
+        logger.error(f"[!] Процес {parent_pid} не завершився")
+        return False
+
+    try:
+        swap_files(new_path, target_path)
+        logger.info("[✓] Файл замінено")
+    except Exception as e:
+        logger.error(f"[!] Помилка заміни файлу: {e}")
+        return False
+
+    # Версія оновлення більше не "очікує" встановлення
+    (target_path.parent / "RemoteHand_new.version").unlink(missing_ok=True)
+
+    if restart:
+        subprocess.Popen([str(target_path)], cwd=str(target_path.parent), close_fds=True)
+        logger.info("[✓] RemoteHand перезапущено")
+    return True
@@ -1,7 +1,7 @@
 import os
 import sys
+import time
 import subprocess
-import psutil
 from pathlib import Path
 from config import LOCK_FILE, APP_NAME
 
@@ -33,6 +33,29 @@ class SingleInstance:
         return False
 
 
+def wait_until(condition, timeout, initial_delay=0.05, max_delay=1.0, abort=None):
+    """
+    Чекати, поки condition() поверне істинне значення: опитування з експоненційною паузою
+    (initial_delay, x2, ..., max_delay) і жорстким дедлайном timeout секунд.
+    abort() -> True перериває очікування одразу (наприклад, процес завершився).
+    Повертає результат condition() або None.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        result = condition()
+        if result:
+            return result
+        if abort and abort():
+            return None
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
 def open_rdp_connection(host, port):
     """Відкриття RDP підключення"""
     rdp_command = f'mstsc /v:{host}:{port}'
@@ -41,17 +64,33 @@ def open_rdp_connection(host, port):
 
 def close_all_rdp_sessions():
     """Закриття всіх RDP сесій"""
-    for proc in psutil.process_iter(['name']):
+    import psutil
+    from process_watch import get_process_watch
+
+    watch = get_process_watch()
+    # Примусово: mstsc, запущений менше ніж TTL тому, ще не в індексі
+    watch.refresh(force=True)
+    for pid in watch.pids('mstsc.exe'):
         try:
-            if proc.info['name'].lower() == 'mstsc.exe':
-                proc.kill()
+            psutil.Process(pid).kill()
+            watch.forget(pid)
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             pass
 
 
-def test_connection(host):
-    """Тест з'єднання через ping"""
-    param = '-n' if sys.platform == 'win32' else '-c'
-    command = ['ping', param, '1', host]
-    result = subprocess.run(command, capture_output=True, text=True)
-    return result.returncode == 0
\ No newline at end of file
+def test_connection(address, port=None):
+    """
+    Тест з'єднання (ICMP, або TCP connect, якщо ICMP недоступний).
+    address - "хост" або "хост:порт"; без порту TCP йде на порт RDP для сервера 1С, для решти - 443.
+    """
+    from prober import Prober
+    from config import RDP_HOST, RDP_PORT
+
+    host, _, address_port = str(address).partition(":")
+    if port is None:
+        port = int(address_port) if address_port else (RDP_PORT if host == RDP_HOST else 443)
+
+    try:
+        return Prober().probe_once(host, port) is not None
+    except Exception:
+        return False
\ No newline at end of file
@@ -0,0 +1,94 @@
+import os
+import sys
+import types
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from fake_bot_api import FakeBotAPI  # noqa: E402
+
+TOKEN = "123456:TEST"
+CHAT_ID = "-100123"
+
+
+class FakeConfig:
+    """ConfigManager в пам'яті: лише get/set"""
+
+    store_location_text = "Магазин 1"
+
+    def __init__(self, **values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class FakeTelegram:
+    """Замість TelegramAPI: звіти тесту мережі записуються"""
+
+    def __init__(self):
+        self.reports = []
+
+    def send_network_report(self, store_location, pc_name, test_results, user_name=""):
+        self.reports.append(test_results)
+        return True
+
+
+@pytest.fixture
+def make_config():
+    """make_config(ключ=значення, ...) - налаштування в пам'яті"""
+    return FakeConfig
+
+
+@pytest.fixture
+def anydesk_config():
+    """anydesk_config(шлях) - налаштування з кешем AnyDesk лише зі шляхом (без ID)"""
+    from anydesk_manager import AnyDeskManager
+
+    return lambda anydesk_path: FakeConfig(**{AnyDeskManager.CACHE_KEY: {"path": anydesk_path}})
+
+
+@pytest.fixture
+def fake_telegram():
+    return FakeTelegram()
+
+
+@pytest.fixture
+def bot_api():
+    """Локальний Bot API (див. benchmarks/fake_bot_api.py)"""
+    server = FakeBotAPI()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Паузи між повторами в telegram_api не чекаються, а записуються"""
+    import telegram_api
+
+    recorded = []
+    monkeypatch.setattr(telegram_api, "time", types.SimpleNamespace(
+        sleep=recorded.append, time=time.time, strftime=time.strftime, monotonic=time.monotonic))
+    return recorded
+
+
+@pytest.fixture
+def telegram(bot_api, sleeps):
+    """TelegramAPI на локальному Bot API без ліміту частоти"""
+    from rate_limiter import TokenBucket
+    from telegram_api import TelegramAPI
+
+    api = TelegramAPI(TOKEN, CHAT_ID, api_base_url=bot_api.base_url)
+    api.rate_limiter = TokenBucket(rate=1000, burst=1000)
+    yield api
+    if api.outbox is not None:
+        api.outbox.stop()
+    api.close()
@@ -0,0 +1,104 @@
+import os
+import subprocess
+
+import pytest
+
+import anydesk_manager
+from anydesk_manager import AnyDeskManager
+
+
+class Spawns:
+    """Замість subprocess: кожен --get-id записується і повертає next_id; інші запуски - помилка"""
+
+    def __init__(self):
+        self.calls = []
+        self.next_id = "111222333"
+
+    def run(self, args, **kwargs):
+        self.calls.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout=f"{self.next_id}\n", stderr="")
+
+    def popen(self, *args, **kwargs):
+        raise AssertionError(f"Неочікуваний запуск процесу: {args}")
+
+
+@pytest.fixture
+def spawns(monkeypatch):
+    spawns = Spawns()
+    monkeypatch.setattr(anydesk_manager.subprocess, "run", spawns.run)
+    monkeypatch.setattr(anydesk_manager.subprocess, "Popen", spawns.popen)
+    return spawns
+
+
+@pytest.fixture
+def anydesk(tmp_path):
+    path = tmp_path / "AnyDesk.exe"
+    path.write_bytes(b"v1" * 1000)
+    os.utime(path, (1_700_000_000, 1_700_000_000))
+    return path
+
+
+def make_manager(config):
+    return AnyDeskManager(config, telegram_api=None)
+
+
+def test_cold_start_spawns_once_then_caches(anydesk, spawns, anydesk_config):
+    config = anydesk_config(str(anydesk))
+
+    assert make_manager(config).get_connection_id() == "111222333"
+    assert len(spawns.calls) == 1
+    assert config.values[AnyDeskManager.CACHE_KEY]["id"] == "111222333"
+
+    # Наступний запуск програми: ті самі налаштування, новий менеджер
+    assert make_manager(config).get_connection_id() == "111222333"
+    assert len(spawns.calls) == 1
+
+
+def test_warm_cache_spawns_nothing(anydesk, spawns, anydesk_config):
+    config = anydesk_config(str(anydesk))
+    make_manager(config).get_connection_id()
+    spawns.calls.clear()
+
+    manager = make_manager(config)
+    assert manager.anydesk_path == str(anydesk)
+    assert manager.get_connection_id() == "111222333"
+    assert manager.wait_for_connection_id(timeout=1) == "111222333"
+    assert spawns.calls == []
+
+
+def test_mtime_change_invalidates_cached_id(anydesk, spawns, anydesk_config):
+    config = anydesk_config(str(anydesk))
+    make_manager(config).get_connection_id()
+
+    # AnyDesk оновився (той самий розмір, інший час зміни) - ID міг змінитись
+    os.utime(anydesk, (1_700_000_500, 1_700_000_500))
+    spawns.next_id = "444555666"
+
+    assert make_manager(config).get_connection_id() == "444555666"
+    assert len(spawns.calls) == 2
+    assert config.values[AnyDeskManager.CACHE_KEY]["mtime"] == 1_700_000_500
+
+
+def test_size_change_invalidates_cached_id(anydesk, spawns, anydesk_config):
+    config = anydesk_config(str(anydesk))
+    make_manager(config).get_connection_id()
+
+    # Перевстановлено: інший розмір, а час зміни збігається
+    anydesk.write_bytes(b"v2" * 1200)
+    os.utime(anydesk, (1_700_000_000, 1_700_000_000))
+    spawns.next_id = "777888999"
+
+    assert make_manager(config).get_connection_id() == "777888999"
+    assert len(spawns.calls) == 2
+    assert config.values[AnyDeskManager.CACHE_KEY]["size"] == 2400
+
+
+def test_cache_for_another_path_is_ignored(anydesk, tmp_path, spawns, anydesk_config):
+    config = anydesk_config(str(anydesk))
+    make_manager(config).get_connection_id()
+
+    manager = make_manager(config)
+    manager.anydesk_path = str(tmp_path / "AnyDesk2.exe")
+    (tmp_path / "AnyDesk2.exe").write_bytes(b"x")
+
+    assert manager._cached_id() is None
@@ -0,0 +1,128 @@
+"""
+Адмін-процес встановлення пароля без UAC: замість ShellExecuteExW запускається дочірній
+процес, що розбирає ті самі аргументи (--notify адреса токен) і повідомляє результат
+через completion_channel - або завершується без повідомлення.
+"""
+
+import os
+import sys
+import time
+import shlex
+import subprocess
+
+import pytest
+
+from anydesk_manager import AnyDeskManager
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Поведінка дитини: report:<ok>:<code>:<пауза перед звітом> або exit:<код виходу>:<пауза>
+CHILD = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from completion_channel import report_completion
+args = sys.argv[3:]
+address, token = args[args.index("--notify") + 1:args.index("--notify") + 3]
+action, *params = sys.argv[2].split(":")
+if action == "report":
+    ok, code, pause = params
+    time.sleep(float(pause))
+    report_completion(address, token, ok == "1", int(code), "" if ok == "1" else "Помилка AnyDesk")
+    sys.exit(int(code))
+code, pause = params
+time.sleep(float(pause))
+sys.exit(int(code))
+"""
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch, anydesk_config):
+    anydesk = tmp_path / "AnyDesk.exe"
+    anydesk.write_bytes(b"")
+    manager = AnyDeskManager(anydesk_config(str(anydesk)), telegram_api=None)
+    manager.PASSWORD_TIMEOUT = 30
+    manager.launched = []
+
+    def launch(behaviour):
+        def launch_elevated(executable, arguments):
+            process = subprocess.Popen([sys.executable, "-c", CHILD, SRC_DIR, behaviour, *shlex.split(arguments)])
+            manager.launched.append(process)
+            process.close = lambda: None
+            return process
+        monkeypatch.setattr(manager, "_launch_elevated", launch_elevated)
+
+    manager.launch = launch
+    yield manager
+    for process in manager.launched:
+        process.kill()
+        process.wait()
+
+
+def timed(manager):
+    started = time.monotonic()
+    result = manager._set_password()
+    return result, time.monotonic() - started
+
+
+def test_success_is_reported_without_waiting_for_timeout(manager):
+    manager.launch("report:1:0:0.3")
+
+    ok, seconds = timed(manager)
+
+    assert ok is True
+    assert seconds < 2
+
+
+def test_failure_code_is_reported(manager, caplog):
+    manager.launch("report:0:5:0.1")
+
+    ok, _ = timed(manager)
+
+    assert ok is False
+    assert "код 5" in caplog.text
+
+
+def test_child_that_exits_without_report_aborts_the_wait(manager, caplog):
+    manager.launch("exit:3:0.2")
+
+    ok, seconds = timed(manager)
+
+    assert ok is False
+    assert seconds < 2  # А не PASSWORD_TIMEOUT
+    assert "код виходу 3" in caplog.text
+
+
+def test_report_queued_when_wait_is_aborted_is_not_lost():
+    # Дитина написала і одразу завершилась між двома перевірками - звіт вже в черзі сокета
+    from completion_channel import CompletionListener, report_completion
+
+    with CompletionListener() as listener:
+        assert listener._read_pending() is None
+        assert report_completion(listener.address, listener.token, True, 0)
+
+        assert listener._read_pending() == {"ok": True, "code": 0, "message": ""}
+
+
+def test_launch_failure_does_not_wait(manager, monkeypatch):
+    monkeypatch.setattr(manager, "_launch_elevated", lambda executable, arguments: None)
+
+    ok, seconds = timed(manager)
+
+    assert ok is False
+    assert seconds < 1
+
+
+def test_notify_arguments_reach_the_child(manager, monkeypatch):
+    captured = {}
+
+    def launch_elevated(executable, arguments):
+        captured["args"] = shlex.split(arguments)
+        return None
+
+    monkeypatch.setattr(manager, "_launch_elevated", launch_elevated)
+    manager._set_password()
+
+    args = captured["args"]
+    assert args[args.index("--set-anydesk-password") + 1] == manager.anydesk_path
+    address, token = args[args.index("--notify") + 1:args.index("--notify") + 3]
+    assert address.startswith(("unix:", "tcp:")) and len(token) == 32
@@ -0,0 +1,77 @@
+"""
+ConfigManager у кількох процесах: кожен пише свої ключі серіями set()/commit(),
+фоновий потік тим часом перечитує файл. Жодна зміна не губиться, версія не йде назад.
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import threading
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="процеси запускаються через fork - лише Linux/macOS")
+
+WORKERS = 6
+WRITES = 40
+
+
+def worker(home, index, results):
+    """Один процес програми: set() з commit() через раз, паралельно - refresh() у потоці"""
+    os.environ["HOME"] = home
+    import logging
+    logging.disable(logging.CRITICAL)
+    from config_manager import ConfigManager
+
+    config = ConfigManager()
+    versions = []
+    stop = threading.Event()
+
+    def record():
+        # Версія змінюється під _lock - так послідовність записів відповідає порядку змін
+        with config._lock:
+            versions.append(config.version)
+
+    def watch():
+        while not stop.is_set():
+            config.refresh()
+            record()
+
+    thread = threading.Thread(target=watch)
+    thread.start()
+    for j in range(WRITES):
+        config.set(f"worker_{index}_{j}", j)
+        config.set(f"last_{index}", j)
+        if j % 2:
+            config.commit()
+        record()
+    config.commit()
+    stop.set()
+    thread.join()
+    record()
+    results.put((index, config.write_count, versions))
+
+
+def test_no_lost_updates_and_version_only_grows(tmp_path):
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(str(tmp_path), i, results)) for i in range(WORKERS)]
+    for process in processes:
+        process.start()
+    reports = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join(timeout=10)
+        assert process.exitcode == 0
+
+    data = json.loads((tmp_path / ".remotehand" / "config.json").read_text(encoding="utf-8"))
+    for i in range(WORKERS):
+        for j in range(WRITES):
+            assert data[f"worker_{i}_{j}"] == j
+        assert data[f"last_{i}"] == WRITES - 1
+
+    # Кожен запис під блокуванням піднімає версію рівно на 1
+    assert data["_version"] == sum(write_count for _, write_count, _ in reports)
+    for index, _, versions in reports:
+        assert versions == sorted(versions), f"версія процесу {index} пішла назад"
+        assert versions[-1] <= data["_version"]
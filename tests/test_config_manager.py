@@ -0,0 +1,66 @@
+import gc
+import json
+
+import pytest
+
+import config_manager
+from config_manager import ConfigManager
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = ConfigManager(debounce=0)
+    config.set("store", "Магазин 1")
+    config.set("location", "Каса 2")
+    return config
+
+
+def test_deleted_file_keeps_current_config(config):
+    changes = []
+    config.subscribe(changes.append)
+    config.config_file.unlink()
+
+    assert config.get("store") == "Магазин 1"
+    assert changes == []
+
+    # Наступний запис створює файл знову, з усіма ключами
+    config.set("user_name", "Іван")
+    data = json.loads(config.config_file.read_text(encoding="utf-8"))
+    assert data["store"] == "Магазин 1"
+    assert data["_version"] > 2
+
+
+def test_hand_edited_file_without_version_is_picked_up(config):
+    version = config.version
+    config.config_file.write_text(json.dumps({"store": "Магазин 7", "location": "Каса 2"}), encoding="utf-8")
+
+    assert config.get("store") == "Магазин 7"
+    assert config.version == version
+
+    # Запис після ручної зміни продовжує лічильник, а не починає з 1
+    config.set("location", "Каса 3")
+    data = json.loads(config.config_file.read_text(encoding="utf-8"))
+    assert data == {"store": "Магазин 7", "location": "Каса 3", "_version": version + 1}
+
+
+def test_instances_are_not_kept_alive_until_exit(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    before = len(config_manager._instances)
+    config = ConfigManager(debounce=0)
+    config.set("store", "Магазин 1")
+    assert len(config_manager._instances) == before + 1
+
+    del config
+    gc.collect()
+    assert len(config_manager._instances) == before
+
+
+def test_pending_changes_are_written_at_exit(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = ConfigManager(debounce=60)
+    config.set("store", "Магазин 1")
+
+    config_manager._commit_all()
+
+    assert json.loads(config.config_file.read_text(encoding="utf-8"))["store"] == "Магазин 1"
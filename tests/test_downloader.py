@@ -0,0 +1,148 @@
+"""
+Завантаження проти локального сервера з обмеженням швидкості і обривами
+(benchmarks/file_server.py): сегменти, докачування після перезапуску, SHA-256, прогрес,
+і download_anydesk з імітованим встановлювачем.
+"""
+
+import os
+import types
+import hashlib
+import time
+
+import pytest
+
+import downloader
+from downloader import Downloader
+from file_server import ThrottledFileServer
+
+MB = 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Паузи між спробами не чекаються - перевіряється передача, а не backoff"""
+    monkeypatch.setattr(downloader, "time", types.SimpleNamespace(sleep=lambda seconds: None, monotonic=time.monotonic))
+
+
+@pytest.fixture
+def payload():
+    return os.urandom(3 * MB)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(payload, **kwargs):
+        server = ThrottledFileServer(payload, rate=16 * MB, **kwargs)
+        servers.append(server)
+        return server, server.start()
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.parametrize("segments", [1, 4])
+def test_download_survives_dropped_connections(serve, payload, tmp_path, segments):
+    server, url = serve(payload, drop_probability=0.5, seed=3)
+    dest = tmp_path / "AnyDesk.exe"
+
+    assert Downloader(segments=segments, attempts=50).download(url, dest, sha256(payload))
+
+    assert dest.read_bytes() == payload
+    assert not (tmp_path / "AnyDesk.exe.part").exists()
+    assert not (tmp_path / "AnyDesk.exe.part.state").exists()
+    # Докачування: після обривів передано не набагато більше за сам файл
+    assert server.bytes_sent < 1.5 * len(payload)
+
+
+def test_server_without_range_restarts_from_zero(serve, payload, tmp_path):
+    server, url = serve(payload, drop_probability=0.3, ranges=False, seed=5)
+    dest = tmp_path / "AnyDesk.exe"
+
+    assert Downloader(segments=4, attempts=50).download(url, dest, sha256(payload))
+    assert dest.read_bytes() == payload
+
+
+def test_interrupted_download_resumes_in_a_new_process(serve, payload, tmp_path):
+    dest = tmp_path / "AnyDesk.exe"
+    server, url = serve(payload, drop_probability=1.0, seed=7)
+
+    # Перший "запуск програми": кожна відповідь обривається, спроби вичерпано
+    assert not Downloader(segments=4, attempts=2).download(url, dest)
+    assert (tmp_path / "AnyDesk.exe.part.state").exists()
+    sent_before = server.bytes_sent
+
+    # Другий запуск: новий Downloader продовжує з .part.state
+    server.drop_probability = 0.0
+    assert Downloader(segments=4).download(url, dest, sha256(payload))
+    assert dest.read_bytes() == payload
+    # Докачано лише решту: разом передано менше двох розмірів файлу
+    assert sent_before > 0
+    assert server.bytes_sent - sent_before < len(payload)
+
+
+def test_checksum_mismatch_keeps_nothing(serve, payload, tmp_path):
+    _, url = serve(payload)
+    dest = tmp_path / "AnyDesk.exe"
+
+    assert not Downloader(segments=4).download(url, dest, "0" * 64)
+    assert not dest.exists()
+    assert not (tmp_path / "AnyDesk.exe.part").exists()
+
+
+def test_progress_is_monotonic_and_complete(serve, payload, tmp_path):
+    _, url = serve(payload, drop_probability=0.3, seed=11)
+    progress = []
+
+    assert Downloader(segments=4, attempts=50).download(url, tmp_path / "AnyDesk.exe",
+                                                        on_progress=lambda done, total: progress.append((done, total)))
+
+    done = [d for d, _ in progress]
+    assert done == sorted(done)
+    assert progress[-1] == (len(payload), len(payload))
+
+
+def test_download_anydesk_installs_and_detects_completion(serve, payload, tmp_path, monkeypatch, make_config):
+    import anydesk_manager
+    from anydesk_manager import AnyDeskManager
+
+    _, url = serve(payload, drop_probability=0.3, seed=13)
+    downloads = tmp_path / "Downloads"
+    downloads.mkdir()
+    installed = tmp_path / "Program Files" / "AnyDesk" / "AnyDesk.exe"
+
+    class Installer:
+        """Встановлювач: через 0.3 сек копіює себе в Program Files і завершується з кодом 0"""
+
+        def __init__(self, args):
+            self.path = args[0]
+            self.finish_at = time.monotonic() + 0.3
+
+        def poll(self):
+            if time.monotonic() < self.finish_at:
+                return None
+            installed.parent.mkdir(parents=True, exist_ok=True)
+            installed.write_bytes(open(self.path, "rb").read())
+            return 0
+
+    monkeypatch.setattr(anydesk_manager.os.path, "expanduser",
+                        lambda path: str(downloads) if path == "~\\Downloads" else path)
+    monkeypatch.setattr(anydesk_manager.subprocess, "Popen", Installer)
+
+    manager = AnyDeskManager(make_config(anydesk_sha256=sha256(payload)), telegram_api=None)
+    manager.DOWNLOAD_URL = url
+    monkeypatch.setattr(manager, "find_anydesk", lambda: str(installed) if installed.exists() else None)
+
+    started = time.monotonic()
+    assert manager.download_anydesk()
+
+    assert manager.anydesk_path == str(installed)
+    assert installed.read_bytes() == payload
+    # Встановлення помічено одразу після завершення встановлювача, а не через фіксовані паузи
+    assert time.monotonic() - started < 5
@@ -0,0 +1,103 @@
+import random
+import time
+
+from link_stats import LinkStats, LatencyHistogram
+from link_monitor import LinkMonitor
+
+
+def feed(stats, values, start, step=5.0):
+    """Додати заміри з інтервалом step секунд. Повертає, які з них - стрибки."""
+    return [stats.add(rtt, start + i * step) for i, rtt in enumerate(values)]
+
+
+def test_sustained_level_shift_stops_being_a_spike():
+    rng = random.Random(1)
+    stats = LinkStats()
+    start = time.time()
+    feed(stats, [20 + rng.uniform(-1, 1) for _ in range(100)], start)
+
+    # Маршрут змінився: затримка стабільно 150 мс
+    spikes = feed(stats, [150 + rng.uniform(-1, 1) for _ in range(200)], start + 500)
+
+    assert sum(spikes) == LinkStats.SPIKE_RESEED_AFTER - 1
+    assert not any(spikes[LinkStats.SPIKE_RESEED_AFTER:])
+    assert 145 < stats.ewma < 155
+
+
+def test_isolated_spikes_do_not_move_baseline():
+    rng = random.Random(2)
+    stats = LinkStats()
+    start = time.time()
+    values = [20 + rng.uniform(-1, 1) for _ in range(300)]
+    for i in range(50, 300, 25):
+        values[i] = 400.0
+
+    spikes = feed(stats, values, start)
+
+    assert sum(spikes) == 10
+    assert 19 < stats.ewma < 21
+
+
+def test_short_burst_below_reseed_threshold_keeps_baseline():
+    stats = LinkStats()
+    start = time.time()
+    feed(stats, [20.0] * 50, start)
+    spikes = feed(stats, [300.0] * (LinkStats.SPIKE_RESEED_AFTER - 1) + [20.0] * 10, start + 250)
+
+    assert sum(spikes) == LinkStats.SPIKE_RESEED_AFTER - 1
+    assert stats.ewma == 20.0
+    # Після серії знову окремий стрибок - знову стрибок
+    assert stats.add(300.0, start + 400) is True
+
+
+def test_snapshot_loss_and_spikes_use_the_percentile_window():
+    stats = LinkStats(window_seconds=60)
+    now = time.time()
+    # Давно: суцільні втрати і стрибки - поза вікном (два повних вікна тому)
+    feed(stats, [None] * 20, now - 600, step=1)
+    feed(stats, [20.0] * 20, now - 300, step=1)
+    feed(stats, [500.0, 20.0] * 3, now - 270, step=1)
+    # Останні хвилини: без втрат
+    feed(stats, [20.0] * 30, now - 40, step=1)
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["loss"] == 0.0
+    assert snapshot["spikes"] == 0
+    assert snapshot["p95"] < 25
+    assert snapshot["window_minutes"] <= 2
+
+
+def test_monitor_latency_matches_history_window():
+    monitor = LinkMonitor({"1С": ("10.0.0.1", 4420, "tcp")}, interval=5)
+    now = time.time()
+    # Година тому - погано (високі RTT і втрати), останні 10 хвилин - добре
+    for i in range(300):
+        monitor.record("1С", None if i % 3 == 0 else 900.0, now - 3600 + i * 5)
+    for i in range(100):
+        monitor.record("1С", 20.0, now - 500 + i * 5)
+
+    history = monitor.history(10)["1С"]
+    latency = monitor.latency(10)["1С"]
+
+    assert latency["window_minutes"] == 10
+    assert latency["loss"] == history["loss"] == 0.0
+    assert latency["p95"] < 25
+    assert latency["spikes"] == 0
+
+    # Довше вікно - з тих самих гістограм, разом з поганою годиною
+    hour = monitor.latency(60)["1С"]
+    assert hour["window_minutes"] == 60
+    assert hour["p95"] > 800
+    assert hour["loss"] > 0
+
+
+def test_histogram_percentiles_are_within_precision():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.add(float(value))
+
+    pcts = histogram.percentiles((50, 99))
+
+    assert abs(pcts[50] - 500) / 500 <= LatencyHistogram.PRECISION
+    assert abs(pcts[99] - 990) / 990 <= LatencyHistogram.PRECISION
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from network_test import NetworkTest
+
+
+def ok_stats(loss=0.0):
+    return {"sent": 20, "received": 20, "loss": loss, "min": 10.0, "avg": 12.0, "max": 15.0,
+            "jitter": 1.0, "samples": [12.0] * 20, "method": "icmp"}
+
+
+@pytest.fixture
+def network_test(make_config, fake_telegram):
+    hosts = {"1С Сервер": "10.0.0.1", "Google DNS": "8.8.8.8", "Роутер": "192.168.0.1"}
+    return NetworkTest(make_config(network_hosts=hosts), fake_telegram)
+
+
+def run_with(network_test, monkeypatch, results):
+    hosts = network_test.get_hosts()
+    by_address = {address: results[name] for name, address in hosts.items()}
+    monkeypatch.setattr(network_test, "run_ping_test", lambda address, count=None: by_address[address])
+    return network_test.run_full_test()
+
+
+def test_all_hosts_failed_is_not_reported_as_healthy(network_test, monkeypatch):
+    result = run_with(network_test, monkeypatch, {"1С Сервер": None, "Google DNS": None, "Роутер": None})
+
+    assert result["status"] == "❌ Тест не вдався"
+    assert result["color"] == "red"
+    assert network_test.telegram.reports == [result["details"]]
+
+
+def test_failed_host_does_not_dilute_loss(network_test, monkeypatch):
+    # 20% втрат на хостах, що відповіли; хост з помилкою не рахується як 0% (інакше вийшло б 13%)
+    result = run_with(network_test, monkeypatch,
+                      {"1С Сервер": ok_stats(20.0), "Google DNS": None, "Роутер": ok_stats(20.0)})
+
+    assert result["status"] == "❌ Серйозні проблеми"
+
+
+def test_partial_failure_without_loss_is_a_warning(network_test, monkeypatch):
+    result = run_with(network_test, monkeypatch, {"1С Сервер": ok_stats(), "Google DNS": None, "Роутер": ok_stats()})
+
+    assert result["color"] == "orange"
+    assert "❌ Google DNS (8.8.8.8): Помилка тестування" in result["details"]
+
+
+def test_all_hosts_healthy(network_test, monkeypatch):
+    result = run_with(network_test, monkeypatch, {"1С Сервер": ok_stats(), "Google DNS": ok_stats(), "Роутер": ok_stats()})
+
+    assert result["status"] == "✅ Мережа в нормі"
+
+
+def test_hosts_run_in_parallel_and_stream_in_completion_order(network_test, monkeypatch):
+    delays = {"10.0.0.1": 0.6, "8.8.8.8": 0.2, "192.168.0.1": 0.4}
+
+    def slow_ping(address, count=None):
+        time.sleep(delays[address])
+        return ok_stats()
+
+    monkeypatch.setattr(network_test, "run_ping_test", slow_ping)
+    events = []
+    started = time.monotonic()
+
+    result = network_test.run_full_test(
+        on_host_result=lambda name, line: events.append((name, time.monotonic() - started)))
+    elapsed = time.monotonic() - started
+
+    # Як найповільніший хост (0.6 сек), а не сума (1.2 сек)
+    assert 0.6 <= elapsed < 0.9
+    # Кожен результат - щойно готовий, до загального звіту
+    assert [name for name, _ in events] == ["Google DNS", "Роутер", "1С Сервер"]
+    assert events[0][1] < 0.4
+    assert events[1][1] < 0.6
+    # Звіт - у порядку налаштувань
+    assert result["details"].index("1С Сервер") < result["details"].index("Google DNS") < \
+        result["details"].index("Роутер")
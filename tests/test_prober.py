@@ -0,0 +1,76 @@
+import socket
+
+import pytest
+
+import prober
+from prober import Prober
+
+
+@pytest.fixture
+def no_dns(monkeypatch):
+    def fail(host):
+        raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+    monkeypatch.setattr(prober.socket, "gethostbyname", fail)
+
+
+@pytest.fixture
+def listener():
+    """Локальний TCP порт, що приймає з'єднання"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(16)
+        yield sock.getsockname()[1]
+
+
+def test_unresolved_host_is_total_loss_not_an_error(no_dns):
+    stats = Prober().probe("server.invalid", count=5, interval=10, port=443, method="tcp")
+
+    assert stats["unresolved"] is True
+    assert stats["loss"] == 100.0
+    assert stats["sent"] == 5 and stats["received"] == 0
+
+
+def test_icmp_echo_reports_unresolved(no_dns):
+    probe = Prober()
+    probe._icmp_mode = "raw"
+
+    assert probe.icmp_echo("server.invalid") == ("unresolved", None, None)
+    assert probe.icmp_ping("server.invalid") is None
+
+
+def test_host_is_resolved_once_per_series(monkeypatch, listener):
+    lookups = []
+    resolve = socket.gethostbyname
+    monkeypatch.setattr(prober.socket, "gethostbyname", lambda host: lookups.append(host) or resolve(host))
+
+    stats = Prober().probe("localhost", count=4, interval=0, port=listener, method="tcp")
+
+    assert lookups == ["localhost"]
+    assert stats["received"] == 4 and stats["unresolved"] is False
+
+
+def test_network_test_reports_unresolved_host_as_loss(no_dns, make_config, fake_telegram):
+    from network_test import NetworkTest
+
+    network_test = NetworkTest(make_config(probe_count=3, probe_interval=0), fake_telegram)
+    stats = network_test.run_ping_test("server.invalid:443")
+
+    line, loss = network_test._format_result("1С Сервер", "server.invalid", stats)
+    assert loss == 100.0
+    assert "адресу не знайдено" in line
+
+
+@pytest.mark.parametrize("address, port", [
+    ("23.88.7.196", 4420),       # Сервер 1С - порт RDP
+    ("8.8.8.8", 443),            # Інші хости - не порт RDP
+    ("10.0.0.5:3389", 3389),     # Порт з адреси
+])
+def test_test_connection_takes_port_from_target(monkeypatch, address, port):
+    from utils import test_connection
+
+    calls = []
+    monkeypatch.setattr(Prober, "probe_once", lambda self, host, port=None, *args, **kwargs: calls.append((host, port)) or 1.0)
+
+    assert test_connection(address) is True
+    assert calls == [(address.partition(":")[0], port)]
@@ -0,0 +1,108 @@
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+import process_watch
+from process_watch import ProcessWatch
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="копія /bin/sleep під іншою назвою - лише Linux/macOS")
+
+
+@pytest.fixture
+def fake_process(tmp_path):
+    """Запускає копію sleep під заданою назвою (так її бачить psutil)"""
+    sleep = shutil.which("sleep")
+    started = []
+
+    def start(name):
+        binary = tmp_path / name
+        shutil.copy(sleep, binary)
+        process = subprocess.Popen([str(binary), "30"])
+        started.append(process)
+        return process
+
+    yield start
+    for process in started:
+        process.kill()
+        process.wait()
+
+
+@pytest.fixture
+def watch(monkeypatch):
+    watch = ProcessWatch(ttl=60)
+    monkeypatch.setattr(process_watch, "_default_watch", watch)
+    return watch
+
+
+def test_close_all_rdp_sessions_kills_mstsc_started_within_ttl(watch, fake_process):
+    from utils import close_all_rdp_sessions
+
+    watch.refresh()  # Індекс свіжий: наступний refresh() без force нічого не оновив би
+    mstsc = fake_process("mstsc.exe")
+
+    close_all_rdp_sessions()
+
+    assert mstsc.wait(timeout=5) != 0
+
+
+def test_index_is_cached_within_ttl(watch, fake_process):
+    watch.refresh()
+    process = fake_process("rh_watch_test")
+
+    assert watch.find("rh_watch_test") == []
+    watch.refresh(force=True)
+    assert watch.find("rh_watch_test") == [process.pid]
+
+
+def test_reused_pid_is_not_reported(watch, fake_process):
+    process = fake_process("rh_watch_test")
+    watch.refresh(force=True)
+    process.kill()
+    process.wait()
+
+    # Індекс ще пам'ятає PID, але перевірка назви відсіює завершений процес
+    assert watch.find("rh_watch_test") == []
+
+
+def test_subscribers_get_started_and_exited_events(watch, fake_process):
+    events = []
+    watch.subscribe("rh_watch_test", lambda event, name, pid: events.append((event, pid)))
+    watch.refresh(force=True)
+
+    process = fake_process("rh_watch_test")
+    watch.refresh(force=True)
+    process.kill()
+    process.wait()
+    watch.refresh(force=True)
+
+    assert events == [("started", process.pid), ("exited", process.pid)]
+
+
+def test_reused_pid_is_reported_as_exit_and_start(watch, fake_process):
+    events = []
+    watch.subscribe("rh_watch_test", lambda event, name, pid: events.append((event, name, pid)))
+    process = fake_process("rh_watch_test")
+    watch.refresh(force=True)
+
+    # Як після перевикористання PID: в індексі - інший (старіший) процес з тим самим номером
+    created, _ = watch._processes[process.pid]
+    watch._processes[process.pid] = (created - 100, "rh_watch_test_old")
+    watch.refresh(force=True)
+
+    assert events == [("exited", "rh_watch_test_old", process.pid), ("started", "rh_watch_test", process.pid)]
+    assert watch._processes[process.pid] == (created, "rh_watch_test")
+
+
+def test_find_reports_reused_pid_without_subscriber_refresh(watch, fake_process):
+    process = fake_process("rh_watch_test")
+    watch.refresh(force=True)
+    created, _ = watch._processes[process.pid]
+    watch._processes[process.pid] = (created - 100, "rh_watch_test")
+
+    events = []
+    watch.subscribe("rh_watch_test", lambda event, name, pid: events.append((event, pid)))
+
+    assert watch.find("rh_watch_test") == [process.pid]
+    assert events == [("exited", process.pid), ("started", process.pid)]
@@ -0,0 +1,183 @@
+"""
+Трасування без мережі і без прав адміністратора:
+- розбір відповідей raw сокета (Time Exceeded з вкладеним пакетом, Echo Reply, чужі пакети);
+- RouteTracer і звіт run_route_test на імітованому маршруті.
+"""
+
+import socket
+import struct
+import threading
+from collections import defaultdict
+
+import pytest
+
+import prober
+from prober import Prober, ICMP_ECHO_REPLY, ICMP_TIME_EXCEEDED
+from route_tracer import RouteTracer
+
+TARGET = "203.0.113.10"
+
+
+def ip_header(header_words=5):
+    """IPv4 заголовок (для розбору важлива лише довжина, IHL)"""
+    return bytes([0x40 | header_words]) + bytes(header_words * 4 - 1)
+
+
+def time_exceeded(sent_packet, header_words=5):
+    """Відповідь роутера: IP + ICMP Time Exceeded + IP і перші 8 байт нашого пакета"""
+    return ip_header(header_words) + struct.pack("!BBHI", ICMP_TIME_EXCEEDED, 0, 0, 0) + ip_header() + sent_packet[:8]
+
+
+def echo_reply(sent_packet, seq_delta=0):
+    _, _, _, ident, seq = struct.unpack("!BBHHH", sent_packet[:8])
+    return ip_header() + struct.pack("!BBHHH", ICMP_ECHO_REPLY, 0, 0, ident, (seq + seq_delta) & 0xFFFF) + sent_packet[8:]
+
+
+class FakeRawSocket:
+    """Замість socket.socket: відповіді будує responder(відправлений пакет, ttl) -> [(дані, адреса)]"""
+
+    responder = None
+
+    def __init__(self, family, sock_type, proto):
+        self.ttl = None
+        self.replies = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def close(self):
+        pass
+
+    def setsockopt(self, level, option, value):
+        if option == socket.IP_TTL:
+            self.ttl = value
+
+    def settimeout(self, timeout):
+        pass
+
+    def sendto(self, packet, address):
+        self.replies = list(type(self).responder(packet, self.ttl))
+
+    def recvfrom(self, size):
+        if not self.replies:
+            raise socket.timeout()
+        data, address = self.replies.pop(0)
+        return data, (address, 0)
+
+
+@pytest.fixture
+def raw_socket(monkeypatch):
+    monkeypatch.setattr(prober.socket, "socket", FakeRawSocket)
+    return FakeRawSocket
+
+
+def echo(ttl=None):
+    probe = Prober()
+    probe._icmp_mode = "raw"
+    return probe.icmp_echo(TARGET, timeout=0.5, ttl=ttl)
+
+
+def test_time_exceeded_is_matched_to_our_probe(raw_socket):
+    raw_socket.responder = lambda packet, ttl: [(time_exceeded(packet), "10.0.0.1")]
+
+    result, address, rtt = echo(ttl=2)
+
+    assert (result, address) == ("ttl_expired", "10.0.0.1")
+    assert rtt >= 0
+
+
+def test_ip_options_in_outer_header_are_skipped(raw_socket):
+    raw_socket.responder = lambda packet, ttl: [(time_exceeded(packet, header_words=6), "10.0.0.1")]
+
+    assert echo(ttl=2)[:2] == ("ttl_expired", "10.0.0.1")
+
+
+def test_foreign_packets_are_ignored(raw_socket):
+    other = struct.pack("!BBHHH", 8, 0, 0, 0xBEEF, 1) + b"x" * 8
+
+    def responder(packet, ttl):
+        return [
+            (ip_header() + b"\x00\x00", "10.9.9.9"),            # Обрізаний пакет
+            (time_exceeded(other), "10.9.9.9"),                 # Чужий traceroute
+            (echo_reply(packet, seq_delta=1), "10.9.9.9"),      # Відповідь на інший запит
+            (echo_reply(packet), TARGET),
+        ]
+
+    raw_socket.responder = responder
+
+    assert echo()[:2] == ("reply", TARGET)
+
+
+def test_no_reply_is_a_loss(raw_socket):
+    raw_socket.responder = lambda packet, ttl: []
+
+    assert echo(ttl=3) == (None, None, None)
+
+
+class SimulatedPath:
+    """
+    Маршрут з втратами: hops - [(адреса, втрати з 10)], останній - ціль
+    (на TTL більше за довжину маршруту відповідає теж ціль).
+    Втрати детерміновані: з кожних 10 замірів TTL втрачаються останні.
+    """
+
+    def __init__(self, hops, reachable=True):
+        self.hops = hops
+        self.reachable = reachable
+        self._calls = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def __call__(self, host, ttl, timeout=None):
+        index = min(ttl, len(self.hops)) - 1
+        address, loss_tenths = self.hops[index]
+        with self._lock:
+            call = self._calls[ttl]
+            self._calls[ttl] += 1
+        if call % 10 >= 10 - loss_tenths:
+            return None, None, None
+        if index == len(self.hops) - 1:
+            return ("reply", address, 20.0) if self.reachable else (None, None, None)
+        return "ttl_expired", address, 5.0 + index
+
+
+# Хоп 2 обмежує ICMP (втрати лише на ньому), з хопа 4 втрати тягнуться до цілі
+PATH = [("192.168.0.1", 0), ("10.0.0.1", 5), ("100.64.0.1", 0), ("100.64.0.2", 3), (TARGET, 3)]
+
+
+def test_tracer_builds_hops_up_to_target(monkeypatch):
+    monkeypatch.setattr(RouteTracer, "ROUND_INTERVAL", 0)
+    path = SimulatedPath(PATH)
+
+    result = RouteTracer(max_hops=10, rounds=10, hop_probe=path).trace(TARGET)
+
+    assert result["reached"] is True
+    assert [hop["address"] for hop in result["hops"]] == [address for address, _ in PATH]
+    assert [hop["loss"] for hop in result["hops"]] == [0.0, 50.0, 0.0, 30.0, 30.0]
+
+
+def test_unreachable_target_trims_silent_tail(monkeypatch):
+    monkeypatch.setattr(RouteTracer, "ROUND_INTERVAL", 0)
+    silent = SimulatedPath(PATH[:2] + [(None, 10)], reachable=False)
+
+    result = RouteTracer(max_hops=8, rounds=3, hop_probe=silent).trace(TARGET)
+
+    assert result["reached"] is False
+    assert [hop["address"] for hop in result["hops"]] == ["192.168.0.1", "10.0.0.1", None]
+
+
+def test_route_report_points_at_first_hop_with_persistent_loss(monkeypatch, make_config, fake_telegram):
+    from network_test import NetworkTest
+
+    monkeypatch.setattr(RouteTracer, "ROUND_INTERVAL", 0)
+    simulated = SimulatedPath(PATH)
+    monkeypatch.setattr(Prober, "icmp_echo", lambda self, host, timeout=None, ttl=None: simulated(host, ttl, timeout))
+
+    result = NetworkTest(make_config(route_rounds=10, route_max_hops=10), fake_telegram).run_route_test(TARGET)
+
+    # Втрати лише на хопі 2 (обмеження ICMP) - не причина; з хопа 4 вони тягнуться до цілі
+    assert "Втрати починаються з хопа 4 (100.64.0.2)" in result["details"]
+    assert result["color"] == "red"
+    assert fake_telegram.reports == [result["details"]]
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+import requests
+
+from telegram_api import TelegramRejectedError
+
+OK = (200, {"ok": True, "result": {"message_id": 1}})
+
+
+def test_retry_after_429_pauses_then_retries(telegram, bot_api, sleeps):
+    bot_api.script((429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 0.3}}))
+
+    started = time.monotonic()
+    telegram.deliver_message("звіт")
+
+    assert time.monotonic() - started >= 0.3
+    assert bot_api.requests == 2
+    assert [m["params"]["text"] for m in bot_api.messages] == ["звіт"]
+    assert telegram.rate_limiter.throttled_count == 1
+    assert sleeps == []  # Пауза - через rate_limiter, а не backoff
+
+
+def test_retry_after_header_is_used_without_json_body(telegram, bot_api):
+    bot_api.script((429, {}, {"Retry-After": "0.2"}))
+
+    started = time.monotonic()
+    telegram.deliver_message("звіт")
+
+    assert time.monotonic() - started >= 0.2
+    assert len(bot_api.messages) == 1
+
+
+def test_retry_after_too_long_fails_without_waiting(telegram, bot_api):
+    telegram.MAX_RETRY_AFTER = 1
+    bot_api.script((429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 3600}}))
+
+    with pytest.raises(requests.HTTPError):
+        telegram.deliver_message("звіт")
+    assert bot_api.requests == 1
+
+
+def test_server_error_backs_off_exponentially(telegram, bot_api, sleeps):
+    bot_api.script((502, {"ok": False}), (503, {"ok": False}), OK)
+
+    telegram.deliver_message("звіт")
+
+    assert sleeps == [0.5, 1.0]
+    assert bot_api.requests == 3
+
+
+def test_server_error_gives_up_after_max_retries(telegram, bot_api, sleeps):
+    bot_api.script(*[(500, {"ok": False})] * (telegram.MAX_RETRIES + 1))
+
+    with pytest.raises(requests.HTTPError):
+        telegram.deliver_message("звіт")
+    assert bot_api.requests == telegram.MAX_RETRIES + 1
+    assert sleeps == [0.5, 1.0, 2.0]
+
+
+@pytest.mark.parametrize("status", [400, 403, 404])
+def test_client_error_is_not_retried(telegram, bot_api, sleeps, status):
+    bot_api.script((status, {"ok": False, "error_code": status, "description": "Bad Request: can't parse entities"}))
+
+    with pytest.raises(TelegramRejectedError, match=str(status)):
+        telegram.deliver_message("<b>зламаний HTML")
+    assert bot_api.requests == 1
+    assert sleeps == []
+
+
+def test_network_error_is_retried_then_raised(telegram, bot_api, sleeps):
+    bot_api.offline = True
+
+    with pytest.raises(requests.ConnectionError):
+        telegram.deliver_message("звіт")
+    assert sleeps == [0.5, 1.0, 2.0]
+
+
+def test_session_is_reused_between_messages(telegram, bot_api):
+    for i in range(5):
+        telegram.deliver_message(f"звіт {i}")
+
+    assert bot_api.connections == 1
+    assert len(bot_api.messages) == 5
+
+
+def test_send_message_reports_failure_instead_of_raising(telegram, bot_api):
+    bot_api.script((400, {"ok": False}))
+
+    assert telegram.send_message("звіт") is False
+    assert telegram.send_message("звіт") is True
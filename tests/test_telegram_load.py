@@ -0,0 +1,68 @@
+"""
+Навантаження як при загальній аварії: всі ПК магазинів одночасно відправляють звіти
+в одного бота. Кожен клієнт - окремий "процес" (свій TelegramAPI, токен-бакет і черга),
+сервер пропускає rate_limit повідомлень за секунду, решті - 429 з retry_after.
+"""
+
+import threading
+
+import pytest
+
+from fake_bot_api import FakeBotAPI
+from conftest import TOKEN, CHAT_ID
+
+CLIENTS = 12
+REPORTS_PER_CLIENT = 4
+
+
+class FleetClient:
+    def __init__(self, base_url, db_path):
+        from rate_limiter import TokenBucket
+        from telegram_api import TelegramAPI
+
+        self.api = TelegramAPI(TOKEN, CHAT_ID, api_base_url=base_url)
+        # Бюджет процесу, прискорений для тесту (у програмі - 20 повідомлень на хвилину)
+        self.api.rate_limiter = TokenBucket(rate=2, burst=2)
+        self.api.enable_outbox(db_path)
+
+
+@pytest.fixture
+def limited_bot_api():
+    server = FakeBotAPI(rate_limit=4, retry_after=1, response_delay=0.01)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_fleet_burst_delivers_every_report(limited_bot_api, tmp_path):
+    clients = [FleetClient(limited_bot_api.base_url, tmp_path / f"pc{i}.sqlite") for i in range(CLIENTS)]
+    reports = [f"ПК {c} звіт {r}" for c in range(CLIENTS) for r in range(REPORTS_PER_CLIENT)]
+
+    # Усі ПК натискають "Тест з'єднання" одночасно
+    barrier = threading.Barrier(CLIENTS)
+
+    def press(index, client):
+        barrier.wait()
+        for r in range(REPORTS_PER_CLIENT):
+            client.api.queue_message(f"ПК {index} звіт {r}")
+
+    threads = [threading.Thread(target=press, args=(i, c)) for i, c in enumerate(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        flushed = [client.api.flush_outbox(timeout=30) for client in clients]
+    finally:
+        for client in clients:
+            client.api.close()
+
+    separator = clients[0].api.outbox.BATCH_SEPARATOR
+    delivered = [text for m in limited_bot_api.messages for text in m["params"]["text"].split(separator)]
+    assert all(flushed)
+    assert sorted(delivered) == sorted(reports)
+    # Звіти, що накопичились під час паузи, об'єднані - повідомлень менше, ніж звітів
+    assert len(limited_bot_api.messages) < len(reports)
+    # 429 трапляються, але кожен зупиняє клієнта на retry_after, а не викликає шквал повторів
+    assert 0 < limited_bot_api.rate_limited <= 2 * len(limited_bot_api.messages)
@@ -0,0 +1,173 @@
+import pytest
+
+
+@pytest.fixture
+def outbox(telegram, tmp_path):
+    return telegram.enable_outbox(tmp_path / "outbox.sqlite")
+
+
+def test_messages_survive_offline_and_are_sent_after_reconnect(outbox, telegram, bot_api):
+    bot_api.offline = True
+    telegram.queue_message("звіт 1")
+    telegram.queue_message("звіт 2")
+
+    assert outbox.flush(timeout=1) is False
+    assert outbox.depth() == 2
+    assert bot_api.messages == []
+
+    bot_api.offline = False
+    assert outbox.flush(timeout=5) is True
+    assert outbox.depth() == 0
+    assert outbox.sent_count == 2
+    # Після паузи накопичені звіти йдуть одним повідомленням
+    assert len(bot_api.messages) == 1
+    assert bot_api.messages[0]["params"]["text"] == "звіт 1" + outbox.BATCH_SEPARATOR + "звіт 2"
+
+
+def test_new_messages_do_not_cut_backoff_short(outbox, telegram, bot_api):
+    import time
+
+    outbox.MIN_BACKOFF = 30
+    bot_api.offline = True
+    telegram.queue_message("звіт 1")
+    deadline = time.monotonic() + 5
+    while outbox.failed_attempts == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert outbox.failed_attempts == 1
+
+    # Під час паузи нові звіти лише стають у чергу, Telegram не смикається
+    for i in range(10):
+        telegram.queue_message(f"звіт {i + 2}")
+        time.sleep(0.02)
+    time.sleep(0.2)
+    assert outbox.failed_attempts == 1
+    assert outbox.depth() == 11
+
+    # flush() перериває паузу одразу
+    bot_api.offline = False
+    assert outbox.flush(timeout=3) is True
+    assert len(bot_api.messages) == 2  # 11 звітів - дві пачки по BATCH_SIZE
+
+
+def test_queue_survives_restart(telegram, bot_api, tmp_path):
+    from telegram_outbox import TelegramOutbox
+
+    bot_api.offline = True
+    first = TelegramOutbox(telegram, tmp_path / "outbox.sqlite")
+    first.enqueue("звіт до перезапуску")
+    first.stop()
+
+    bot_api.offline = False
+    second = TelegramOutbox(telegram, tmp_path / "outbox.sqlite")
+    second.start()
+    try:
+        assert second.flush(timeout=5) is True
+    finally:
+        second.stop()
+    assert [m["params"]["text"] for m in bot_api.messages] == ["звіт до перезапуску"]
+
+
+def test_rejected_batch_is_resent_one_by_one(outbox, telegram, bot_api):
+    outbox.stop()
+    outbox.enqueue("добрий")
+    outbox.enqueue("<b>зламаний")
+    # Об'єднане повідомлення відхилено, потім окремо: перше пройде, друге знову відхилено
+    bot_api.script((400, {"ok": False, "description": "can't parse entities"}),
+                   (200, {"ok": True, "result": {}}),
+                   (400, {"ok": False, "description": "can't parse entities"}))
+
+    outbox.start()
+    assert outbox.flush(timeout=5) is True
+    assert outbox.depth() == 0
+    assert bot_api.requests == 3
+
+
+def test_long_messages_are_not_batched_over_telegram_limit(outbox):
+    rows = [(1, "a" * 3000, "HTML"), (2, "b" * 3000, "HTML"), (3, "c", "HTML"), (4, "d", None)]
+
+    groups = outbox._group_batch(rows)
+
+    assert [ids for ids, _, _ in groups] == [[1], [2, 3], [4]]
+    assert all(len(text) <= outbox.MAX_MESSAGE_LENGTH for _, text, _ in groups)
+
+
+def delivered_texts(bot_api, separator):
+    return [text for m in bot_api.messages for text in m["params"]["text"].split(separator)]
+
+
+def test_two_instances_on_one_queue_send_each_message_once(telegram, bot_api, tmp_path):
+    from telegram_outbox import TelegramOutbox
+
+    bot_api.response_delay = 0.05  # Обидві копії відправляють одночасно
+    db_path = tmp_path / "outbox.sqlite"
+    first = TelegramOutbox(telegram, db_path)
+    second = TelegramOutbox(telegram, db_path)
+    reports = [f"звіт {i}" for i in range(60)]
+    for i, text in enumerate(reports):
+        (first if i % 2 else second).enqueue(text)
+
+    first.start()
+    second.start()
+    try:
+        assert first.flush(timeout=10) and second.flush(timeout=10)
+    finally:
+        first.stop()
+        second.stop()
+
+    assert sorted(delivered_texts(bot_api, first.BATCH_SEPARATOR)) == sorted(reports)
+    assert first.sent_count > 0 and second.sent_count > 0
+
+
+def test_stale_claim_is_taken_over(telegram, bot_api, tmp_path):
+    from telegram_outbox import TelegramOutbox
+
+    db_path = tmp_path / "outbox.sqlite"
+    dead = TelegramOutbox(telegram, db_path)
+    dead.enqueue("звіт завислої копії")
+    assert len(dead._fetch_batch()) == 1
+
+    alive = TelegramOutbox(telegram, db_path)
+    assert alive._fetch_batch() == []
+
+    alive.CLAIM_TIMEOUT = 0
+    assert [row[1] for row in alive._fetch_batch()] == ["звіт завислої копії"]
+
+
+def test_stop_releases_claims(telegram, tmp_path):
+    from telegram_outbox import TelegramOutbox
+
+    db_path = tmp_path / "outbox.sqlite"
+    first = TelegramOutbox(telegram, db_path)
+    first.enqueue("звіт")
+    first._fetch_batch()
+    first.stop()
+
+    assert len(TelegramOutbox(telegram, db_path)._fetch_batch()) == 1
+
+
+def test_old_queue_without_claim_columns_is_migrated(telegram, tmp_path):
+    import sqlite3
+    from telegram_outbox import TelegramOutbox
+
+    db_path = tmp_path / "outbox.sqlite"
+    db = sqlite3.connect(str(db_path))
+    db.execute("CREATE TABLE outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, created REAL NOT NULL,"
+               " text TEXT NOT NULL, parse_mode TEXT, attempts INTEGER NOT NULL DEFAULT 0)")
+    db.execute("INSERT INTO outbox (created, text, parse_mode) VALUES (0, 'старий звіт', 'HTML')")
+    db.commit()
+    db.close()
+
+    assert [row[1] for row in TelegramOutbox(telegram, db_path)._fetch_batch()] == ["старий звіт"]
+
+
+def test_anydesk_password_never_reaches_the_outbox(outbox, telegram, bot_api, tmp_path):
+    password = "S3cret-Pa55"
+
+    assert telegram.send_anydesk_info("Магазин 1", "Іван", "PC-1", "123456789", password) is True
+    bot_api.offline = True
+    assert telegram.send_anydesk_info("Магазин 1", "Іван", "PC-1", "123456789", password) is False
+
+    assert outbox.depth() == 0
+    assert password in bot_api.messages[0]["params"]["text"]
+    for path in tmp_path.glob("outbox.sqlite*"):
+        assert password.encode() not in path.read_bytes()
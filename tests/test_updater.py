@@ -0,0 +1,35 @@
+import hashlib
+import os
+
+import updater
+from delta_update import make_patch_bytes
+from updater import UpdaterManager
+
+
+def test_delta_update_hashes_the_rebuilt_file_once(tmp_path, monkeypatch):
+    old = os.urandom(256 * 1024)
+    new = old[:100_000] + os.urandom(4096) + old[100_000:]
+    current_exe = tmp_path / "RemoteHand.exe"
+    current_exe.write_bytes(old)
+    patch = make_patch_bytes(old, new)
+
+    monkeypatch.chdir(tmp_path)
+    manager = UpdaterManager()
+    manager.current_exe_path = current_exe
+    monkeypatch.setattr(manager, "get_expected_sha256", lambda version: hashlib.sha256(new).hexdigest())
+    monkeypatch.setattr(manager, "get_delta_asset_name", lambda version: "RemoteHand.rhpatch")
+
+    def download(url, part_path, on_progress=None):
+        assert url.endswith("RemoteHand.rhpatch"), "повне завантаження не потрібне"
+        part_path.write_bytes(patch)
+        return True
+
+    monkeypatch.setattr(manager, "_download_full", download)
+    hashed = []
+    monkeypatch.setattr(updater, "file_sha256", lambda path: hashed.append(path) or
+                        hashlib.sha256(open(path, "rb").read()).hexdigest())
+
+    new_exe = manager.download_update("9.9.9")
+
+    assert new_exe.read_bytes() == new
+    assert len(hashed) == 1
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+THROUGHPUT_SERVER.PY - Сервер для тесту швидкості RemoteHand
+Використання:
+    python throughput_server.py [PORT]
+В config.json клієнта: "throughput_endpoint": "адреса:PORT" (за замовчуванням порт 5201).
+"""
+
+import os
+import sys
+import logging
+
+# Додати src в path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from throughput import ThroughputServer, ThroughputProbe
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else ThroughputProbe.DEFAULT_PORT
+    server = ThroughputServer(port=port)
+    port = server.start()
+    print(f"🚀 Сервер тесту швидкості слухає порт {port} (Ctrl+C - зупинити)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
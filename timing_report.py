@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TIMING_REPORT.PY - Перцентилі фаз запуску RemoteHand
+Використання:
+    python timing_report.py [ШЛЯХ ...] [--version 1.2.3]
+ШЛЯХ - файл startup_timing.jsonl або тека (шукаються startup_timing.jsonl*,
+в тому числі у вкладених теках - наприклад, логи, зібрані з кількох ПК).
+Без аргументів - тека logs поруч зі скриптом.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+PERCENTILES = (50, 90, 99)
+
+
+def iter_files(paths):
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from sorted(path.rglob("startup_timing.jsonl*"))
+        elif path.exists():
+            yield path
+        else:
+            print(f"⚠️ Не знайдено: {path}", file=sys.stderr)
+
+
+def load_records(paths, version=None):
+    """Записи запусків з усіх файлів (пошкоджені рядки пропускаються)"""
+    records = []
+    skipped = 0
+    for path in iter_files(paths):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if not isinstance(record, dict) or not isinstance(record.get("spans"), dict):
+                    skipped += 1
+                    continue
+                if version and record.get("version") != version:
+                    continue
+                records.append(record)
+    return records, skipped
+
+
+def percentile(sorted_values, p):
+    """Перцентиль за найближчим рангом"""
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def aggregate(records):
+    """{фаза: відсортовані тривалості, мс}; "total" - весь запуск"""
+    samples = {}
+    for record in records:
+        for name, duration in record["spans"].items():
+            samples.setdefault(name, []).append(float(duration))
+        if "total_ms" in record:
+            samples.setdefault("total", []).append(float(record["total_ms"]))
+    return {name: sorted(values) for name, values in samples.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Перцентилі фаз запуску RemoteHand")
+    parser.add_argument("paths", nargs="*", default=[Path(__file__).resolve().parent / "logs"])
+    parser.add_argument("--version", help="лише запуски цієї версії")
+    args = parser.parse_args()
+
+    records, skipped = load_records(args.paths, args.version)
+    if not records:
+        print("❌ Немає записів замірів")
+        return 1
+
+    samples = aggregate(records)
+    print(f"📊 Запусків: {len(records)}" + (f" (пропущено пошкоджених рядків: {skipped})" if skipped else ""))
+
+    header = "".join(f"{f'p{p}, мс':>11}" for p in PERCENTILES)
+    print(f"\n{'фаза':<16}{'n':>6}{header}{'max, мс':>11}")
+    # Найдовші фази першими, загальний час - в кінці
+    names = sorted((name for name in samples if name != "total"),
+                   key=lambda name: percentile(samples[name], 50), reverse=True)
+    if "total" in samples:
+        names.append("total")
+    for name in names:
+        values = samples[name]
+        row = "".join(f"{percentile(values, p):>11.1f}" for p in PERCENTILES)
+        print(f"{name:<16}{len(values):>6}{row}{values[-1]:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())